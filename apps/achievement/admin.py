@@ -4,8 +4,8 @@ from .models import Achievement, UserAchievement
 
 @admin.register(Achievement)
 class AchievementAdmin(admin.ModelAdmin):
-    list_display = ('name', 'achievement_type', 'level', 'points', 'is_active', 'created_at')
-    list_filter = ('achievement_type', 'level', 'is_active', 'created_at')
+    list_display = ('name', 'achievement_type', 'level', 'points', 'rule_metric', 'rule_threshold', 'is_active', 'created_at')
+    list_filter = ('achievement_type', 'level', 'rule_metric', 'is_active', 'created_at')
     search_fields = ('name', 'description', 'condition_description')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('achievement_type', 'level', 'name')
@@ -18,7 +18,7 @@ class AchievementAdmin(admin.ModelAdmin):
             'fields': ('points', 'icon')
         }),
         ('Conditions', {
-            'fields': ('condition_description',)
+            'fields': ('condition_description', 'rule_metric', 'rule_operator', 'rule_threshold')
         }),
         ('Settings', {
             'fields': ('is_active',)
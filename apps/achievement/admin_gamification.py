@@ -24,7 +24,7 @@ class AchievementAdmin(admin.ModelAdmin):
             'fields': ('level', 'points', 'icon', 'is_active')
         }),
         ('Condiciones', {
-            'fields': ('condition_description',)
+            'fields': ('condition_description', 'rule_metric', 'rule_operator', 'rule_threshold')
         }),
         ('Fechas', {
             'fields': ('created_at', 'updated_at'),
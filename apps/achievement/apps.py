@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AchievementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.achievement'
+
+    def ready(self):
+        import apps.achievement.signals  # noqa: F401
@@ -8,6 +8,7 @@ Los logros creados pueden modificarse desde el admin de Django.
 
 from django.core.management.base import BaseCommand
 from apps.achievement.models import Achievement
+from apps.achievement.rules import parse_condition
 
 
 class Command(BaseCommand):
@@ -206,6 +207,11 @@ class Command(BaseCommand):
             },
         ]
 
+        for data in achievements_data:
+            data['rule_metric'], data['rule_operator'], data['rule_threshold'] = parse_condition(
+                data['condition_description']
+            )
+
         created_count = 0
         for data in achievements_data:
             achievement, created = Achievement.objects.get_or_create(
@@ -217,6 +223,9 @@ class Command(BaseCommand):
                     'points': data['points'],
                     'icon': data['icon'],
                     'condition_description': data['condition_description'],
+                    'rule_metric': data['rule_metric'],
+                    'rule_operator': data['rule_operator'],
+                    'rule_threshold': data['rule_threshold'],
                     'is_active': True,
                 }
             )
@@ -230,7 +239,24 @@ class Command(BaseCommand):
                     self.style.WARNING(f'Ya existe: {achievement.name}')
                 )
 
+        # Migrar las condiciones en texto de logros existentes a reglas estructuradas
+        migrated_count = 0
+        for achievement in Achievement.objects.filter(rule_metric=''):
+            rule = parse_condition(achievement.condition_description)
+            if rule is None:
+                self.stdout.write(
+                    self.style.WARNING(f'Condición no reconocida: {achievement.name} ({achievement.condition_description})')
+                )
+                continue
+            achievement.rule_metric, achievement.rule_operator, achievement.rule_threshold = rule
+            achievement.save(update_fields=['rule_metric', 'rule_operator', 'rule_threshold'])
+            migrated_count += 1
+
         self.stdout.write(
             self.style.SUCCESS(f'\nTotal de logros creados: {created_count}')
         )
+        if migrated_count:
+            self.stdout.write(
+                self.style.SUCCESS(f'Condiciones migradas a reglas: {migrated_count}')
+            )
 
@@ -0,0 +1,57 @@
+import re
+
+from django.db import migrations, models
+
+
+def _parse(text):
+    # Copia de las condiciones que reconocía el evaluador anterior: las demás
+    # (signup, first like, likes N) nunca otorgaban el logro y quedan sin regla
+    condition = (text or '').lower()
+    if 'first post' in condition:
+        return ('posts', 'gte', 1)
+    if 'first comment' in condition:
+        return ('comments', 'gte', 1)
+    match = re.search(r'(\d+)', condition)
+    if match is None:
+        return None
+    number = int(match.group(1))
+    for keyword, metric in (('total points', 'total_points'), ('posts', 'posts'),
+                            ('comments', 'comments'), ('level', 'level')):
+        if keyword in condition:
+            return (metric, 'gte', number)
+    return None
+
+
+def parse_existing_conditions(apps, schema_editor):
+    Achievement = apps.get_model('achievement', 'Achievement')
+    for achievement in Achievement.objects.filter(rule_metric=''):
+        rule = _parse(achievement.condition_description)
+        if rule is not None:
+            achievement.rule_metric, achievement.rule_operator, achievement.rule_threshold = rule
+            achievement.save(update_fields=['rule_metric', 'rule_operator', 'rule_threshold'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievement', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='achievement',
+            name='rule_metric',
+            field=models.CharField(blank=True, choices=[('posts', 'Posts created'), ('comments', 'Comments written'), ('likes_received', 'Likes received'), ('total_points', 'Total points'), ('level', 'Level'), ('signup', 'Signed up')], help_text='User metric evaluated to unlock this achievement', max_length=20, verbose_name='Rule metric'),
+        ),
+        migrations.AddField(
+            model_name='achievement',
+            name='rule_operator',
+            field=models.CharField(choices=[('gte', '>='), ('gt', '>'), ('eq', '=')], default='gte', max_length=3, verbose_name='Rule operator'),
+        ),
+        migrations.AddField(
+            model_name='achievement',
+            name='rule_threshold',
+            field=models.PositiveIntegerField(default=1, verbose_name='Rule threshold'),
+        ),
+        migrations.RunPython(parse_existing_conditions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievement', '0003_achievement_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('posts', 'Posts created'), ('comments', 'Comments written'), ('likes_received', 'Likes received'), ('total_points', 'Total points'), ('level', 'Level'), ('signup', 'Signed up')], max_length=20, verbose_name='Metric')),
+                ('value', models.IntegerField(default=0, verbose_name='Evaluated value')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_checkpoints', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Metric Checkpoint',
+                'verbose_name_plural': 'Metric Checkpoints',
+                'unique_together': {('user', 'metric')},
+            },
+        ),
+    ]
@@ -12,6 +12,21 @@ class Achievement(models.Model):
         ('special', 'Special'),
     ]
     
+    RULE_METRICS = [
+        ('posts', 'Posts created'),
+        ('comments', 'Comments written'),
+        ('likes_received', 'Likes received'),
+        ('total_points', 'Total points'),
+        ('level', 'Level'),
+        ('signup', 'Signed up'),
+    ]
+    
+    RULE_OPERATORS = [
+        ('gte', '>='),
+        ('gt', '>'),
+        ('eq', '='),
+    ]
+    
     ACHIEVEMENT_LEVELS = [
         ('bronze', 'Bronze'),
         ('silver', 'Silver'),
@@ -57,6 +72,26 @@ class Achievement(models.Model):
         verbose_name="Unlock condition"
     )
     
+    rule_metric = models.CharField(
+        max_length=20,
+        choices=RULE_METRICS,
+        blank=True,
+        help_text="User metric evaluated to unlock this achievement",
+        verbose_name="Rule metric"
+    )
+    
+    rule_operator = models.CharField(
+        max_length=3,
+        choices=RULE_OPERATORS,
+        default='gte',
+        verbose_name="Rule operator"
+    )
+    
+    rule_threshold = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Rule threshold"
+    )
+    
     is_active = models.BooleanField(
         default=True,
         verbose_name="Active"
@@ -113,3 +148,34 @@ class UserAchievement(models.Model):
         
     def __str__(self):
         return f"{self.user.username} - {self.achievement.name}"
+
+
+class MetricCheckpoint(models.Model):
+    """Last value of a user metric already checked against the achievement rules"""
+    
+    user = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='metric_checkpoints',
+        verbose_name="User"
+    )
+    
+    metric = models.CharField(
+        max_length=20,
+        choices=Achievement.RULE_METRICS,
+        verbose_name="Metric"
+    )
+    
+    value = models.IntegerField(
+        default=0,
+        verbose_name="Evaluated value"
+    )
+    
+    class Meta:
+        verbose_name = "Metric Checkpoint"
+        verbose_name_plural = "Metric Checkpoints"
+        unique_together = ['user', 'metric']
+        
+    def __str__(self):
+        return f"{self.user_id} - {self.metric}: {self.value}"
+
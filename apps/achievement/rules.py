@@ -0,0 +1,214 @@
+"""
+Motor de reglas de logros.
+
+Cada Achievement guarda su condición como (métrica, operador, umbral).
+Las reglas activas se compilan una vez por proceso y se recompilan cuando
+cambia la versión guardada en la caché (ver signals.py), de modo que
+evaluar a un usuario cuesta una consulta de métricas y comparaciones en memoria.
+
+Además se indexan por métrica, ordenadas por umbral: ante un evento que
+cambia una métrica de old a new, solo se revisan los umbrales cruzados
+en ese intervalo (búsqueda binaria).
+"""
+
+import operator
+from bisect import bisect_right
+import re
+import uuid
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from apps.achievement.models import Achievement, UserAchievement
+
+
+RULES_VERSION_KEY = 'achievement:rules_version'
+
+OPERATORS = {
+    'gte': operator.ge,
+    'gt': operator.gt,
+    'eq': operator.eq,
+}
+
+Rule = namedtuple('Rule', ['achievement', 'metric', 'check', 'threshold'])
+
+_compiled = {'version': None, 'rules': [], 'index': {}}
+
+
+def parse_condition(text: str):
+    """
+    Traduce una condición en texto (formato anterior) a una regla.
+
+    Args:
+        text: condition_description, ej: 'posts 10', 'first comment', 'level 5'
+
+    Returns:
+        tupla (metric, operator, threshold) o None si no se reconoce
+    """
+    condition = (text or '').lower()
+    match = re.search(r'(\d+)', condition)
+    number = int(match.group(1)) if match else None
+
+    if 'first post' in condition:
+        return ('posts', 'gte', 1)
+    if 'first comment' in condition:
+        return ('comments', 'gte', 1)
+    if 'first like' in condition:
+        return ('likes_received', 'gte', 1)
+    if 'signup' in condition:
+        return ('signup', 'gte', 1)
+    if number is None:
+        return None
+    if 'total points' in condition:
+        return ('total_points', 'gte', number)
+    if 'posts' in condition:
+        return ('posts', 'gte', number)
+    if 'comments' in condition:
+        return ('comments', 'gte', number)
+    if 'likes' in condition:
+        return ('likes_received', 'gte', number)
+    if 'level' in condition:
+        return ('level', 'gte', number)
+    return None
+
+
+def invalidate_rules():
+    """Fuerza a todos los procesos a recompilar las reglas."""
+    cache.set(RULES_VERSION_KEY, uuid.uuid4().hex, None)
+    _compiled['version'] = None
+
+
+def _effective_threshold(rule) -> int:
+    # Valor mínimo de la métrica que cumple la regla
+    if rule.check is operator.gt:
+        return rule.threshold + 1
+    return rule.threshold
+
+
+def _compile():
+    """Devuelve las reglas compiladas y el índice métrica -> (umbrales, reglas)."""
+    # La versión es un token aleatorio: si la caché se vacía, nunca coincide
+    # con una compilación anterior
+    version = cache.get(RULES_VERSION_KEY)
+    if version is None:
+        cache.add(RULES_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(RULES_VERSION_KEY)
+
+    if _compiled['version'] != version:
+        achievements = Achievement.objects.filter(is_active=True).exclude(rule_metric='')
+        compiled_rules = [
+            Rule(a, a.rule_metric, OPERATORS.get(a.rule_operator, operator.ge), a.rule_threshold)
+            for a in achievements
+        ]
+
+        index = {}
+        for rule in sorted(compiled_rules, key=_effective_threshold):
+            thresholds, metric_rules = index.setdefault(rule.metric, ([], []))
+            thresholds.append(_effective_threshold(rule))
+            metric_rules.append(rule)
+
+        _compiled.update(version=version, rules=compiled_rules, index=index)
+    return _compiled
+
+
+def get_rules() -> list:
+    """Devuelve las reglas activas compiladas, recompilando si cambió la versión."""
+    return _compile()['rules']
+
+
+def get_index() -> dict:
+    """Devuelve el índice {métrica: (umbrales ordenados, reglas)}."""
+    return _compile()['index']
+
+
+def _count(model, field, **filters):
+    qs = model.objects.filter(**{field: OuterRef('pk')}, **filters).order_by().values(field)
+    return Coalesce(Subquery(qs.annotate(c=Count('pk')).values('c'), output_field=IntegerField()), 0)
+
+
+def compute_metrics(user, metrics) -> dict:
+    """
+    Calcula las métricas pedidas para el usuario con una sola consulta.
+
+    Las métricas que ya están en la fila del usuario (puntos, nivel) se
+    leen de la instancia sin consultar.
+    """
+    from apps.comment.models import Comment
+    from apps.post.models import Post
+
+    values = {
+        'total_points': user.total_points,
+        'level': user.level,
+        'signup': 1,
+    }
+
+    annotations = {}
+    if 'posts' in metrics:
+        annotations['posts'] = _count(Post, 'author')
+    if 'comments' in metrics:
+        annotations['comments'] = _count(Comment, 'author')
+    if 'likes_received' in metrics:
+        likes = Post.objects.filter(author=OuterRef('pk')).order_by().values('author')
+        annotations['likes_received'] = Coalesce(
+            Subquery(likes.annotate(s=Sum('like_count')).values('s'), output_field=IntegerField()), 0
+        )
+
+    if annotations:
+        # Prefijo para no chocar con las relaciones inversas (user.posts, user.comments)
+        row = type(user).objects.filter(pk=user.pk).values(
+            **{f'metric_{name}': expression for name, expression in annotations.items()}
+        ).get()
+        values.update({name: row[f'metric_{name}'] for name in annotations})
+    return values
+
+
+def evaluate(user) -> list:
+    """
+    Devuelve los logros activos que el usuario cumple y todavía no tiene.
+    """
+    earned = set(UserAchievement.objects.filter(user=user).values_list('achievement_id', flat=True))
+    pending = [rule for rule in get_rules() if rule.achievement.pk not in earned]
+    if not pending:
+        return []
+
+    metrics = compute_metrics(user, {rule.metric for rule in pending})
+    return [
+        rule.achievement for rule in pending
+        if rule.check(metrics.get(rule.metric, 0), rule.threshold)
+    ]
+
+
+def crossed(user, changed: dict) -> list:
+    """
+    Devuelve los logros cuyo umbral se cruzó con los cambios de métricas.
+
+    Args:
+        user: Usuario evaluado
+        changed: {métrica: (valor_anterior, valor_nuevo)}
+
+    Returns:
+        list de Achievement que el usuario cumple ahora y todavía no tiene
+    """
+    index = get_index()
+    candidates = []
+    for metric, (old, new) in changed.items():
+        if metric not in index or new <= old:
+            continue
+        thresholds, metric_rules = index[metric]
+        # Umbrales t con old < t <= new
+        start = bisect_right(thresholds, old)
+        end = bisect_right(thresholds, new)
+        for rule in metric_rules[start:end]:
+            # Las reglas de igualdad solo se cumplen sobre el valor exacto
+            if rule.check(new, rule.threshold):
+                candidates.append(rule.achievement)
+
+    if not candidates:
+        return []
+
+    earned = set(UserAchievement.objects.filter(
+        user=user, achievement_id__in=[a.pk for a in candidates]
+    ).values_list('achievement_id', flat=True))
+    return [a for a in candidates if a.pk not in earned]
@@ -0,0 +1,18 @@
+"""
+Signals that invalidate the compiled achievement rules and the metric
+checkpoints when an achievement changes.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.achievement.models import Achievement, MetricCheckpoint
+from apps.achievement.rules import invalidate_rules
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def invalidate_achievement_rules(sender, instance, **kwargs):
+    """Recompiles the rules on the next evaluation and re-checks the rule's metric from zero."""
+    invalidate_rules()
+    if instance.rule_metric:
+        MetricCheckpoint.objects.filter(metric=instance.rule_metric).delete()
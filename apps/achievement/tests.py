@@ -1,2 +1,107 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from apps.achievement.models import Achievement
+from apps.achievement import rules
+from apps.achievement.rules import parse_condition
+from apps.main import outbox
+from apps.main.services.gamification_service import GamificationService
+from apps.post.models import Post
+
+User = get_user_model()
+
+
+class AchievementRulesTestCase(TestCase):
+    def setUp(self):
+        """Set up the default achievements and a user"""
+        cache.clear()
+        call_command('create_achievements', stdout=StringIO())
+        self.user = User.objects.create_user(
+            username='rules_user', email='rules@example.com', password='testpass123', student_id='R-1'
+        )
+
+    def test_parse_condition(self):
+        """Test the legacy text conditions map to structured rules"""
+        self.assertEqual(parse_condition('first post'), ('posts', 'gte', 1))
+        self.assertEqual(parse_condition('total points 500'), ('total_points', 'gte', 500))
+        self.assertEqual(parse_condition('likes 50'), ('likes_received', 'gte', 50))
+        self.assertIsNone(parse_condition('something else'))
+
+    def test_create_achievements_stores_rules(self):
+        """Test every default achievement gets a rule"""
+        self.assertFalse(Achievement.objects.filter(rule_metric='').exists())
+
+    def test_check_achievements_uses_one_metrics_query(self):
+        """Test evaluation unlocks matching achievements in memory"""
+        Post.objects.create(author=self.user, content='First')
+        GamificationService.check_achievements(self.user)  # compila las reglas
+
+        unlocked = GamificationService.check_achievements(self.user)
+        self.assertEqual(unlocked, [])
+        names = set(self.user.user_achievements.values_list('achievement__name', flat=True))
+        self.assertEqual(names, {'Primer Paso', 'Bienvenido a la Familia'})
+
+        with self.assertNumQueries(2):
+            GamificationService.check_achievements(self.user)
+
+    def test_rules_recompile_after_change(self):
+        """Test editing an achievement invalidates the compiled rules"""
+        GamificationService.check_achievements(self.user)
+        Achievement.objects.filter(name='Nivel 2').update(rule_threshold=1)
+        Achievement.objects.get(name='Nivel 2').save()
+        unlocked = GamificationService.check_achievements(self.user)
+        self.assertEqual([u['achievement']['name'] for u in unlocked], ['Nivel 2'])
+
+    def test_crossed_only_checks_changed_metric(self):
+        """Test event evaluation only unlocks thresholds crossed by the change"""
+        GamificationService.check_achievements(self.user)  # compila las reglas
+        Post.objects.create(author=self.user, content='First')
+
+        # Ningún umbral de posts entre 1 y 2: no hace falta consultar
+        with self.assertNumQueries(0):
+            self.assertEqual(rules.crossed(self.user, {'posts': (1, 2)}), [])
+
+        unlocked = GamificationService.check_achievements(self.user, changed={'posts': (0, 1)})
+        self.assertEqual([u['achievement']['name'] for u in unlocked], ['Primer Paso'])
+
+    def test_event_worker_unlocks_crossed_achievements(self):
+        """Test the outbox worker unlocks achievements for the changed metric"""
+        post = Post.objects.create(author=self.user, content='First')
+        GamificationService.enqueue_event(self.user, 'post_created', object_id=post.id)
+        call_command('process_outbox', stdout=StringIO())
+
+        names = set(self.user.user_achievements.values_list('achievement__name', flat=True))
+        self.assertEqual(names, {'Primer Paso'})
+
+    def test_split_batches_do_not_skip_thresholds(self):
+        """Test a user's events processed across two batches still cross the first threshold"""
+        for content in ('First', 'Second'):
+            post = Post.objects.create(author=self.user, content=content)
+            GamificationService.enqueue_event(self.user, 'post_created', object_id=post.id)
+
+        outbox.process_batch(topic_prefix='gamification', batch_size=1)
+        outbox.process_batch(topic_prefix='gamification', batch_size=1)
+
+        names = set(self.user.user_achievements.values_list('achievement__name', flat=True))
+        self.assertEqual(names, {'Primer Paso'})
+
+    def test_new_achievement_is_checked_on_next_event(self):
+        """Test an achievement below the user's current value unlocks on the next event of its metric"""
+        for content in ('First', 'Second'):
+            post = Post.objects.create(author=self.user, content=content)
+            GamificationService.enqueue_event(self.user, 'post_created', object_id=post.id)
+        outbox.process_batch(topic_prefix='gamification')
+
+        Achievement.objects.create(
+            name='Dos posts', description='Two posts', achievement_type='milestone', level='bronze', points=0,
+            condition_description='posts 2', rule_metric='posts', rule_threshold=2,
+        )
+        post = Post.objects.create(author=self.user, content='Third')
+        GamificationService.enqueue_event(self.user, 'post_created', object_id=post.id)
+        outbox.process_batch(topic_prefix='gamification')
+
+        self.assertTrue(self.user.user_achievements.filter(achievement__name='Dos posts').exists())
 
@@ -40,10 +40,6 @@ class CommentAdmin(admin.ModelAdmin):
     is_reply.boolean = True
     is_reply.short_description = "Reply"
     
-    def like_count(self, obj):
-        return obj.get_like_count()
-    like_count.short_description = "Likes"
-    
     def replies_count(self, obj):
         return obj.get_replies_count()
     replies_count.short_description = "Replies"
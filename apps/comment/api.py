@@ -3,6 +3,11 @@ from typing import List
 from ninja_jwt.authentication import JWTAuth
 
 from apps.comment.models import Comment
+from apps.like.models import Like
+from apps.reaction.models import Reaction
+from apps.main.auth import optional_auth
+from apps.main.pagination import keyset_page, estimate_count
+from apps.main.services.block_service import BlockService
 
 router = Router()
 
@@ -15,6 +20,9 @@ class CommentOut(Schema):
     content: str
     parent_id: int | None = None
     like_count: int
+    reactions: dict[str, int] = {}
+    liked_by_me: bool = False
+    my_reaction: str | None = None
     is_edited: bool
     created_at: str
 
@@ -30,27 +38,38 @@ class CommentUpdate(Schema):
 
 
 class PaginatedCommentsOut(Schema):
-    total: int
+    total: int | None = None
     page: int
     size: int
     items: List[CommentOut]
+    next_cursor: str | None = None
 
 
 class DeleteResponse(Schema):
     success: bool
 
 
-@router.get("/", response=PaginatedCommentsOut)
-def list_comments(request, page: int = 1, size: int = 20, post_id: int | None = None):
+@router.get("/", auth=optional_auth, response=PaginatedCommentsOut)
+def list_comments(request, page: int = 1, size: int = 20, post_id: int | None = None,
+                  cursor: str | None = None, with_total: bool = False):
     size = max(1, min(size, 100))
     qs = Comment.objects.select_related('author', 'post').filter(is_hidden=False)
+    qs = BlockService.exclude_blocked(qs, request.user)
     if post_id:
         qs = qs.filter(post_id=post_id)
-    qs = qs.order_by('created_at')
-    total = qs.count()
-    start = (page - 1) * size
-    end = start + size
-    qs_page = qs[start:end]
+    next_cursor = None
+    if cursor is not None:
+        qs_page, next_cursor = keyset_page(qs, 'created_at', cursor, size)
+        total = estimate_count(qs) if with_total else None
+    else:
+        qs = qs.order_by('created_at')
+        total = qs.count()
+        start = (page - 1) * size
+        end = start + size
+        qs_page = qs[start:end]
+    qs_page = Reaction.objects.prefetch_reaction_counts(qs_page)
+    Like.objects.prefetch_liked_by(request.user, qs_page)
+    Reaction.objects.prefetch_user_reactions(request.user, qs_page)
     items = [CommentOut(
         id=c.id,
         author_id=c.author_id,
@@ -59,17 +78,22 @@ def list_comments(request, page: int = 1, size: int = 20, post_id: int | None =
         content=c.content,
         parent_id=c.parent_id,
         like_count=c.get_like_count(),
+        reactions=c.get_reaction_counts(),
+        liked_by_me=c.liked_by_me,
+        my_reaction=c.my_reaction,
         is_edited=c.is_edited,
         created_at=c.created_at.isoformat(),
     ) for c in qs_page]
-    return PaginatedCommentsOut(total=total, page=page, size=size, items=items)
+    return PaginatedCommentsOut(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
-@router.get("/{comment_id}", response=CommentOut)
+@router.get("/{comment_id}", auth=optional_auth, response=CommentOut)
 def get_comment(request, comment_id: int):
     c = Comment.objects.select_related('author', 'post').filter(id=comment_id, is_hidden=False).first()
     if not c:
         return None
+    Like.objects.prefetch_liked_by(request.user, [c])
+    Reaction.objects.prefetch_user_reactions(request.user, [c])
     return CommentOut(
         id=c.id,
         author_id=c.author_id,
@@ -78,6 +102,9 @@ def get_comment(request, comment_id: int):
         content=c.content,
         parent_id=c.parent_id,
         like_count=c.get_like_count(),
+        reactions=c.get_reaction_counts(),
+        liked_by_me=c.liked_by_me,
+        my_reaction=c.my_reaction,
         is_edited=c.is_edited,
         created_at=c.created_at.isoformat(),
     )
@@ -117,6 +144,8 @@ def update_comment(request, comment_id: int, data: CommentUpdate):
         return None
     c.content = data.content
     c.mark_as_edited()
+    Like.objects.prefetch_liked_by(request.user, [c])
+    Reaction.objects.prefetch_user_reactions(request.user, [c])
     return CommentOut(
         id=c.id,
         author_id=c.author_id,
@@ -125,6 +154,9 @@ def update_comment(request, comment_id: int, data: CommentUpdate):
         content=c.content,
         parent_id=c.parent_id,
         like_count=c.get_like_count(),
+        reactions=c.get_reaction_counts(),
+        liked_by_me=c.liked_by_me,
+        my_reaction=c.my_reaction,
         is_edited=c.is_edited,
         created_at=c.created_at.isoformat(),
     )
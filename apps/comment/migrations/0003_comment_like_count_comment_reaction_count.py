@@ -0,0 +1,48 @@
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Comment = apps.get_model('comment', 'Comment')
+    Like = apps.get_model('like', 'Like')
+    Reaction = apps.get_model('reaction', 'Reaction')
+
+    def count_of(model, content_type):
+        return Coalesce(Subquery(
+            model.objects.filter(content_type=content_type, object_id=OuterRef('pk')).order_by()
+            .values('object_id').annotate(total=Count('*')).values('total')[:1]
+        ), 0)
+
+    comment_ct = ContentType.objects.filter(app_label='comment', model='comment').first()
+    if comment_ct is None:
+        return
+    Comment.objects.update(
+        like_count=count_of(Like, comment_ct),
+        reaction_count=count_of(Reaction, comment_ct),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0002_initial'),
+        ('like', '0002_initial'),
+        ('reaction', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Like count'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reaction_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reaction count'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
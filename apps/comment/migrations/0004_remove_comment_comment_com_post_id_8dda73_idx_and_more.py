@@ -0,0 +1,27 @@
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comment', '0003_comment_like_count_comment_reaction_count'),
+        ('post', '0003_post_comment_count_post_like_count_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='comment_com_post_id_8dda73_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'created_at', 'id'], name='comment_com_post_id_bb90de_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['is_hidden', 'created_at', 'id'], name='comment_com_is_hidd_453914_idx'),
+        ),
+    ]
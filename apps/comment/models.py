@@ -48,6 +48,16 @@ class Comment(models.Model):
         verbose_name="Hidden"
     )
     
+    like_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Like count"
+    )
+    
+    reaction_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Reaction count"
+    )
+    
     likes = GenericRelation('like.Like')
     reactions = GenericRelation('reaction.Reaction')
     
@@ -59,7 +69,8 @@ class Comment(models.Model):
         verbose_name_plural = "Comments"
         ordering = ['created_at']
         indexes = [
-            models.Index(fields=['post', 'created_at']),
+            models.Index(fields=['post', 'created_at', 'id']),
+            models.Index(fields=['is_hidden', 'created_at', 'id']),
             models.Index(fields=['author', '-created_at']),
             models.Index(fields=['parent']),
         ]
@@ -69,14 +80,17 @@ class Comment(models.Model):
         return f"{self.author.username}: {content_preview}"
     
     def get_absolute_url(self):
-        return f"{self.post.get_absolute_url()}#comment-{self.pk}"
+        # post_id avoids loading the post of every listed comment
+        return f"{reverse('post:detalle', kwargs={'post_id': self.post_id})}#comment-{self.pk}"
     
     def get_like_count(self):
         """Get total likes for this comment"""
-        return self.likes.count()
+        return self.like_count
     
     def get_reaction_counts(self):
-        """Get reaction counts for this comment"""
+        """Get reaction counts for this comment (prefetched by Reaction.objects.prefetch_reaction_counts)"""
+        if hasattr(self, '_reaction_counts'):
+            return self._reaction_counts
         from apps.reaction.models import Reaction
         return Reaction.objects.get_reaction_counts_for_object(self)
     
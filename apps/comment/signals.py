@@ -0,0 +1,22 @@
+"""
+Signals that keep Post.comment_count in sync with comment creation and deletion.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.comment.models import Comment
+from apps.post.models import Post
+from apps.main.services.counter_service import CounterService
+
+
+@receiver(post_save, sender=Comment)
+def increment_post_comment_count(sender, instance, created, **kwargs):
+    """Counts a new comment on its post."""
+    if created:
+        CounterService.increment_pk(Post, instance.post_id, 'comment_count', 1)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_post_comment_count(sender, instance, **kwargs):
+    """Discounts a deleted comment from its post."""
+    CounterService.increment_pk(Post, instance.post_id, 'comment_count', -1)
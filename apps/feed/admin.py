@@ -0,0 +1,21 @@
+from django.contrib import admin
+from .models import FeedEntry, PullAuthor
+
+
+@admin.register(FeedEntry)
+class FeedEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'post', 'created_at')
+    search_fields = ('user__username',)
+    raw_id_fields = ('user', 'post')
+    ordering = ('-created_at',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user', 'post')
+
+
+@admin.register(PullAuthor)
+class PullAuthorAdmin(admin.ModelAdmin):
+    list_display = ('user', 'audience_size', 'updated_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('updated_at',)
+    ordering = ('-audience_size',)
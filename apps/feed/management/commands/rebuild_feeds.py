@@ -0,0 +1,31 @@
+"""
+Comando para reconstruir los feeds materializados a partir de los posts existentes.
+
+Uso: python manage.py rebuild_feeds --days 30
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.post.models import Post
+from apps.main.services.feed_service import FeedService
+
+
+class Command(BaseCommand):
+    help = 'Distribuye los posts recientes en los feeds de su audiencia'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Antigüedad máxima de los posts a distribuir')
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        posts = Post.objects.select_related('author').filter(created_at__gte=since, is_hidden=False)
+
+        delivered = 0
+        for post in posts.iterator(chunk_size=500):
+            delivered += FeedService.fan_out(post)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Entradas de feed escritas: {delivered}')
+        )
@@ -0,0 +1,63 @@
+from django.db import models
+
+
+class FeedEntry(models.Model):
+    """Materialized home feed row: one post delivered to one user"""
+
+    user = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name="User"
+    )
+
+    post = models.ForeignKey(
+        'post.Post',
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name="Post"
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Post created at"
+    )
+
+    class Meta:
+        verbose_name = "Feed Entry"
+        verbose_name_plural = "Feed Entries"
+        unique_together = ['user', 'post']
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} <- post {self.post_id}"
+
+
+class PullAuthor(models.Model):
+    """
+    Authors with an audience too large for fan-out on write.
+    Their posts are merged into followers' feeds at read time.
+    """
+
+    user = models.OneToOneField(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='feed_pull',
+        verbose_name="User"
+    )
+
+    audience_size = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Audience size"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Pull Author"
+        verbose_name_plural = "Pull Authors"
+
+    def __str__(self):
+        return f"{self.user.username} ({self.audience_size})"
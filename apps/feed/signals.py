@@ -0,0 +1,17 @@
+"""
+Signals for feed materialization.
+Every new post is fanned out to its audience once the transaction commits.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.post.models import Post
+from apps.main.services.feed_service import FeedService
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    """Delivers a newly created post to the feeds of its audience."""
+    if created:
+        transaction.on_commit(lambda: FeedService.fan_out(instance), robust=True)
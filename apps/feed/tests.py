@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from apps.feed.models import FeedEntry, PullAuthor
+from apps.friendship.models import Follow
+from apps.main.services.feed_service import FeedService
+from apps.post.models import Post
+
+User = get_user_model()
+
+
+class FeedServiceTestCase(TestCase):
+    def setUp(self):
+        """Set up an author with one follower and one stranger"""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='testpass123', student_id='F-1'
+        )
+        self.follower = User.objects.create_user(
+            username='follower', email='follower@example.com', password='testpass123', student_id='F-2'
+        )
+        self.stranger = User.objects.create_user(
+            username='stranger', email='stranger@example.com', password='testpass123', student_id='F-3'
+        )
+        Follow.objects.create(follower=self.follower, followed=self.author)
+
+    def create_post(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(author=self.author, content='Feed post', **kwargs)
+
+    def test_public_post_reaches_followers(self):
+        """Test a public post is written to the author and follower feeds"""
+        post = self.create_post()
+        self.assertTrue(FeedEntry.objects.filter(user=self.follower, post=post).exists())
+        self.assertTrue(FeedEntry.objects.filter(user=self.author, post=post).exists())
+        self.assertFalse(FeedEntry.objects.filter(user=self.stranger, post=post).exists())
+        self.assertEqual(FeedService.get_feed(self.follower), [post])
+
+    def test_private_post_stays_with_author(self):
+        """Test a private post is only delivered to its author"""
+        post = self.create_post(privacy_level='private')
+        self.assertEqual(FeedService.get_feed(self.follower), [])
+        self.assertEqual(FeedService.get_feed(self.author), [post])
+
+    def test_cached_buffer_receives_new_posts(self):
+        """Test a warmed feed buffer is updated on fan-out"""
+        first = self.create_post()
+        self.assertEqual(FeedService.get_feed(self.follower), [first])
+        second = self.create_post()
+        with self.assertNumQueries(1):
+            self.assertEqual(FeedService.get_feed(self.follower), [second, first])
+
+    @override_settings(FEED_FANOUT_LIMIT=0)
+    def test_large_audience_is_read_on_pull(self):
+        """Test authors over the fan-out limit are merged at read time"""
+        post = self.create_post()
+        self.assertFalse(FeedEntry.objects.filter(user=self.follower).exists())
+        self.assertTrue(PullAuthor.objects.filter(user=self.author).exists())
+        self.assertEqual(FeedService.get_feed(self.follower), [post])
+        self.assertEqual(FeedService.get_feed(self.stranger), [])
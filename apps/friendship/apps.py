@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FriendshipConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.friendship'
+
+    def ready(self):
+        import apps.friendship.signals  # noqa: F401
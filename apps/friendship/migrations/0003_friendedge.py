@@ -0,0 +1,45 @@
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_edges(apps, schema_editor):
+    Friendship = apps.get_model('friendship', 'Friendship')
+    FriendEdge = apps.get_model('friendship', 'FriendEdge')
+
+    edges = []
+    accepted = Friendship.objects.filter(status='accepted').values_list('sender_id', 'receiver_id')
+    for sender_id, receiver_id in accepted.iterator(chunk_size=2000):
+        edges.append(FriendEdge(user_id=sender_id, friend_id=receiver_id))
+        edges.append(FriendEdge(user_id=receiver_id, friend_id=sender_id))
+        if len(edges) >= 2000:
+            FriendEdge.objects.bulk_create(edges, ignore_conflicts=True)
+            edges = []
+    FriendEdge.objects.bulk_create(edges, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('friendship', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FriendEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('friend', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Friend')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='friend_edges', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Friend Edge',
+                'verbose_name_plural': 'Friend Edges',
+                'unique_together': {('user', 'friend')},
+            },
+        ),
+        migrations.RunPython(backfill_edges, migrations.RunPython.noop),
+    ]
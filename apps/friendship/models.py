@@ -1,5 +1,6 @@
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Friendship(models.Model):
@@ -61,7 +62,7 @@ class Friendship(models.Model):
     def accept(self):
         """Accept friendship request"""
         self.status = 'accepted'
-        self.response_date = models.timezone.now()
+        self.response_date = timezone.now()
         self.save()
         
         # Award points to both users
@@ -71,22 +72,20 @@ class Friendship(models.Model):
     def reject(self):
         """Reject friendship request"""
         self.status = 'rejected'
-        self.response_date = models.timezone.now()
+        self.response_date = timezone.now()
         self.save()
     
     def block(self):
         """Block user"""
         self.status = 'blocked'
-        self.response_date = models.timezone.now()
+        self.response_date = timezone.now()
         self.save()
     
     @classmethod
     def are_friends(cls, user1, user2):
         """Check if two users are friends"""
-        return cls.objects.filter(
-            models.Q(sender=user1, receiver=user2, status='accepted') |
-            models.Q(sender=user2, receiver=user1, status='accepted')
-        ).exists()
+        from apps.main.services.friend_graph import FriendGraph
+        return FriendGraph.are_friends(user1, user2)
     
     @classmethod
     def get_friendship_status(cls, user1, user2):
@@ -101,6 +100,62 @@ class Friendship(models.Model):
             return None
 
 
+class FriendEdgeManager(models.Manager):
+    """Keeps the symmetric edge table in sync with Friendship rows"""
+    
+    def sync(self, friendship):
+        """
+        Recompute both directions of the pair from its Friendship rows.
+        
+        A pair can have a request in each direction; rejecting or deleting one
+        of them must not drop the edges of the other if it is accepted.
+        """
+        user1, user2 = friendship.sender_id, friendship.receiver_id
+        accepted = Friendship.objects.filter(
+            models.Q(sender_id=user1, receiver_id=user2) | models.Q(sender_id=user2, receiver_id=user1),
+            status='accepted',
+        ).exists()
+        if accepted:
+            self.bulk_create([
+                self.model(user_id=user1, friend_id=user2),
+                self.model(user_id=user2, friend_id=user1),
+            ], ignore_conflicts=True)
+        else:
+            self.filter(
+                models.Q(user_id=user1, friend_id=user2) | models.Q(user_id=user2, friend_id=user1)
+            ).delete()
+
+
+class FriendEdge(models.Model):
+    """Denormalized accepted friendship, one row per direction"""
+    
+    user = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='friend_edges',
+        verbose_name="User"
+    )
+    
+    friend = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Friend"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = FriendEdgeManager()
+    
+    class Meta:
+        unique_together = ('user', 'friend')
+        verbose_name = "Friend Edge"
+        verbose_name_plural = "Friend Edges"
+        
+    def __str__(self):
+        return f"{self.user_id} <-> {self.friend_id}"
+
+
 class Follow(models.Model):
     """Follow system for users to follow each other without mutual acceptance"""
     
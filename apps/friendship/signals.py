@@ -0,0 +1,28 @@
+"""
+Signals that keep the friend edge table, the cached friend graph and the
+cached block sets in sync with friendship and block changes.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.friendship.models import Block, Friendship, FriendEdge
+from apps.main.services.block_service import BlockService
+from apps.main.services.friend_graph import FriendGraph
+
+
+@receiver(post_save, sender=Friendship)
+@receiver(post_delete, sender=Friendship)
+def sync_friend_edges(sender, instance, **kwargs):
+    """Recomputes the pair's symmetric edges when a request is accepted, rejected, blocked or deleted."""
+    FriendEdge.objects.sync(instance)
+    # After commit: a concurrent read before it would cache the old set again for the whole TTL
+    users = (instance.sender_id, instance.receiver_id)
+    transaction.on_commit(lambda: FriendGraph.invalidate(*users), robust=True)
+
+
+@receiver(post_save, sender=Block)
+@receiver(post_delete, sender=Block)
+def invalidate_block_sets(sender, instance, **kwargs):
+    """Drops both users' cached block sets."""
+    BlockService.invalidate(instance.blocker_id, instance.blocked_id)
@@ -1,2 +1,117 @@
+from django.core.cache import cache
 from django.test import TestCase
+from django.contrib.auth import get_user_model
+from apps.friendship.models import Block, Friendship, FriendEdge
+from apps.main.services.block_service import BlockService
+from apps.main.services.friend_graph import FriendGraph
+from apps.notification.models import Notification
+from apps.post.models import Post
 
+User = get_user_model()
+
+
+class FriendGraphTestCase(TestCase):
+    def setUp(self):
+        """Set up two users with a pending friendship request"""
+        cache.clear()
+        self.alice = User.objects.create_user(
+            username='alice', email='alice@example.com', password='testpass123', student_id='G-1'
+        )
+        self.bob = User.objects.create_user(
+            username='bob', email='bob@example.com', password='testpass123', student_id='G-2'
+        )
+        self.friendship = Friendship.objects.create(sender=self.alice, receiver=self.bob)
+
+    def test_accept_updates_cached_graph(self):
+        """Test accepting a request is visible through a warm cache"""
+        self.assertFalse(FriendGraph.are_friends(self.alice, self.bob))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.friendship.accept()
+        self.assertTrue(FriendGraph.are_friends(self.alice, self.bob))
+        self.assertEqual(FriendGraph.friend_ids(self.bob), {self.alice.id})
+        self.assertEqual(self.alice.get_friend_count(), 1)
+
+    def test_block_removes_friendship(self):
+        """Test blocking drops the edge for both users"""
+        self.friendship.accept()
+        self.assertTrue(FriendGraph.are_friends(self.bob, self.alice))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.friendship.block()
+        self.assertFalse(FriendGraph.are_friends(self.bob, self.alice))
+        self.assertEqual(FriendGraph.friend_ids(self.alice), frozenset())
+
+    def test_membership_check_is_cached(self):
+        """Test repeated checks do not hit the database"""
+        self.friendship.accept()
+        FriendGraph.friend_ids(self.alice)
+        with self.assertNumQueries(0):
+            self.assertTrue(Friendship.are_friends(self.alice, self.bob))
+
+    def test_edges_follow_friendship_status(self):
+        """Test accepted friendships keep one edge per direction"""
+        self.friendship.accept()
+        self.assertEqual(
+            set(FriendEdge.objects.values_list('user_id', 'friend_id')),
+            {(self.alice.id, self.bob.id), (self.bob.id, self.alice.id)}
+        )
+        self.friendship.delete()
+        self.assertFalse(FriendEdge.objects.exists())
+
+    def test_rejecting_reverse_request_keeps_accepted_friendship(self):
+        """Test rejecting or deleting a pending request in the other direction keeps the accepted edges"""
+        self.friendship.accept()
+        reverse = Friendship.objects.create(sender=self.bob, receiver=self.alice)
+        reverse.reject()
+        self.assertEqual(FriendEdge.objects.count(), 2)
+        reverse.delete()
+        self.assertEqual(FriendEdge.objects.count(), 2)
+        self.assertTrue(FriendGraph.are_friends(self.alice, self.bob))
+
+    def test_graph_is_invalidated_after_commit(self):
+        """Test the cached set is only dropped once the friendship change commits"""
+        FriendGraph.friend_ids(self.alice)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.friendship.accept()
+        self.assertEqual(FriendGraph.friend_ids(self.alice), frozenset())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(FriendGraph.friend_ids(self.alice), {self.bob.id})
+
+
+class BlockServiceTestCase(TestCase):
+    def setUp(self):
+        """Set up two users and a public post"""
+        cache.clear()
+        self.alice = User.objects.create_user(
+            username='alice', email='alice@example.com', password='testpass123', student_id='B-1'
+        )
+        self.bob = User.objects.create_user(
+            username='bob', email='bob@example.com', password='testpass123', student_id='B-2'
+        )
+        self.post = Post.objects.create(author=self.bob, content='Hello')
+
+    def test_block_set_is_bidirectional(self):
+        """Test a block hides content in both directions and unblocking restores it"""
+        self.assertTrue(Post.objects.visible_to(self.alice).filter(pk=self.post.pk).exists())
+        block = Block.objects.create(blocker=self.alice, blocked=self.bob)
+        self.assertEqual(BlockService.blocked_ids(self.bob), {self.alice.id})
+        self.assertFalse(Post.objects.visible_to(self.alice).filter(pk=self.post.pk).exists())
+        self.assertFalse(self.post.can_view(self.alice))
+        block.delete()
+        self.assertTrue(self.post.can_view(self.alice))
+
+    def test_block_set_is_cached(self):
+        """Test repeated checks do not hit the database"""
+        Block.objects.create(blocker=self.bob, blocked=self.alice)
+        BlockService.blocked_ids(self.alice)
+        with self.assertNumQueries(0):
+            self.assertTrue(BlockService.is_blocked(self.alice, self.bob))
+
+    def test_blocked_sender_creates_no_notification(self):
+        """Test notifications between blocked users are skipped"""
+        Block.objects.create(blocker=self.alice, blocked=self.bob)
+        result = Notification.create_notification(
+            recipient=self.alice, notification_type='like', title='Like', message='Hi', sender=self.bob
+        )
+        self.assertIsNone(result)
+        self.assertFalse(Notification.objects.exists())
@@ -4,6 +4,7 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib import messages
 from apps.group.models import Group
 from apps.group.forms import GroupForm
+from apps.main.services.search_service import SearchService
 
 
 class GroupListView(LoginRequiredMixin, ListView):
@@ -16,7 +17,7 @@ class GroupListView(LoginRequiredMixin, ListView):
 		qs = Group.objects.select_related('creator', 'subject', 'career').filter(is_active=True)
 		q = self.request.GET.get('q')
 		if q:
-			qs = qs.filter(name__icontains=q)
+			qs = SearchService.filter(qs, 'group', q)
 		return qs.order_by('-created_at')
 
 
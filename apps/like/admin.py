@@ -17,4 +17,4 @@ class LikeAdmin(admin.ModelAdmin):
     content_object_display.short_description = "Liked Object"
     
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related('user', 'content_type')
+        return super().get_queryset(request).select_related('user', 'content_type').prefetch_related('content_object')
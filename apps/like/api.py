@@ -1,9 +1,13 @@
 from ninja import Router, Schema
+from typing import List
 from ninja_jwt.authentication import JWTAuth
 
 from apps.like.models import Like
+from apps.main import content_types
+from apps.main.pagination import keyset_page
 
 router = Router()
+likes_router = Router()
 
 
 class LikeToggleResponse(Schema):
@@ -21,6 +25,41 @@ def toggle_post_like(request, post_id: int):
     
     like_instance, created = Like.objects.toggle_like(request.user, post)
     liked = created
-    like_count = Like.objects.get_like_count_for_object(post)
+    like_count = post.like_count
     
     return LikeToggleResponse(success=True, liked=liked, like_count=like_count)
+
+
+class LikedItemOut(Schema):
+    id: int
+    type: str
+    object_id: int
+    title: str | None = None
+    url: str | None = None
+    created_at: str
+
+
+class LikedItemsPageOut(Schema):
+    size: int
+    items: List[LikedItemOut]
+    next_cursor: str | None = None
+
+
+@likes_router.get("/", auth=JWTAuth(), response=LikedItemsPageOut)
+def list_my_likes(request, size: int = 20, cursor: str = ''):
+    size = max(1, min(size, 100))
+    qs = Like.objects.filter(user=request.user)
+    qs_page, next_cursor = keyset_page(qs, '-created_at', cursor, size)
+    qs_page = content_types.prefetch_content_objects(qs_page)
+    items = []
+    for like in qs_page:
+        target = like.content_object
+        items.append(LikedItemOut(
+            id=like.id,
+            type=content_types.get_for_id(like.content_type_id).model,
+            object_id=like.object_id,
+            title=str(target)[:100] if target is not None else None,
+            url=target.get_absolute_url() if hasattr(target, 'get_absolute_url') else None,
+            created_at=like.created_at.isoformat(),
+        ))
+    return LikedItemsPageOut(size=size, items=items, next_cursor=next_cursor)
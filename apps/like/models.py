@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.contenttypes.models import ContentType
+from apps.main import content_types
 from django.contrib.contenttypes.fields import GenericForeignKey
 
 
@@ -8,7 +9,7 @@ class LikeManager(models.Manager):
     
     def get_likes_for_object(self, obj):
         """Get all likes for a specific object"""
-        content_type = ContentType.objects.get_for_model(obj)
+        content_type = content_types.get_for_model(obj)
         return self.filter(
             content_type=content_type,
             object_id=obj.pk
@@ -22,16 +23,46 @@ class LikeManager(models.Manager):
         """Check if user has liked a specific object"""
         if not user.is_authenticated:
             return False
-        content_type = ContentType.objects.get_for_model(obj)
+        content_type = content_types.get_for_model(obj)
         return self.filter(
             user=user,
             content_type=content_type,
             object_id=obj.pk
         ).exists()
     
+    def liked_ids(self, user, objects, content_type=None):
+        """
+        IDs of the given objects liked by the user, in one query.
+        Accepts model instances, or IDs plus their content type.
+        """
+        objects = list(objects)
+        if not objects or user is None or not user.is_authenticated:
+            return set()
+        if content_type is None:
+            content_type = content_types.get_for_model(objects[0])
+        ids = [getattr(obj, 'pk', obj) for obj in objects]
+        return set(self.filter(
+            user=user,
+            content_type=content_type,
+            object_id__in=ids
+        ).values_list('object_id', flat=True))
+    
+    def prefetch_liked_by(self, user, objects):
+        """Set obj.liked_by_me on each object with a single query"""
+        objects = list(objects)
+        liked = self.liked_ids(user, objects)
+        for obj in objects:
+            obj.liked_by_me = obj.pk in liked
+        return objects
+    
+    @transaction.atomic
     def toggle_like(self, user, obj):
-        """Toggle like for user on object. Returns (like_instance, created)"""
-        content_type = ContentType.objects.get_for_model(obj)
+        """
+        Toggle like for user on object. Returns (like_instance, created).
+        Keeps obj.like_count in sync when the model has that counter.
+        """
+        from apps.main.services.counter_service import CounterService
+        content_type = content_types.get_for_model(obj)
         like, created = self.get_or_create(
             user=user,
             content_type=content_type,
@@ -39,9 +70,27 @@ class LikeManager(models.Manager):
         )
         if not created:
             like.delete()
+            CounterService.increment(obj, 'like_count', -1)
+            self._publish_count(obj)
             return None, False
+        CounterService.increment(obj, 'like_count', 1)
+        self._publish_count(obj)
         return like, True
 
+    def _publish_count(self, obj):
+        """
+        Pushes the new like count to the author's live channel.
+
+        Only the author receives it: channels are per user, and fanning out
+        to everyone viewing the post would need a per-object subscription.
+        """
+        if getattr(obj, 'author_id', None) and hasattr(obj, 'like_count'):
+            from apps.main import live
+            live.publish(obj.author_id, 'like_count', {
+                'target': f'{obj._meta.model_name}-{obj.pk}',
+                'like_count': obj.like_count,
+            })
+
 
 class Like(models.Model):
     """
@@ -1 +1,28 @@
 from django.contrib import admin
+from .models import LiveEvent, OutboxEvent
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ('topic', 'user', 'status', 'attempts', 'available_at', 'created_at', 'processed_at')
+    list_filter = ('status', 'topic', 'created_at')
+    search_fields = ('topic', 'user__username', 'dedupe_key')
+    readonly_fields = ('created_at', 'processed_at')
+    raw_id_fields = ('user',)
+    ordering = ('-id',)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
+
+
+@admin.register(LiveEvent)
+class LiveEventAdmin(admin.ModelAdmin):
+    list_display = ('event', 'user', 'created_at')
+    list_filter = ('event', 'created_at')
+    search_fields = ('event', 'user__username')
+    readonly_fields = ('created_at',)
+    raw_id_fields = ('user',)
+    ordering = ('-id',)
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('user')
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.main'
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+        from apps.main import content_types
+
+        # El registro de content types se carga al primer uso y se vacía tras migrate
+        post_migrate.connect(content_types.clear, dispatch_uid='main.content_types.clear')
+
+        # Registra los handlers del outbox
+        import apps.main.services.gamification_service  # noqa: F401
+        import apps.main.signals  # noqa: F401
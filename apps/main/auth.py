@@ -0,0 +1,26 @@
+"""
+Autenticación opcional para los endpoints públicos de la API.
+
+Sin auth, ninja no resuelve el token JWT y request.user queda como el
+usuario de la sesión (o AnonymousUser): un cliente con token vería solo
+lo público y nunca su propio estado (liked_by_me, my_reaction).
+
+Uso:
+    from apps.main.auth import optional_auth
+
+    @router.get("/", auth=optional_auth, response=...)
+
+Con token se usa el usuario del JWT (un token inválido responde 401);
+si no, la sesión del navegador; si tampoco hay sesión, el request sigue
+como anónimo.
+"""
+
+from ninja.security import django_auth
+from ninja_jwt.authentication import JWTAuth
+
+
+def _anonymous(request):
+    return True
+
+
+optional_auth = [JWTAuth(), django_auth, _anonymous]
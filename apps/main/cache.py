@@ -0,0 +1,118 @@
+"""
+Helpers sobre la caché compartida.
+
+- Claves versionadas por tags: cada tag tiene una versión guardada en la
+  caché; la clave final incluye las versiones de sus tags, de modo que
+  invalidar un tag deja obsoletas todas sus claves sin tener que listarlas.
+- get_or_set con protección contra estampidas: ante un miss, un solo
+  proceso recalcula el valor mientras los demás esperan a que aparezca.
+
+Uso:
+    from apps.main import cache as shared_cache
+
+    key = shared_cache.make_key('post', post.id, tags=[f'post:{post.id}'])
+    data = shared_cache.get_or_set(key, lambda: build(post), timeout=300)
+    shared_cache.invalidate(f'post:{post.id}')
+"""
+
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+_MISSING = object()
+
+
+def _tag_key(tag: str) -> str:
+    return f'tag:{tag}'
+
+
+def _new_version() -> str:
+    # Token aleatorio: si la caché pierde la versión, nunca se reutiliza una anterior
+    return uuid.uuid4().hex[:12]
+
+
+def tag_versions(tags) -> list:
+    """Devuelve la versión actual de cada tag, creándola si no existe."""
+    tags = list(tags)
+    if not tags:
+        return []
+    keys = [_tag_key(tag) for tag in tags]
+    found = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        for key, version in missing.items():
+            cache.add(key, version, None)
+        found.update(cache.get_many(list(missing)))
+    return [found.get(key, '') for key in keys]
+
+
+def make_key(name: str, *parts, tags=()) -> str:
+    """
+    Arma una clave versionada.
+
+    Args:
+        name: Espacio de nombres (ej: 'stats', 'leaderboard')
+        parts: Partes variables de la clave (ids, filtros)
+        tags: Tags cuya invalidación debe volver obsoleta esta clave
+
+    Returns:
+        str con la clave a usar en la caché
+    """
+    version = getattr(settings, 'CACHE_KEY_VERSION', 1)
+    key = ':'.join([f'v{version}', name, *(str(part) for part in parts)])
+    versions = tag_versions(tags)
+    if versions:
+        key = f'{key}@{".".join(versions)}'
+    return key
+
+
+def invalidate(*tags) -> None:
+    """Invalida todas las claves armadas con alguno de estos tags."""
+    if tags:
+        cache.set_many({_tag_key(tag): _new_version() for tag in tags}, None)
+
+
+def get_or_set(key: str, default, timeout=None, lock_timeout: int = 10):
+    """
+    Devuelve el valor de la clave o lo calcula con default() una sola vez.
+
+    Mientras un proceso calcula el valor, los demás esperan hasta
+    lock_timeout segundos a que aparezca; si no aparece, lo calculan ellos.
+
+    Args:
+        key: Clave (normalmente de make_key)
+        default: Función sin argumentos que calcula el valor
+        timeout: Expiración del valor en segundos
+        lock_timeout: Tiempo máximo que se espera o se retiene el lock
+
+    Returns:
+        el valor en caché o el recién calculado
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f'lock:{key}'
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            value = default()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + lock_timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        delay = min(delay * 2, 0.2)
+
+    value = default()
+    cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,85 @@
+"""
+Registro de content types en memoria del proceso.
+
+Las relaciones genéricas (likes, reacciones, notificaciones) necesitan el
+ContentType de un modelo en cada request. El registro carga todos los
+content types con una sola consulta la primera vez que se usa y luego
+responde desde memoria; se vacía después de cada migrate.
+
+Uso:
+    from apps.main import content_types
+
+    content_type = content_types.get_for_model(post)
+    content_types.prefetch_content_objects(notifications)
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import prefetch_related_objects
+
+
+_by_model = {}
+_by_id = {}
+
+
+def _remember(content_type):
+    _by_model[(content_type.app_label, content_type.model)] = content_type
+    _by_id[content_type.id] = content_type
+    return content_type
+
+
+def warm() -> None:
+    """Carga todos los content types en el registro."""
+    for content_type in ContentType.objects.all():
+        _remember(content_type)
+
+
+def clear(**kwargs) -> None:
+    """Vacía el registro (se conecta a post_migrate)."""
+    _by_model.clear()
+    _by_id.clear()
+
+
+def get_for_model(model) -> ContentType:
+    """
+    Devuelve el ContentType de un modelo o instancia.
+
+    Args:
+        model: Clase de modelo o instancia
+
+    Returns:
+        ContentType (se crea si todavía no existe)
+    """
+    if not _by_id:
+        warm()
+    opts = model._meta.concrete_model._meta
+    content_type = _by_model.get((opts.app_label, opts.model_name))
+    if content_type is None:
+        content_type = _remember(ContentType.objects.get_for_model(model))
+    return content_type
+
+
+def get_for_id(content_type_id: int) -> ContentType:
+    """Devuelve el ContentType con ese id."""
+    if not _by_id:
+        warm()
+    content_type = _by_id.get(content_type_id)
+    if content_type is None:
+        content_type = _remember(ContentType.objects.get_for_id(content_type_id))
+    return content_type
+
+
+def prefetch_content_objects(objects, field: str = 'content_object'):
+    """
+    Carga los objetos de una GenericForeignKey para una lista de filas:
+    agrupa por content type y hace una consulta por modelo destino.
+
+    Args:
+        objects: Filas con la GenericForeignKey (Notification, Like, ...)
+        field: Nombre de la GenericForeignKey
+
+    Returns:
+        list con las mismas filas, con el objeto destino ya en caché
+    """
+    objects = list(objects)
+    prefetch_related_objects(objects, field)
+    return objects
@@ -0,0 +1,14 @@
+from apps.main import live
+from apps.main.services.notification_service import NotificationService
+
+
+def live_channel(request):
+    """
+    Expone live_enabled (solo se conecta a /live/ si lo atiende ASGI) y el contador
+    de notificaciones no leídas, que se lee de la caché solo si el template lo usa.
+    """
+    context = {'live_enabled': live.connectable(request)}
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        context['unread_notifications'] = lambda: NotificationService.unread_count(user.pk)
+    return context
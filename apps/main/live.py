@@ -0,0 +1,204 @@
+"""
+Canal de eventos en vivo (Server-Sent Events).
+
+Los productores llaman a publish() desde código sincrónico: el evento se
+guarda en la tabla LiveEvent al confirmar la transacción, de modo que
+llega a las conexiones abiertas en cualquier worker. En cada proceso ASGI
+un único Broker lee la tabla cada LIVE_POLL_INTERVAL segundos (una consulta
+para todas las conexiones del proceso) y reparte los eventos en memoria a
+las colas de los suscriptores; una conexión abierta no toca la base de
+datos mientras espera.
+
+Uso:
+    from apps.main import live
+
+    live.publish(user, 'points', {'total_points': 120, 'level': 2})
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+
+from apps.main.models import LiveEvent
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _ids(users) -> list:
+    if not isinstance(users, (list, tuple, set, frozenset)):
+        users = [users]
+    return list(dict.fromkeys(getattr(user, 'pk', user) for user in users))
+
+
+def available(request) -> bool:
+    """
+    Indica si el request puede mantener abierto el stream.
+
+    Bajo WSGI (runserver, gunicorn sync) Django junta toda la respuesta
+    asíncrona antes de enviarla: el cliente no recibiría nada en vivo y
+    cada pestaña ocuparía un thread durante LIVE_STREAM_MAX_SECONDS.
+    """
+    return _setting('LIVE_ENABLED', True) and isinstance(request, ASGIRequest)
+
+
+def connectable(request) -> bool:
+    """
+    Indica si las páginas deben abrir el stream: el sitio corre bajo ASGI o
+    un proceso ASGI aparte atiende /live/ (LIVE_SEPARATE_SERVER).
+    """
+    if _setting('LIVE_SEPARATE_SERVER', False):
+        return _setting('LIVE_ENABLED', True)
+    return available(request)
+
+
+def publish(users, event: str, data: dict = None) -> None:
+    """
+    Publica un evento para uno o varios usuarios al confirmar la transacción.
+
+    Args:
+        users: Usuario, id o lista de usuarios/ids
+        event: Nombre del evento SSE (ej: 'notification', 'points')
+        data: Datos serializables a JSON
+    """
+    user_ids = _ids(users)
+    if not user_ids:
+        return
+    rows = [LiveEvent(user_id=user_id, event=event, data=data or {}) for user_id in user_ids]
+    transaction.on_commit(
+        lambda: LiveEvent.objects.bulk_create(rows, batch_size=_setting('NOTIFICATION_BATCH_SIZE', 500)),
+        robust=True,
+    )
+
+
+def format_event(event: LiveEvent) -> str:
+    """Serializa un LiveEvent en el formato de Server-Sent Events."""
+    return f'id: {event.pk}\nevent: {event.event}\ndata: {json.dumps(event.data)}\n\n'
+
+
+def _events_after(last_id: int, user_ids, limit: int = 500) -> list:
+    return list(
+        LiveEvent.objects.filter(pk__gt=last_id, user_id__in=user_ids).order_by('id')[:limit]
+    )
+
+
+def _last_id() -> int:
+    return LiveEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+class Broker:
+    """
+    Pub/sub en memoria del proceso: un solo lector de LiveEvent que
+    reparte a las colas de las conexiones abiertas.
+    """
+
+    def __init__(self):
+        self._queues = defaultdict(set)
+        self._task = None
+        self._last_id = 0
+
+    async def subscribe(self, user_id: int) -> asyncio.Queue:
+        """Registra una conexión y arranca el lector si es la primera."""
+        queue = asyncio.Queue(maxsize=_setting('LIVE_QUEUE_SIZE', 100))
+        loop = asyncio.get_running_loop()
+        self._queues[user_id].add(queue)
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # Se asigna antes de cualquier await: dos conexiones simultáneas
+            # no pueden arrancar dos lectores
+            self._task = loop.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        """Quita una conexión; el lector se detiene solo cuando no quedan."""
+        queues = self._queues.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[user_id]
+
+    def _deliver(self, event: LiveEvent) -> None:
+        for queue in self._queues.get(event.user_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Cliente demasiado lento: se pierde el evento, no el resto
+                logger.warning(f"Cola llena para el usuario {event.user_id}, evento {event.pk} descartado")
+
+    async def _run(self) -> None:
+        # Las conexiones nuevas recuperan lo anterior con Last-Event-ID
+        self._last_id = await sync_to_async(_last_id)()
+        while self._queues:
+            await asyncio.sleep(_setting('LIVE_POLL_INTERVAL', 1.0))
+            try:
+                events = await sync_to_async(_events_after)(self._last_id, list(self._queues))
+            except Exception as e:
+                logger.error(f"Error leyendo eventos en vivo: {e}", exc_info=True)
+                continue
+            for event in events:
+                self._last_id = max(self._last_id, event.pk)
+                self._deliver(event)
+
+
+broker = Broker()
+
+
+async def stream(user_id: int, last_event_id=None, snapshot: dict = None):
+    """
+    Generador de la respuesta SSE de un usuario.
+
+    Args:
+        user_id: Usuario conectado
+        last_event_id: Último id recibido por el cliente (reconexión)
+        snapshot: dict {evento: datos} que se envía al conectar
+
+    Yields:
+        str con eventos SSE y comentarios de keep-alive
+    """
+    queue = await broker.subscribe(user_id)
+    try:
+        yield f"retry: {_setting('LIVE_RETRY_MS', 3000)}\n\n"
+        for event, data in (snapshot or {}).items():
+            yield f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+        sent_id = 0
+        if last_event_id and str(last_event_id).isdigit():
+            for event in await sync_to_async(_events_after)(int(last_event_id), [user_id]):
+                sent_id = event.pk
+                yield format_event(event)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + _setting('LIVE_STREAM_MAX_SECONDS', 300)
+        heartbeat = _setting('LIVE_HEARTBEAT', 15)
+        # Se corta cada tanto para que el cliente reconecte y reparta la carga entre workers
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            # Nunca se reenvía un evento ya entregado (replay o duplicado)
+            if event.pk > sent_id:
+                sent_id = event.pk
+                yield format_event(event)
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+def prune(older_than) -> int:
+    """
+    Borra los eventos anteriores a la fecha dada.
+
+    Returns:
+        cantidad de eventos borrados
+    """
+    deleted, _ = LiveEvent.objects.filter(created_at__lt=older_than).delete()
+    return deleted
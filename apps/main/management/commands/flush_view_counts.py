@@ -0,0 +1,18 @@
+"""
+Comando para volcar a la base de datos las vistas acumuladas en caché.
+
+Uso: python manage.py flush_view_counts
+"""
+
+from django.core.management.base import BaseCommand
+from apps.main.services.view_counter import ViewCounter
+
+
+class Command(BaseCommand):
+    help = 'Vuelca las vistas de posts y apuntes acumuladas en caché'
+
+    def handle(self, *args, **options):
+        flushed = ViewCounter.flush()
+        self.stdout.write(
+            self.style.SUCCESS(f'Vistas volcadas: {flushed}')
+        )
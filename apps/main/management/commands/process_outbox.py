@@ -0,0 +1,40 @@
+"""
+Worker que consume los eventos pendientes del outbox.
+
+Uso: python manage.py process_outbox --topic gamification --loop
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from apps.main import outbox
+
+
+class Command(BaseCommand):
+    help = 'Procesa en lotes los eventos pendientes del outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topic', default=None, help='Procesar solo un tópico base (ej: gamification)')
+        parser.add_argument('--batch-size', type=int, default=100, help='Eventos por lote')
+        parser.add_argument('--loop', action='store_true', help='Seguir esperando eventos nuevos')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Segundos de espera cuando no hay eventos')
+        parser.add_argument('--max-batches', type=int, default=0, help='Cortar después de N lotes (0 = sin límite)')
+
+    def handle(self, *args, **options):
+        processed = 0
+        batches = 0
+        while True:
+            taken = outbox.process_batch(options['topic'], options['batch_size'])
+            processed += taken
+            batches += 1 if taken else 0
+
+            if options['max_batches'] and batches >= options['max_batches']:
+                break
+            if not taken:
+                if not options['loop']:
+                    break
+                time.sleep(options['sleep'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Eventos procesados: {processed}')
+        )
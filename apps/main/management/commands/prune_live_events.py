@@ -0,0 +1,28 @@
+"""
+Comando para borrar los eventos en vivo ya entregados.
+
+Uso: python manage.py prune_live_events --minutes 60
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from apps.main import live
+
+
+class Command(BaseCommand):
+    help = 'Borra los eventos en vivo (SSE) más viejos que la retención configurada'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes', type=int, default=getattr(settings, 'LIVE_EVENT_RETENTION_MINUTES', 60),
+            help='Conservar los eventos de los últimos N minutos'
+        )
+
+    def handle(self, *args, **options):
+        deleted = live.prune(timezone.now() - timedelta(minutes=options['minutes']))
+        self.stdout.write(
+            self.style.SUCCESS(f'Eventos borrados: {deleted}')
+        )
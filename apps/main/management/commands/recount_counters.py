@@ -0,0 +1,83 @@
+"""
+Comando para recalcular los contadores desnormalizados de posts, comentarios y reacciones.
+
+Uso: python manage.py recount_counters [--batch-size 5000]
+
+Corrige cualquier desvío (por ejemplo, likes borrados en cascada) con
+updates masivos por rangos de IDs en lugar de recorrer objeto por objeto.
+"""
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.comment.models import Comment
+from apps.like.models import Like
+from apps.post.models import Post
+from apps.reaction.models import Reaction, ReactionCount
+
+
+def count_of(queryset, group_field):
+    """Subquery COUNT(*) correlacionada con la fila externa."""
+    return Coalesce(Subquery(
+        queryset.order_by().values(group_field).annotate(total=Count('*')).values('total')[:1]
+    ), 0)
+
+
+class Command(BaseCommand):
+    help = 'Recalcula like_count, comment_count y los contadores de reacciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Cantidad de IDs por update')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        post_ct = ContentType.objects.get_for_model(Post)
+        comment_ct = ContentType.objects.get_for_model(Comment)
+
+        posts = self.update_in_batches(Post, batch_size, {
+            'like_count': count_of(Like.objects.filter(content_type=post_ct, object_id=OuterRef('pk')), 'object_id'),
+            'reaction_count': count_of(Reaction.objects.filter(content_type=post_ct, object_id=OuterRef('pk')), 'object_id'),
+            'comment_count': count_of(Comment.objects.filter(post=OuterRef('pk')), 'post'),
+        })
+        comments = self.update_in_batches(Comment, batch_size, {
+            'like_count': count_of(Like.objects.filter(content_type=comment_ct, object_id=OuterRef('pk')), 'object_id'),
+            'reaction_count': count_of(Reaction.objects.filter(content_type=comment_ct, object_id=OuterRef('pk')), 'object_id'),
+        })
+        reaction_rows = self.rebuild_reaction_counts()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Posts: {posts} | Comentarios: {comments} | Contadores de reacciones: {reaction_rows}'
+        ))
+
+    def update_in_batches(self, model, batch_size, values):
+        """Aplica el update por rangos de pk para no bloquear toda la tabla."""
+        updated = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                model._base_manager.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                return updated
+            updated += model._base_manager.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(**values)
+            last_pk = pks[-1]
+
+    @transaction.atomic
+    def rebuild_reaction_counts(self):
+        """Reconstruye la tabla ReactionCount con un único GROUP BY."""
+        ReactionCount.objects.all().delete()
+        totals = Reaction.objects.order_by().values(
+            'content_type_id', 'object_id', 'reaction_type'
+        ).annotate(total=Count('id'))
+        created = ReactionCount.objects.bulk_create(
+            (ReactionCount(
+                content_type_id=row['content_type_id'],
+                object_id=row['object_id'],
+                reaction_type=row['reaction_type'],
+                count=row['total'],
+            ) for row in totals.iterator()),
+            batch_size=1000,
+        )
+        return len(created)
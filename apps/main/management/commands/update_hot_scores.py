@@ -0,0 +1,21 @@
+"""
+Comando para recalcular el hot score de los posts con actividad reciente.
+
+Uso: python manage.py update_hot_scores [--full]
+"""
+
+from django.core.management.base import BaseCommand
+from apps.main.services.hot_service import HotScoreService
+
+
+class Command(BaseCommand):
+    help = 'Recalcula el hot score de los posts con actividad desde la última corrida'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recalcular todos los posts de la ventana')
+
+    def handle(self, *args, **options):
+        updated = HotScoreService.update_scores(full=options['full'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Posts actualizados: {updated}')
+        )
@@ -0,0 +1,31 @@
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(max_length=30, verbose_name='Event')),
+                ('data', models.JSONField(blank=True, default=dict, verbose_name='Data')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='live_events', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Live Event',
+                'verbose_name_plural': 'Live Events',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['user', 'id'], name='main_liveev_user_id_0b9a7b_idx'), models.Index(fields=['created_at'], name='main_liveev_created_d50228_idx')],
+            },
+        ),
+    ]
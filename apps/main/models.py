@@ -1,2 +1,120 @@
 from django.db import models
+from django.utils import timezone
 
+
+class OutboxEvent(models.Model):
+    """
+    Durable queue of work that runs outside the request cycle.
+    Rows are consumed in batches by the process_outbox command.
+    """
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    topic = models.CharField(
+        max_length=50,
+        verbose_name="Topic"
+    )
+    
+    user = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='outbox_events',
+        verbose_name="User"
+    )
+    
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Payload"
+    )
+    
+    dedupe_key = models.CharField(
+        max_length=100,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text="Events sharing this key are only enqueued once",
+        verbose_name="Deduplication key"
+    )
+    
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='pending',
+        verbose_name="Status"
+    )
+    
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Attempts"
+    )
+    
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Last error"
+    )
+    
+    available_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Available at"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Outbox Event"
+        verbose_name_plural = "Outbox Events"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at', 'id']),
+        ]
+        
+    def __str__(self):
+        return f"{self.topic} #{self.pk} ({self.status})"
+
+
+class LiveEvent(models.Model):
+    """
+    Relay for live events pushed over Server-Sent Events.
+    Every ASGI process tails this table, so an event written by any worker
+    reaches the user's open connections. Old rows are removed by prune_live_events.
+    """
+    
+    user = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='live_events',
+        verbose_name="User"
+    )
+    
+    event = models.CharField(
+        max_length=30,
+        verbose_name="Event"
+    )
+    
+    data = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name="Data"
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = "Live Event"
+        verbose_name_plural = "Live Events"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['user', 'id']),
+            models.Index(fields=['created_at']),
+        ]
+        
+    def __str__(self):
+        return f"{self.event} for user {self.user_id} #{self.pk}"
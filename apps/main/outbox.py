@@ -0,0 +1,126 @@
+"""
+Cola de eventos respaldada por la base de datos (outbox).
+
+Los productores llaman a enqueue() dentro del request; el comando
+process_outbox consume los eventos pendientes en lotes y los entrega al
+handler registrado para su tópico, fuera del camino del request.
+
+En producción start.sh deja corriendo `process_outbox --loop` junto al
+servidor web; con OUTBOX_EAGER (por defecto igual a DEBUG) los eventos se
+procesan al confirmar la transacción, sin worker.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.main.models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+
+_handlers = {}
+
+
+def register(topic_prefix: str):
+    """
+    Registra un handler para los tópicos que empiezan con topic_prefix.
+
+    El handler recibe la lista de eventos de un mismo usuario y tópico
+    base, y se ejecuta dentro de un savepoint: si falla, ninguno de sus
+    efectos se persiste y los eventos se reintentan más tarde.
+    """
+    def decorator(handler):
+        _handlers[topic_prefix] = handler
+        return handler
+    return decorator
+
+
+def _handler_for(topic: str):
+    return _handlers.get(topic.split('.', 1)[0])
+
+
+def enqueue(topic: str, user=None, payload: dict = None, dedupe_key: str = None):
+    """
+    Encola un evento. Si dedupe_key ya existe, el evento no se duplica.
+
+    Returns:
+        OutboxEvent creado o None si era un duplicado
+    """
+    event = OutboxEvent(
+        topic=topic,
+        user=user,
+        payload=payload or {},
+        dedupe_key=dedupe_key,
+    )
+    try:
+        # El savepoint deja usable la transacción del request si la clave ya existe
+        with transaction.atomic():
+            event.save()
+    except IntegrityError:
+        if dedupe_key is None:
+            raise
+        return None
+    if getattr(settings, 'OUTBOX_EAGER', False):
+        transaction.on_commit(lambda: process_batch(topic_prefix=topic.split('.', 1)[0]), robust=True)
+    return event
+
+
+def _group_key(event):
+    # Los eventos sin usuario se procesan de a uno
+    return (event.topic.split('.', 1)[0], event.user_id or f'event-{event.pk}')
+
+
+@transaction.atomic
+def process_batch(topic_prefix: str = None, batch_size: int = 100) -> int:
+    """
+    Procesa un lote de eventos pendientes.
+
+    Args:
+        topic_prefix: Limitar a un tópico base (ej: 'gamification')
+        batch_size: Máximo de eventos a tomar
+
+    Returns:
+        cantidad de eventos tomados del lote
+    """
+    now = timezone.now()
+    pending = OutboxEvent.objects.filter(status='pending', available_at__lte=now)
+    if topic_prefix:
+        pending = pending.filter(topic__startswith=topic_prefix)
+    # skip_locked permite correr varios workers sin pisarse
+    events = list(pending.select_for_update(skip_locked=True).order_by('id')[:batch_size])
+    if not events:
+        return 0
+
+    max_attempts = getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 5)
+    # Los grupos se procesan en el orden de su primer evento
+    groups = {}
+    for event in events:
+        groups.setdefault(_group_key(event), []).append(event)
+    for group in groups.values():
+        handler = _handler_for(group[0].topic)
+        ids = [event.pk for event in group]
+        try:
+            if handler is None:
+                raise LookupError(f'No handler registered for {group[0].topic}')
+            with transaction.atomic():
+                handler(group)
+            OutboxEvent.objects.filter(pk__in=ids).update(
+                status='done',
+                attempts=group[0].attempts + 1,
+                processed_at=timezone.now(),
+                last_error='',
+            )
+        except Exception as e:
+            logger.error(f"Error procesando eventos {ids}: {e}", exc_info=True)
+            attempts = group[0].attempts + 1
+            OutboxEvent.objects.filter(pk__in=ids).update(
+                status='failed' if attempts >= max_attempts else 'pending',
+                attempts=attempts,
+                available_at=now + timedelta(seconds=2 ** attempts),
+                last_error=str(e)[:1000],
+            )
+    return len(events)
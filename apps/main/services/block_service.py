@@ -0,0 +1,81 @@
+"""
+Servicio de bloqueos entre usuarios.
+Guarda en la caché compartida, para cada usuario, el conjunto de ids con
+los que existe un bloqueo en cualquier dirección, de modo que los listados
+excluyan a esos usuarios con un chequeo en memoria o un único NOT IN.
+"""
+
+from django.conf import settings
+from django.db.models import Q
+from apps.main import cache as shared_cache
+
+
+class BlockService:
+    """Servicio para aplicar los bloqueos en lecturas y notificaciones."""
+
+    @staticmethod
+    def _id(user):
+        return getattr(user, 'pk', user)
+
+    @staticmethod
+    def _load(user_id: int) -> frozenset:
+        from apps.friendship.models import Block
+
+        rows = Block.objects.filter(
+            Q(blocker_id=user_id) | Q(blocked_id=user_id)
+        ).values_list('blocker_id', 'blocked_id')
+        return frozenset(
+            blocked_id if blocker_id == user_id else blocker_id
+            for blocker_id, blocked_id in rows
+        )
+
+    @staticmethod
+    def blocked_ids(user) -> frozenset:
+        """
+        Devuelve los ids bloqueados por el usuario o que lo bloquearon.
+
+        Args:
+            user: Usuario, id de usuario o None/anónimo
+
+        Returns:
+            frozenset de ids (vacío para anónimos)
+        """
+        user_id = BlockService._id(user)
+        if not user_id:
+            return frozenset()
+        key = shared_cache.make_key('blocks', user_id, tags=[f'blocks:{user_id}'])
+        return shared_cache.get_or_set(
+            key,
+            lambda: BlockService._load(user_id),
+            timeout=getattr(settings, 'BLOCK_LIST_TIMEOUT', 60 * 60),
+        )
+
+    @staticmethod
+    def is_blocked(user1, user2) -> bool:
+        """Indica si hay un bloqueo entre los dos usuarios, en cualquier dirección."""
+        other_id = BlockService._id(user2)
+        return bool(other_id) and other_id in BlockService.blocked_ids(user1)
+
+    @staticmethod
+    def exclude_blocked(queryset, user, field: str = 'author'):
+        """
+        Excluye del queryset las filas cuyo campo apunta a un usuario bloqueado.
+
+        Args:
+            queryset: QuerySet a filtrar
+            user: Usuario que consulta
+            field: Campo FK a usuario ('author', 'sender', 'pk' para User)
+
+        Returns:
+            QuerySet filtrado (sin cambios si no hay bloqueos)
+        """
+        ids = BlockService.blocked_ids(user)
+        if not ids:
+            return queryset
+        lookup = 'pk__in' if field == 'pk' else f'{field}_id__in'
+        return queryset.exclude(**{lookup: sorted(ids)})
+
+    @staticmethod
+    def invalidate(*users) -> None:
+        """Descarta los conjuntos en caché de los usuarios indicados."""
+        shared_cache.invalidate(*(f'blocks:{BlockService._id(user)}' for user in users))
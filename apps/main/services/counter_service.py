@@ -0,0 +1,49 @@
+"""
+Servicio de contadores desnormalizados.
+Mantiene columnas como like_count o comment_count con updates atómicos (F()).
+En los modelos con last_activity_at (Post) el mismo update marca la
+actividad, que usa el cálculo incremental del hot score.
+"""
+
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+
+
+class CounterService:
+    """Servicio para actualizar contadores persistidos sin read-modify-write."""
+
+    @staticmethod
+    def has_counter(model, field: str) -> bool:
+        """Indica si el modelo tiene una columna de contador con ese nombre."""
+        return any(f.name == field for f in model._meta.concrete_fields)
+
+    @staticmethod
+    def increment(obj, field: str, delta: int = 1) -> bool:
+        """
+        Suma delta al contador del objeto en la base de datos.
+
+        Args:
+            obj: Instancia dueña del contador (Post, Comment, ...)
+            field: Nombre de la columna del contador
+            delta: Cantidad a sumar (negativa para restar)
+
+        Returns:
+            True si el modelo tiene el contador y se actualizó
+        """
+        if not CounterService.increment_pk(type(obj), obj.pk, field, delta):
+            return False
+        # Reflejar el cambio en memoria sin volver a consultar
+        setattr(obj, field, max((getattr(obj, field) or 0) + delta, 0))
+        return True
+
+    @staticmethod
+    def increment_pk(model, pk, field: str, delta: int = 1) -> bool:
+        """Igual que increment pero sin necesitar la instancia cargada."""
+        if not delta or not CounterService.has_counter(model, field):
+            return False
+
+        updates = {field: Greatest(F(field) + delta, 0)}
+        if CounterService.has_counter(model, 'last_activity_at'):
+            updates['last_activity_at'] = Now()
+        model._base_manager.filter(pk=pk).update(**updates)
+        return True
@@ -0,0 +1,222 @@
+"""
+Servicio de digests de notificaciones por email.
+Recorre las notificaciones sin enviar ordenadas por destinatario con un
+cursor del lado del servidor (iterator), arma un único email por usuario
+con los tipos que habilitó en sus preferencias y los envía en lotes por la
+misma conexión del backend de email. Las filas se marcan como enviadas con
+UPDATEs por lote: en memoria solo hay un usuario y un lote de emails a la vez
+(más los ids a marcar, fuera de PostgreSQL, hasta terminar de leer el cursor).
+"""
+
+import logging
+import smtplib
+import time
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from apps.main.services.notification_service import PREFERENCE_FIELDS
+from apps.notification.models import Notification, NotificationPreference
+
+
+# Preferencia de email que controla cada tipo (los tipos sin entrada se envían siempre)
+EMAIL_PREFERENCE_FIELDS = {
+    notification_type: field.replace('app_', 'email_', 1)
+    for notification_type, field in PREFERENCE_FIELDS.items()
+}
+
+PREFERENCE_PREFIX = 'recipient__notification_preferences__'
+
+ROW_FIELDS = [
+    'id', 'recipient_id', 'recipient__email', 'recipient__username', 'notification_type',
+    'title', 'message', 'action_url', 'is_read', 'actor_count', 'created_at',
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _is_permanent(error) -> bool:
+    """Errores que se repetirían en cada reintento con el mismo destinatario."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException) and not isinstance(error, smtplib.SMTPSenderRefused):
+        return error.smtp_code >= 500
+    # Dirección mal formada al armar los headers
+    return isinstance(error, (ValueError, UnicodeError))
+
+
+def _default(field: str):
+    return NotificationPreference._meta.get_field(field).default
+
+
+class DigestService:
+    """Servicio para enviar por email las notificaciones pendientes."""
+
+    @staticmethod
+    def pending(frequency: str):
+        """
+        Notificaciones sin enviar de los usuarios con esa frecuencia de digest.
+
+        Args:
+            frequency: 'immediate', 'daily', 'weekly' o 'never'
+
+        Returns:
+            QuerySet de dicts ordenado por destinatario
+        """
+        frequency_filter = Q(**{f'{PREFERENCE_PREFIX}digest_frequency': frequency})
+        # Los usuarios sin preferencias guardadas usan la frecuencia por defecto
+        if frequency == _default('digest_frequency'):
+            frequency_filter |= Q(**{f'{PREFERENCE_PREFIX}isnull': True})
+
+        fields = sorted(set(EMAIL_PREFERENCE_FIELDS.values()))
+        return Notification.objects.filter(frequency_filter, is_sent=False).order_by(
+            'recipient_id', 'id'
+        ).values(*ROW_FIELDS, *[f'{PREFERENCE_PREFIX}{field}' for field in fields])
+
+    @staticmethod
+    def wants_email(row: dict) -> bool:
+        """Indica si el destinatario quiere recibir por email ese tipo de notificación."""
+        field = EMAIL_PREFERENCE_FIELDS.get(row['notification_type'])
+        if field is None:
+            return True
+        value = row[f'{PREFERENCE_PREFIX}{field}']
+        return _default(field) if value is None else value
+
+    @staticmethod
+    def build_message(email: str, username: str, items: list, total: int, frequency: str, connection=None):
+        """
+        Arma el email de digest de un usuario.
+
+        Args:
+            email: Dirección del destinatario
+            username: Nombre de usuario
+            items: Notificaciones a mostrar (dicts)
+            total: Total de notificaciones incluidas en el digest
+            frequency: Frecuencia del digest
+
+        Returns:
+            EmailMultiAlternatives listo para enviar
+        """
+        context = {
+            'username': username,
+            'items': items,
+            'total': total,
+            'remaining': total - len(items),
+            'frequency': frequency,
+            'site_url': _setting('SITE_URL', '').rstrip('/'),
+        }
+        if total == 1:
+            subject = 'Tenés 1 notificación nueva en Red Social IFTS'
+        else:
+            subject = f'Tenés {total} notificaciones nuevas en Red Social IFTS'
+        message = EmailMultiAlternatives(
+            subject,
+            render_to_string('emails/notification_digest.txt', context),
+            to=[email],
+            connection=connection,
+        )
+        message.attach_alternative(render_to_string('emails/notification_digest.html', context), 'text/html')
+        return message
+
+    @staticmethod
+    def _mark_sent(ids: list) -> None:
+        now = timezone.now()
+        for start in range(0, len(ids), 1000):
+            Notification.objects.filter(pk__in=ids[start:start + 1000]).update(is_sent=True, sent_at=now)
+
+    @staticmethod
+    def send(frequency: str, batch_size: int = None, chunk_size: int = None) -> dict:
+        """
+        Envía los digests pendientes de una frecuencia.
+
+        Las notificaciones leídas, sin email del destinatario o de tipos
+        desactivados se marcan como enviadas sin incluirse en ningún email.
+        Si el servidor rechaza de forma permanente un destinatario, su digest
+        se descarta (queda en el log) y el resto del lote sigue; ante un error
+        transitorio se corta la corrida y lo no enviado queda para la próxima.
+
+        Args:
+            frequency: 'immediate', 'daily', 'weekly' o 'never' (solo marca)
+            batch_size: Emails por lote (y por UPDATE de marcado en PostgreSQL)
+            chunk_size: Filas leídas por viaje al cursor
+
+        Returns:
+            dict con 'users', 'emails', 'failed', 'notifications', 'skipped' y 'seconds'
+        """
+        batch_size = batch_size or _setting('NOTIFICATION_DIGEST_SEND_BATCH', 100)
+        chunk_size = chunk_size or _setting('NOTIFICATION_DIGEST_CHUNK_SIZE', 2000)
+        max_items = _setting('NOTIFICATION_DIGEST_MAX_ITEMS', 20)
+        # Solo el cursor con nombre de PostgreSQL admite UPDATEs mientras se lee;
+        # en SQLite y MySQL las filas se marcan al terminar de recorrerlo
+        mark_while_streaming = connection.vendor == 'postgresql'
+        started = time.monotonic()
+        stats = {'users': 0, 'emails': 0, 'failed': 0, 'notifications': 0, 'skipped': 0}
+        outgoing, handled = [], []
+
+        def deliver():
+            for message, ids, total in outgoing:
+                try:
+                    email_connection.send_messages([message])
+                except Exception as e:
+                    if not _is_permanent(e):
+                        raise
+                    logger.warning(f"Digest para {message.to} rechazado: {e}")
+                    stats['failed'] += 1
+                    stats['skipped'] += total
+                else:
+                    stats['emails'] += 1
+                    stats['notifications'] += total
+                handled.extend(ids)
+            outgoing.clear()
+            if mark_while_streaming:
+                DigestService._mark_sent(handled)
+                handled.clear()
+
+        # Una sola conexión (ej: SMTP) para todos los lotes
+        with get_connection() as email_connection:
+            rows = DigestService.pending(frequency).iterator(chunk_size=chunk_size)
+            try:
+                for _, group in groupby(rows, key=itemgetter('recipient_id')):
+                    items, ids, total, first = [], [], 0, None
+                    for row in group:
+                        first = first or row
+                        ids.append(row['id'])
+                        if frequency == 'never' or row['is_read'] or not DigestService.wants_email(row):
+                            stats['skipped'] += 1
+                            continue
+                        total += 1
+                        if len(items) < max_items:
+                            items.append(row)
+
+                    stats['users'] += 1
+                    if total and first['recipient__email']:
+                        message = DigestService.build_message(
+                            first['recipient__email'], first['recipient__username'], items, total, frequency,
+                            email_connection,
+                        )
+                        outgoing.append((message, ids, total))
+                    else:
+                        stats['skipped'] += total
+                        handled.extend(ids)
+
+                    if len(outgoing) >= batch_size:
+                        deliver()
+                deliver()
+            finally:
+                # Cierra el cursor antes de escribir; lo ya enviado se marca aunque la corrida se corte
+                rows.close()
+                DigestService._mark_sent(handled)
+
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        return stats
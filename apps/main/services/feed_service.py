@@ -0,0 +1,215 @@
+"""
+Servicio de feed personal (home timeline).
+Materializa el feed de cada usuario al crear un post (fan-out on write)
+y mantiene en caché un buffer circular con los posts más recientes.
+Los autores con audiencias muy grandes se resuelven al leer (fan-out on read).
+"""
+
+import heapq
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.feed.models import FeedEntry, PullAuthor
+from apps.friendship.models import Follow
+from apps.group.models import GroupMembership
+from apps.main.services.friend_graph import FriendGraph
+from apps.post.models import Post
+from apps.user.models import User
+
+
+PULL_AUTHORS_CACHE_KEY = 'feed:pull_authors'
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _buffer_key(user_id):
+    return f'feed:{user_id}'
+
+
+def _entry(created_at, post_id):
+    """Entrada del buffer: (timestamp, post_id), ordenable por fecha."""
+    return (created_at.timestamp(), post_id)
+
+
+class FeedService:
+    """Servicio para construir y leer el feed personal de cada usuario."""
+
+    @staticmethod
+    def resolve_audience(post: Post) -> tuple:
+        """
+        Calcula quién debe recibir un post según su privacidad.
+
+        Args:
+            post: Post recién creado
+
+        Returns:
+            tupla (direct, social): IDs que siempre reciben el post (autor y
+            miembros del grupo) e IDs de amigos/seguidores, que pueden
+            resolverse al leer si son demasiados.
+        """
+        direct = {post.author_id}
+        social = set()
+
+        if post.privacy_level == 'private':
+            return direct, social
+
+        if post.group_id:
+            direct.update(
+                GroupMembership.objects.filter(
+                    group_id=post.group_id,
+                    status='active'
+                ).values_list('user_id', flat=True)
+            )
+
+        if post.privacy_level == 'group':
+            return direct, social
+
+        social.update(FriendGraph.friend_ids(post.author_id))
+        if post.privacy_level == 'public':
+            social.update(
+                Follow.objects.filter(followed_id=post.author_id).values_list('follower_id', flat=True)
+            )
+        social -= direct
+        return direct, social
+
+    @staticmethod
+    def fan_out(post: Post) -> int:
+        """
+        Escribe el post en el feed de su audiencia.
+
+        Args:
+            post: Post a distribuir
+
+        Returns:
+            cantidad de feeds escritos
+        """
+        direct, social = FeedService.resolve_audience(post)
+
+        if len(social) > _setting('FEED_FANOUT_LIMIT', 1000):
+            # Autor masivo: sus seguidores leen sus posts al pedir el feed
+            PullAuthor.objects.update_or_create(
+                user_id=post.author_id,
+                defaults={'audience_size': len(social)}
+            )
+            cache.delete(PULL_AUTHORS_CACHE_KEY)
+            recipients = direct
+        else:
+            recipients = direct | social
+
+        entries = [
+            FeedEntry(user_id=user_id, post_id=post.id, created_at=post.created_at)
+            for user_id in recipients
+        ]
+        FeedEntry.objects.bulk_create(
+            entries,
+            batch_size=_setting('FEED_BATCH_SIZE', 500),
+            ignore_conflicts=True
+        )
+        FeedService._push_to_buffers(recipients, _entry(post.created_at, post.id))
+        return len(entries)
+
+    @staticmethod
+    def _push_to_buffers(user_ids, entry):
+        """Agrega la entrada a los buffers ya cargados en caché."""
+        keys = {_buffer_key(user_id): user_id for user_id in user_ids}
+        buffers = cache.get_many(list(keys))
+        if not buffers:
+            return
+
+        size = _setting('FEED_CACHE_SIZE', 500)
+        updated = {}
+        for key, buffer in buffers.items():
+            if any(post_id == entry[1] for _, post_id in buffer):
+                continue
+            # El buffer está ordenado de más nuevo a más viejo
+            position = next((i for i, (ts, _) in enumerate(buffer) if ts < entry[0]), len(buffer))
+            buffer.insert(position, entry)
+            updated[key] = buffer[:size]
+        cache.set_many(updated, _setting('FEED_CACHE_TIMEOUT', 60 * 60))
+
+    @staticmethod
+    def _get_buffer(user_id: int) -> list:
+        """Devuelve el buffer de entradas recientes, cargándolo si no existe."""
+        key = _buffer_key(user_id)
+        buffer = cache.get(key)
+        if buffer is None:
+            rows = FeedEntry.objects.filter(user_id=user_id).order_by(
+                '-created_at'
+            ).values_list('created_at', 'post_id')[:_setting('FEED_CACHE_SIZE', 500)]
+            buffer = [_entry(created_at, post_id) for created_at, post_id in rows]
+            cache.set(key, buffer, _setting('FEED_CACHE_TIMEOUT', 60 * 60))
+        return buffer
+
+    @staticmethod
+    def _pull_author_ids() -> set:
+        pull_ids = cache.get(PULL_AUTHORS_CACHE_KEY)
+        if pull_ids is None:
+            pull_ids = set(PullAuthor.objects.values_list('user_id', flat=True))
+            cache.set(PULL_AUTHORS_CACHE_KEY, pull_ids, _setting('FEED_CACHE_TIMEOUT', 60 * 60))
+        return pull_ids
+
+    @staticmethod
+    def _pulled_entries(user: User, window: int) -> list:
+        """Posts recientes de autores masivos que el usuario sigue o tiene de amigos."""
+        pull_ids = FeedService._pull_author_ids() - {user.id}
+        if not pull_ids:
+            return []
+
+        friends = FriendGraph.friend_ids(user) & pull_ids
+        followed = set(
+            Follow.objects.filter(follower=user, followed_id__in=pull_ids).values_list('followed_id', flat=True)
+        )
+        if not friends and not followed:
+            return []
+
+        rows = Post.objects.filter(
+            Q(author_id__in=friends, privacy_level__in=['public', 'friends']) |
+            Q(author_id__in=followed, privacy_level='public'),
+            is_hidden=False
+        ).order_by('-created_at').values_list('created_at', 'id')[:window]
+        return [_entry(created_at, post_id) for created_at, post_id in rows]
+
+    @staticmethod
+    def get_feed(user: User, limit: int = 50, offset: int = 0) -> list:
+        """
+        Obtiene una página del feed personal del usuario.
+
+        Args:
+            user: Usuario dueño del feed
+            limit: Cantidad de posts a devolver
+            offset: Posición de inicio
+
+        Returns:
+            list de Post ordenados del más nuevo al más viejo
+        """
+        window = offset + limit
+        if window <= _setting('FEED_CACHE_SIZE', 500):
+            pushed = FeedService._get_buffer(user.id)
+        else:
+            rows = FeedEntry.objects.filter(user_id=user.id).order_by(
+                '-created_at'
+            ).values_list('created_at', 'post_id')[:window]
+            pushed = [_entry(created_at, post_id) for created_at, post_id in rows]
+
+        merged = heapq.merge(pushed, FeedService._pulled_entries(user, window), key=lambda e: e[0], reverse=True)
+        post_ids, seen = [], set()
+        for _, post_id in merged:
+            if post_id not in seen:
+                seen.add(post_id)
+                post_ids.append(post_id)
+            if len(post_ids) >= window:
+                break
+        post_ids = post_ids[offset:window]
+
+        # La privacidad se vuelve a aplicar al leer: amistades, grupos o bloqueos pudieron cambiar
+        posts = Post.objects.select_related('author').filter(is_hidden=False).visible_to(user).in_bulk(post_ids)
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+    @staticmethod
+    def invalidate(user_id: int):
+        """Descarta el buffer en caché de un usuario."""
+        cache.delete(_buffer_key(user_id))
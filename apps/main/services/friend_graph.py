@@ -0,0 +1,59 @@
+"""
+Grafo de amistades en caché.
+Guarda los ids de amigos aceptados de cada usuario en la caché compartida
+para resolver chequeos de privacidad y audiencias de feed sin joins.
+"""
+
+from django.conf import settings
+from apps.main import cache as shared_cache
+
+
+class FriendGraph:
+    """Servicio de adyacencias de amistad aceptada."""
+
+    @staticmethod
+    def _id(user) -> int:
+        return getattr(user, 'pk', user)
+
+    @staticmethod
+    def _load(user_id: int) -> frozenset:
+        from apps.friendship.models import FriendEdge
+
+        # Recorrido por índice sobre (user_id, friend_id)
+        return frozenset(
+            FriendEdge.objects.filter(user_id=user_id).values_list('friend_id', flat=True)
+        )
+
+    @staticmethod
+    def friend_ids(user) -> frozenset:
+        """
+        Devuelve los ids de los amigos aceptados del usuario.
+
+        Args:
+            user: Usuario o id de usuario
+
+        Returns:
+            frozenset de ids
+        """
+        user_id = FriendGraph._id(user)
+        if user_id is None:
+            return frozenset()
+        key = shared_cache.make_key('friends', user_id, tags=[f'friends:{user_id}'])
+        return shared_cache.get_or_set(
+            key,
+            lambda: FriendGraph._load(user_id),
+            timeout=getattr(settings, 'FRIEND_GRAPH_TIMEOUT', 60 * 60),
+        )
+
+    @staticmethod
+    def are_friends(user1, user2) -> bool:
+        """Indica si dos usuarios son amigos (consulta O(1) sobre el conjunto en caché)."""
+        other_id = FriendGraph._id(user2)
+        if other_id is None:
+            return False
+        return other_id in FriendGraph.friend_ids(user1)
+
+    @staticmethod
+    def invalidate(*users) -> None:
+        """Descarta las adyacencias en caché de los usuarios indicados."""
+        shared_cache.invalidate(*(f'friends:{FriendGraph._id(user)}' for user in users))
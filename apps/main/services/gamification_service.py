@@ -3,9 +3,15 @@ Servicio de gamificación para la red social.
 Maneja la lógica de otorgar puntos por diferentes acciones.
 """
 
+from collections import Counter
+
 from django.db import transaction
+from apps.achievement import rules
+from apps.main import live
+from apps.main import outbox
+from apps.main.services.stats_service import StatsService
 from apps.user.models import User, UserPointsHistory
-from apps.achievement.models import UserAchievement, Achievement
+from apps.achievement.models import MetricCheckpoint, UserAchievement, Achievement
 
 
 # Configuración de puntos por acción
@@ -14,12 +20,26 @@ POINTS_CONFIG = {
     'comment': 5,
     'like_received': 1,
     'note_shared': 8,
-    'achievement_unlocked': 0,  # Los puntos vienen del achievement
+    'achievement': 0,  # Los puntos vienen del achievement
     'login_streak': 3,
     'help_others': 15,
     'admin_bonus': 0,
 }
 
+# Eventos del outbox que otorgan puntos y la fuente que registran
+EVENT_SOURCES = {
+    'gamification.post_created': 'post',
+    'gamification.comment_created': 'comment',
+    'gamification.like_received': 'like_received',
+}
+
+# Métrica de logros que cambia con cada fuente de puntos
+SOURCE_METRICS = {
+    'post': 'posts',
+    'comment': 'comments',
+    'like_received': 'likes_received',
+}
+
 
 class GamificationService:
     """Servicio para gestionar la gamificación de la red social."""
@@ -78,6 +98,43 @@ class GamificationService:
             'points_history_id': points_history.id,
         }
     
+    @staticmethod
+    def enqueue_event(user: User, topic: str, object_id, description: str = None) -> dict:
+        """
+        Encola un evento de gamificación para procesarlo fuera del request.
+        
+        Args:
+            user: Usuario que recibirá los puntos
+            topic: Evento (post_created, comment_created, like_received)
+            object_id: Id (o clave) del objeto que originó el evento, usado para no duplicarlo
+            description: Descripción para el historial de puntos
+            
+        Returns:
+            dict con los puntos proyectados; los logros se informan cuando el worker los procesa
+        """
+        topic = f'gamification.{topic}'
+        source = EVENT_SOURCES.get(topic)
+        if not user or source is None:
+            return {'success': False, 'error': f'Evento desconocido: {topic}'}
+        
+        points = POINTS_CONFIG[source]
+        outbox.enqueue(
+            topic,
+            user=user,
+            payload={'source': source, 'points': points, 'description': description or f'Puntos por {source}'},
+            dedupe_key=f'{topic}:{object_id}',
+        )
+        
+        return {
+            'success': True,
+            'queued': True,
+            'source': source,
+            'points': points,
+            'total_points': user.total_points + points,
+            'level': user.level,
+            'level_up': False,
+        }
+    
     @staticmethod
     def award_achievement(user: User, achievement: Achievement) -> dict:
         """
@@ -128,87 +185,40 @@ class GamificationService:
         }
     
     @staticmethod
-    def check_achievements(user: User) -> list:
+    def check_achievements(user: User, changed: dict = None) -> list:
         """
         Verifica y desbloquea logros para un usuario basado en sus estadísticas.
         
         Args:
             user: Usuario a verificar
+            changed: {métrica: (valor_anterior, valor_nuevo)}; si se indica, solo
+                se revisan los logros cuyo umbral se cruzó en ese intervalo.
+                Sin este argumento se evalúan todos los logros pendientes.
             
         Returns:
             list de logros desbloqueados
         """
         unlocked_achievements = []
         
-        available_achievements = Achievement.objects.filter(
-            is_active=True
-        ).exclude(
-            user_achievements__user=user
-        )
+        if changed is None:
+            achievements = rules.evaluate(user)
+        else:
+            achievements = rules.crossed(user, changed)
         
-        for achievement in available_achievements:
-            if GamificationService._check_achievement_condition(user, achievement):
-                result = GamificationService.award_achievement(user, achievement)
-                if result['success']:
-                    unlocked_achievements.append(result)
+        old_points, old_level = user.total_points, user.level
+        for achievement in achievements:
+            result = GamificationService.award_achievement(user, achievement)
+            if result['success']:
+                unlocked_achievements.append(result)
         
-        return unlocked_achievements
-    
-    @staticmethod
-    def _check_achievement_condition(user: User, achievement: Achievement) -> bool:
-        """
-        Verifica si un usuario cumple las condiciones para desbloquear un logro.
+        # Los puntos de los logros pueden cruzar umbrales de puntos o nivel
+        if changed is not None and user.total_points > old_points:
+            unlocked_achievements += GamificationService.check_achievements(user, changed={
+                'total_points': (old_points, user.total_points),
+                'level': (old_level, user.level),
+            })
         
-        Args:
-            user: Usuario a verificar
-            achievement: Logro a verificar
-            
-        Returns:
-            True si el usuario cumple las condiciones
-        """
-        # Esta es una lógica base que puede expandirse
-        # basada en el nombre o descripción del logro
-        
-        condition = achievement.condition_description.lower()
-        
-        if 'first post' in condition:
-            return user.posts.count() >= 1
-        
-        if 'first comment' in condition:
-            from apps.comment.models import Comment
-            return Comment.objects.filter(author=user).count() >= 1
-        
-        if 'total points' in condition:
-            # Extraer número de la condición
-            import re
-            match = re.search(r'(\d+)', condition)
-            if match:
-                required_points = int(match.group(1))
-                return user.total_points >= required_points
-        
-        if 'posts' in condition:
-            import re
-            match = re.search(r'(\d+)', condition)
-            if match:
-                required_posts = int(match.group(1))
-                return user.posts.count() >= required_posts
-        
-        if 'comments' in condition:
-            import re
-            from apps.comment.models import Comment
-            match = re.search(r'(\d+)', condition)
-            if match:
-                required_comments = int(match.group(1))
-                return Comment.objects.filter(author=user).count() >= required_comments
-        
-        if 'level' in condition:
-            import re
-            match = re.search(r'(\d+)', condition)
-            if match:
-                required_level = int(match.group(1))
-                return user.level >= required_level
-        
-        return False
+        return unlocked_achievements
     
     @staticmethod
     def get_user_stats(user: User) -> dict:
@@ -219,32 +229,56 @@ class GamificationService:
             user: Usuario a consultar
             
         Returns:
-            dict con estadísticas
+            dict con estadísticas (ver StatsService)
         """
-        from apps.comment.models import Comment
-        from apps.post.models import Post
-        
-        total_posts = Post.objects.filter(author=user).count()
-        total_comments = Comment.objects.filter(author=user).count()
-        total_achievements = user.user_achievements.count()
-        
-        # Puntos por fuente
-        points_by_source = {}
-        history = UserPointsHistory.objects.filter(user=user)
-        for source in ['post', 'comment', 'like_received', 'note_shared', 'achievement']:
-            points_by_source[source] = history.filter(source=source).aggregate(
-                total=__import__('django.db.models', fromlist=['Sum']).Sum('points')
-            )['total'] or 0
-        
-        return {
-            'user_id': user.id,
-            'username': user.username,
-            'level': user.level,
-            'total_points': user.total_points,
-            'experience_points': user.experience_points,
-            'total_posts': total_posts,
-            'total_comments': total_comments,
-            'total_achievements': total_achievements,
-            'points_by_source': points_by_source,
-            'points_to_next_level': ((user.level + 1) * 1000) - user.experience_points,
-        }
+        return StatsService.get_user_stats(user)
+
+
+@outbox.register('gamification')
+def process_gamification_events(events: list) -> None:
+    """
+    Aplica en una sola actualización del usuario todos los eventos pendientes
+    de ese usuario y luego verifica solo los logros de las métricas que cambiaron.
+    """
+    user = User.objects.select_for_update().get(pk=events[0].user_id)
+    old_points, old_level = user.total_points, user.level
+    
+    history = [
+        UserPointsHistory(
+            user=user,
+            points=event.payload['points'],
+            source=event.payload['source'],
+            description=event.payload.get('description', ''),
+        )
+        for event in events
+        if event.payload.get('points', 0) > 0
+    ]
+    if history:
+        UserPointsHistory.objects.bulk_create(history)
+        user.add_points(sum(entry.points for entry in history))
+    
+    deltas = Counter(
+        SOURCE_METRICS[event.payload['source']]
+        for event in events
+        if event.payload.get('source') in SOURCE_METRICS
+    )
+    current = rules.compute_metrics(user, deltas.keys())
+    # Ventana desde el último valor evaluado (no desde current - delta): un lote
+    # parcial o un reintento no saltea umbrales. Sin checkpoint se evalúa todo.
+    evaluated = dict(
+        MetricCheckpoint.objects.filter(user=user, metric__in=deltas).values_list('metric', 'value')
+    )
+    changed = {metric: (evaluated.get(metric, -1), current[metric]) for metric in deltas}
+    changed['total_points'] = (old_points, user.total_points)
+    changed['level'] = (old_level, user.level)
+    
+    GamificationService.check_achievements(user, changed=changed)
+    MetricCheckpoint.objects.bulk_create(
+        [MetricCheckpoint(user=user, metric=metric, value=current[metric]) for metric in deltas],
+        update_conflicts=True, unique_fields=['user', 'metric'], update_fields=['value'],
+    )
+    live.publish(user, 'points', {
+        'total_points': user.total_points,
+        'level': user.level,
+        'level_up': user.level > old_level,
+    })
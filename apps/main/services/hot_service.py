@@ -0,0 +1,108 @@
+"""
+Servicio de posts en tendencia (hot score).
+El score combina likes, reacciones, comentarios y vistas en escala
+logarítmica y le suma la antigüedad del post, al estilo de Reddit:
+un post nuevo necesita 10 veces menos interacción que uno de
+HOT_SCORE_DECAY segundos antes para quedar a la par. Como la parte
+temporal depende solo de la fecha de creación, el score de un post sin
+actividad no cambia y basta con recalcular los posts con actividad
+desde la última corrida.
+"""
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.post.models import Post
+
+
+LAST_RUN_KEY = 'hot:last_run'
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+# Peso de cada interacción en el score
+WEIGHTS = {
+    'like_count': 1.0,
+    'reaction_count': 1.0,
+    'comment_count': 2.0,
+    'views_count': 0.1,
+}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class HotScoreService:
+    """Servicio para calcular y consultar el ranking de posts en tendencia."""
+
+    @staticmethod
+    def score(created_at, **counts) -> float:
+        """
+        Calcula el hot score de un post.
+
+        Args:
+            created_at: Fecha de creación del post
+            counts: Valores de like_count, reaction_count, comment_count y views_count
+
+        Returns:
+            float, mayor es más relevante
+        """
+        points = sum(weight * (counts.get(field) or 0) for field, weight in WEIGHTS.items())
+        age = (created_at - EPOCH).total_seconds()
+        return round(math.log10(max(points, 1)) + age / _setting('HOT_SCORE_DECAY', 45000), 7)
+
+    @staticmethod
+    def update_scores(full: bool = False) -> int:
+        """
+        Recalcula el score de los posts con actividad desde la última corrida.
+
+        Args:
+            full: Recalcular todos los posts activos dentro de HOT_SCORE_WINDOW_DAYS
+
+        Returns:
+            cantidad de posts actualizados
+        """
+        started = timezone.now()
+        since = None if full else cache.get(LAST_RUN_KEY)
+        if since is None:
+            since = started - timedelta(days=_setting('HOT_SCORE_WINDOW_DAYS', 7))
+
+        rows = Post.objects.filter(last_activity_at__gte=since).values_list(
+            'id', 'created_at', *WEIGHTS
+        )
+        updated, batch = 0, []
+        batch_size = _setting('HOT_SCORE_BATCH_SIZE', 500)
+        for post_id, created_at, *values in rows.iterator(chunk_size=batch_size):
+            batch.append(Post(id=post_id, hot_score=HotScoreService.score(created_at, **dict(zip(WEIGHTS, values)))))
+            if len(batch) >= batch_size:
+                updated += Post.objects.bulk_update(batch, ['hot_score'])
+                batch = []
+        if batch:
+            updated += Post.objects.bulk_update(batch, ['hot_score'])
+
+        # Margen para la actividad registrada con el reloj de la base de datos
+        cache.set(LAST_RUN_KEY, started - timedelta(seconds=60), None)
+        return updated
+
+    @staticmethod
+    def get_hot(user, limit: int = 10) -> list:
+        """
+        Posts en tendencia visibles para el usuario.
+
+        Args:
+            user: Usuario que consulta
+            limit: Cantidad de posts
+
+        Returns:
+            list de Post ordenados por hot score
+        """
+        since = timezone.now() - timedelta(days=_setting('HOT_SCORE_WINDOW_DAYS', 7))
+        return list(
+            Post.objects.select_related('author').filter(
+                is_hidden=False,
+                created_at__gte=since
+            ).visible_to(user).order_by('-hot_score', '-id')[:limit]
+        )
@@ -0,0 +1,231 @@
+"""
+Servicio de rankings de la red social.
+Mantiene en caché el top de usuarios por puntos, calcula la posición de
+cualquier usuario con búsqueda binaria y arma rankings semanales, mensuales
+y por carrera.
+"""
+
+from bisect import bisect_right
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from apps.main import cache as shared_cache
+from apps.user.models import User, UserPointsHistory
+
+
+TOP_CACHE_KEY = 'leaderboard:top'
+LADDER_CACHE_KEY = 'leaderboard:ladder'
+
+PERIODS = {
+    'week': 7,
+    'month': 30,
+}
+
+ENTRY_FIELDS = ('id', 'username', 'total_points', 'level', 'is_verified')
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class LeaderboardService:
+    """Servicio para consultar rankings sin recorrer la tabla de usuarios."""
+
+    @staticmethod
+    def _entry(user) -> dict:
+        return {field: getattr(user, field) for field in ENTRY_FIELDS}
+
+    @staticmethod
+    def _rank(entries: list) -> list:
+        return [{'rank': idx, **entry} for idx, entry in enumerate(entries, 1)]
+
+    @staticmethod
+    def _build_top() -> list:
+        size = _setting('LEADERBOARD_SIZE', 100)
+        entries = list(
+            User.objects.filter(is_active=True)
+            .order_by('-total_points', 'id')
+            .values(*ENTRY_FIELDS)[:size]
+        )
+        cache.set(TOP_CACHE_KEY, entries, _setting('LEADERBOARD_CACHE_TIMEOUT', 300))
+        return entries
+
+    @staticmethod
+    def get_top(limit: int = 50) -> list:
+        """
+        Devuelve el top global por puntos desde la caché.
+
+        Args:
+            limit: Cantidad de usuarios (hasta LEADERBOARD_SIZE)
+
+        Returns:
+            list de dicts con rank, id, username, total_points, level, is_verified
+        """
+        entries = cache.get(TOP_CACHE_KEY)
+        if entries is None:
+            entries = LeaderboardService._build_top()
+        return LeaderboardService._rank(entries[:limit])
+
+    @staticmethod
+    def record_score(user: User) -> None:
+        """
+        Actualiza el top en caché con el nuevo puntaje del usuario cuando se
+        confirma la transacción. Se llama desde User.add_points; si no hay
+        snapshot no hace nada.
+
+        Args:
+            user: Usuario cuyo puntaje cambió
+        """
+        if not user.is_active:
+            return
+        entry = LeaderboardService._entry(user)
+
+        def apply():
+            snapshot = cache.get(TOP_CACHE_KEY)
+            if snapshot is None:
+                return
+
+            size = _setting('LEADERBOARD_SIZE', 100)
+            key = (-entry['total_points'], entry['id'])
+            entries = [item for item in snapshot if item['id'] != entry['id']]
+            was_listed = len(entries) < len(snapshot)
+
+            if len(snapshot) >= size and entries:
+                last = entries[-1]
+                if key >= (-last['total_points'], last['id']):
+                    if was_listed:
+                        # Quedó detrás del resto del snapshot: no se sabe quién ocupa su lugar
+                        cache.delete(TOP_CACHE_KEY)
+                    return
+
+            position = 0
+            while position < len(entries) and (-entries[position]['total_points'], entries[position]['id']) < key:
+                position += 1
+            entries.insert(position, entry)
+            cache.set(TOP_CACHE_KEY, entries[:size], _setting('LEADERBOARD_CACHE_TIMEOUT', 300))
+        transaction.on_commit(apply, robust=True)
+
+    @staticmethod
+    def _get_ladder() -> tuple:
+        """
+        Escalera de puntajes: puntajes distintos en orden ascendente y, para
+        cada uno, cuántos usuarios tienen un puntaje mayor o igual.
+        """
+        ladder = cache.get(LADDER_CACHE_KEY)
+        if ladder is None:
+            rows = (
+                User.objects.filter(is_active=True)
+                .values('total_points')
+                .annotate(n=Count('id'))
+                .order_by('total_points')
+            )
+            scores, at_least = [], []
+            remaining = 0
+            for row in reversed(list(rows)):
+                remaining += row['n']
+                scores.append(row['total_points'])
+                at_least.append(remaining)
+            scores.reverse()
+            at_least.reverse()
+            ladder = (scores, at_least, remaining)
+            cache.set(LADDER_CACHE_KEY, ladder, _setting('LEADERBOARD_RANK_TIMEOUT', 60))
+        return ladder
+
+    @staticmethod
+    def get_rank(user: User) -> dict:
+        """
+        Calcula la posición global del usuario en O(log n).
+        Los empates comparten posición; la escalera se refresca cada
+        LEADERBOARD_RANK_TIMEOUT segundos.
+
+        Args:
+            user: Usuario a consultar
+
+        Returns:
+            dict con rank, total_points y total_users
+        """
+        scores, at_least, total = LeaderboardService._get_ladder()
+        # Primer puntaje estrictamente mayor al del usuario
+        idx = bisect_right(scores, user.total_points)
+        ahead = at_least[idx] if idx < len(scores) else 0
+        return {
+            'user_id': user.id,
+            'rank': ahead + 1,
+            'total_points': user.total_points,
+            'total_users': max(total, ahead + 1),
+        }
+
+    @staticmethod
+    def get_period_board(period: str, limit: int = 50, career_id: int = None) -> list:
+        """
+        Ranking por puntos ganados en la última semana o el último mes.
+
+        Args:
+            period: 'week' o 'month'
+            limit: Cantidad de usuarios
+            career_id: Limitar a los usuarios de una carrera
+
+        Returns:
+            list de dicts con rank, datos del usuario y los puntos del período
+        """
+        key = shared_cache.make_key('leaderboard', period, career_id or 'all', limit)
+        return shared_cache.get_or_set(
+            key,
+            lambda: LeaderboardService._build_period_board(period, limit, career_id),
+            timeout=_setting('LEADERBOARD_PERIOD_TIMEOUT', 60),
+        )
+
+    @staticmethod
+    def _build_period_board(period: str, limit: int, career_id: int = None) -> list:
+        since = timezone.now() - timedelta(days=PERIODS[period])
+        history = UserPointsHistory.objects.filter(created_at__gte=since, user__is_active=True)
+        if career_id:
+            history = history.filter(user__career_id=career_id)
+        rows = list(
+            history.values('user_id')
+            .annotate(period_points=Sum('points'))
+            .order_by('-period_points', 'user_id')[:limit]
+        )
+
+        users = User.objects.only(*ENTRY_FIELDS).in_bulk([row['user_id'] for row in rows])
+        return LeaderboardService._rank([
+            {**LeaderboardService._entry(users[row['user_id']]), 'period_points': row['period_points']}
+            for row in rows
+            if row['user_id'] in users
+        ])
+
+    @staticmethod
+    def get_career_board(career_id: int, limit: int = 50) -> list:
+        """
+        Ranking histórico de los usuarios de una carrera.
+
+        Args:
+            career_id: Carrera a consultar
+            limit: Cantidad de usuarios
+
+        Returns:
+            list de dicts con rank y datos del usuario
+        """
+        key = shared_cache.make_key('leaderboard', 'career', career_id, limit)
+        return shared_cache.get_or_set(
+            key,
+            lambda: LeaderboardService._rank(list(
+                User.objects.filter(is_active=True, career_id=career_id)
+                .order_by('-total_points', 'id')
+                .values(*ENTRY_FIELDS)[:limit]
+            )),
+            timeout=_setting('LEADERBOARD_PERIOD_TIMEOUT', 60),
+        )
+
+    @staticmethod
+    def get_board(period: str = 'all', limit: int = 50, career_id: int = None) -> list:
+        """Punto de entrada común para las vistas: elige el ranking según los filtros."""
+        if period in PERIODS:
+            return LeaderboardService.get_period_board(period, limit, career_id)
+        if career_id:
+            return LeaderboardService.get_career_board(career_id, limit)
+        return LeaderboardService.get_top(limit)
@@ -0,0 +1,392 @@
+"""
+Servicio de envío de notificaciones.
+Los productores llaman a dispatch() dentro del request: solo se encola un
+evento en el outbox. El worker resuelve los destinatarios, descarta los
+que desactivaron ese tipo en sus preferencias (leídas en bloque desde la
+caché) o tienen un bloqueo con el emisor, agrupa en una sola fila las
+notificaciones repetidas sobre el mismo objeto ("X y 19 personas más
+dieron like a tu publicación") e inserta el resto con bulk_create por lotes.
+
+La cantidad de no leídas de cada usuario vive en la caché y se ajusta al
+crear, leer o borrar notificaciones; si la clave no está se recalcula con
+el índice (recipient, is_read, -last_actor_at). Las notificaciones nuevas y
+los cambios de no leídas se publican además en el canal en vivo (SSE).
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.main import content_types
+from apps.main import live
+from apps.main import outbox
+from apps.main.services.block_service import BlockService
+
+
+# Preferencia in-app que controla cada tipo (los tipos sin entrada se envían siempre)
+PREFERENCE_FIELDS = {
+    'like': 'app_likes',
+    'reaction': 'app_likes',
+    'comment': 'app_comments',
+    'reply': 'app_comments',
+    'friendship_request': 'app_friendships',
+    'friendship_accepted': 'app_friendships',
+    'follow': 'app_friendships',
+    'mention': 'app_mentions',
+    'achievement': 'app_achievements',
+    'group_invite': 'app_groups',
+    'group_join': 'app_groups',
+    'group_post': 'app_groups',
+}
+
+# Tipos que se agrupan por objeto mientras la notificación no se haya leído
+COALESCE_MESSAGES = {
+    'like': '{actor} y {others} personas más dieron like a {target}',
+    'reaction': '{actor} y {others} personas más reaccionaron a {target}',
+    'comment': '{actor} y {others} personas más comentaron {target}',
+}
+
+# Cómo se nombra en los mensajes el objeto de cada modelo
+TARGET_NAMES = {
+    'post': 'tu publicación',
+    'comment': 'tu comentario',
+    'note': 'tu apunte',
+}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def target_name(model_name: str) -> str:
+    """Nombre del objeto de una notificación para los mensajes (ej: 'tu comentario')."""
+    return TARGET_NAMES.get(model_name, 'tu publicación')
+
+
+def _preferences_key(user_id):
+    return f'notification:prefs:{user_id}'
+
+
+def _unread_key(user_id):
+    return f'notification:unread:{user_id}'
+
+
+def _id(user):
+    return getattr(user, 'pk', user)
+
+
+class NotificationService:
+    """Servicio para enviar notificaciones a uno o muchos usuarios."""
+
+    @staticmethod
+    def get_preferences(user_ids) -> dict:
+        """
+        Preferencias in-app de varios usuarios con una lectura a la caché
+        y, para los que falten, una sola consulta.
+
+        Args:
+            user_ids: IDs de usuario
+
+        Returns:
+            dict {user_id: {campo app_*: bool}}; los usuarios sin
+            preferencias guardadas reciben los valores por defecto
+        """
+        from apps.notification.models import NotificationPreference
+
+        user_ids = set(user_ids)
+        keys = {_preferences_key(user_id): user_id for user_id in user_ids}
+        found = {keys[key]: value for key, value in cache.get_many(list(keys)).items()}
+
+        missing = user_ids - found.keys()
+        if missing:
+            fields = sorted(set(PREFERENCE_FIELDS.values()))
+            defaults = {field: NotificationPreference._meta.get_field(field).default for field in fields}
+            loaded = {user_id: dict(defaults) for user_id in missing}
+            rows = NotificationPreference.objects.filter(user_id__in=missing).values('user_id', *fields)
+            for row in rows:
+                loaded[row.pop('user_id')] = row
+            cache.set_many(
+                {_preferences_key(user_id): value for user_id, value in loaded.items()},
+                timeout=_setting('NOTIFICATION_PREFERENCES_TIMEOUT', 60 * 60),
+            )
+            found.update(loaded)
+        return found
+
+    @staticmethod
+    def invalidate_preferences(*users) -> None:
+        """Descarta las preferencias en caché de los usuarios."""
+        cache.delete_many([_preferences_key(_id(user)) for user in users])
+
+    @staticmethod
+    def filter_recipients(recipient_ids, notification_type: str, sender=None) -> list:
+        """
+        Descarta al emisor, a los usuarios con un bloqueo con él y a los que
+        desactivaron el tipo de notificación.
+
+        Args:
+            recipient_ids: IDs candidatos
+            notification_type: Tipo de notificación
+            sender: Usuario o id que origina la notificación (opcional)
+
+        Returns:
+            list de IDs que deben recibir la notificación
+        """
+        sender_id = _id(sender)
+        # El bloqueo es simétrico: alcanza con el conjunto del emisor
+        excluded = set(BlockService.blocked_ids(sender_id)) | {sender_id}
+        recipient_ids = [user_id for user_id in dict.fromkeys(recipient_ids) if user_id not in excluded]
+
+        field = PREFERENCE_FIELDS.get(notification_type)
+        if field is None or not recipient_ids:
+            return recipient_ids
+        preferences = NotificationService.get_preferences(recipient_ids)
+        return [user_id for user_id in recipient_ids if preferences[user_id][field]]
+
+    @staticmethod
+    def unread_count(user) -> int:
+        """
+        Cantidad de notificaciones no leídas del usuario.
+
+        Args:
+            user: Usuario o id de usuario
+
+        Returns:
+            int, desde la caché salvo la primera vez o si expiró
+        """
+        from apps.notification.models import Notification
+
+        user_id = _id(user)
+        count = cache.get(_unread_key(user_id))
+        if count is None or count < 0:
+            count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+            cache.set(_unread_key(user_id), count, _setting('NOTIFICATION_UNREAD_TIMEOUT', 60 * 5))
+        return count
+
+    @staticmethod
+    def adjust_unread(deltas: dict) -> None:
+        """
+        Suma a los contadores en caché (solo a los que ya están cargados)
+        cuando se confirma la transacción. Sin incr atómico
+        (NOTIFICATION_UNREAD_INCR = False) los descarta y se recalculan.
+
+        Args:
+            deltas: dict {user_id: cantidad a sumar (negativa para restar)}
+        """
+        if not _setting('NOTIFICATION_UNREAD_INCR', True):
+            keys = [_unread_key(user_id) for user_id, delta in deltas.items() if delta]
+            if keys:
+                transaction.on_commit(lambda: cache.delete_many(keys), robust=True)
+            return
+
+        def apply():
+            for user_id, delta in deltas.items():
+                if not delta:
+                    continue
+                try:
+                    if cache.incr(_unread_key(user_id), delta) < 0:
+                        cache.delete(_unread_key(user_id))
+                except ValueError:
+                    # Sin contador en caché: se recalcula en la próxima lectura
+                    pass
+        transaction.on_commit(apply, robust=True)
+
+    @staticmethod
+    def invalidate_unread(*users) -> None:
+        """Descarta los contadores en caché (se recalculan en la próxima lectura)."""
+        keys = [_unread_key(_id(user)) for user in users]
+        transaction.on_commit(lambda: cache.delete_many(keys), robust=True)
+
+    @staticmethod
+    def publish(recipient_ids, notification_type: str, title: str, message: str,
+                action_url: str = '', actor_count: int = 1, new: bool = True) -> None:
+        """
+        Publica una notificación en el canal en vivo de los destinatarios.
+
+        Args:
+            recipient_ids: IDs de los destinatarios
+            new: False si se agrupó en una notificación que ya contaba como no leída
+        """
+        live.publish(recipient_ids, 'notification', {
+            'notification_type': notification_type,
+            'title': title,
+            'message': message,
+            'action_url': action_url,
+            'actor_count': actor_count,
+            'new': new,
+        })
+
+    @staticmethod
+    def mark_all_read(user) -> int:
+        """
+        Marca como leídas todas las notificaciones del usuario.
+
+        Returns:
+            cantidad de notificaciones marcadas
+        """
+        from apps.notification.models import Notification
+
+        user_id = _id(user)
+        updated = Notification.objects.filter(recipient_id=user_id, is_read=False).update(
+            is_read=True, read_at=timezone.now()
+        )
+        NotificationService.invalidate_unread(user_id)
+        live.publish(user_id, 'unread', {'count': 0})
+        return updated
+
+    @staticmethod
+    def dispatch(notification_type: str, title: str, message: str, recipients=(), group=None,
+                 sender=None, content_object=None, action_url: str = '', priority: str = 'normal',
+                 dedupe_key: str = None):
+        """
+        Encola una notificación para procesarla fuera del request.
+
+        Args:
+            notification_type: Tipo de notificación
+            title: Título
+            message: Mensaje para una sola notificación
+            recipients: Usuarios o IDs destinatarios
+            group: Grupo o id de grupo cuyos miembros activos la reciben
+            sender: Usuario que origina la notificación (opcional)
+            content_object: Objeto relacionado (opcional)
+            action_url: URL de destino (opcional)
+            priority: Prioridad
+            dedupe_key: Clave para no encolar dos veces el mismo evento
+
+        Returns:
+            OutboxEvent creado o None si no hay destinatarios o era un duplicado
+        """
+        recipient_ids = [_id(user) for user in recipients]
+        if not recipient_ids and group is None:
+            return None
+
+        payload = {
+            'notification_type': notification_type,
+            'title': title[:100],
+            'message': message,
+            'recipients': recipient_ids,
+            'group_id': _id(group),
+            'sender_id': _id(sender),
+            'sender_name': sender.username if sender is not None and hasattr(sender, 'username') else '',
+            'content_type_id': None,
+            'object_id': None,
+            'action_url': action_url or '',
+            'priority': priority,
+        }
+        if content_object is not None:
+            payload['content_type_id'] = content_types.get_for_model(content_object).id
+            payload['object_id'] = content_object.pk
+        return outbox.enqueue(f'notification.{notification_type}', payload=payload, dedupe_key=dedupe_key)
+
+    @staticmethod
+    def resolve_recipients(payload: dict) -> list:
+        """IDs de los destinatarios explícitos y de los miembros del grupo, sin repetir."""
+        recipient_ids = list(payload.get('recipients') or [])
+        if payload.get('group_id'):
+            from apps.group.models import GroupMembership
+
+            recipient_ids.extend(
+                GroupMembership.objects.filter(
+                    group_id=payload['group_id'], status='active'
+                ).values_list('user_id', flat=True)
+            )
+        return recipient_ids
+
+    @staticmethod
+    def deliver(payload: dict) -> int:
+        """
+        Escribe las notificaciones de un evento encolado por dispatch().
+
+        Args:
+            payload: Datos del evento
+
+        Returns:
+            cantidad de notificaciones creadas o actualizadas
+        """
+        from apps.notification.models import Notification
+
+        notification_type = payload['notification_type']
+        recipient_ids = NotificationService.filter_recipients(
+            NotificationService.resolve_recipients(payload), notification_type, payload.get('sender_id')
+        )
+        if not recipient_ids:
+            return 0
+
+        group_key = ''
+        coalesced = 0
+        template = COALESCE_MESSAGES.get(notification_type)
+        if template and payload.get('object_id'):
+            group_key = f"{notification_type}:{payload['content_type_id']}:{payload['object_id']}"
+            since = timezone.now() - timedelta(hours=_setting('NOTIFICATION_COALESCE_HOURS', 24))
+            existing = list(
+                Notification.objects.select_for_update().filter(
+                    recipient_id__in=recipient_ids,
+                    group_key=group_key,
+                    is_read=False,
+                    created_at__gte=since,
+                )
+            )
+            handled = {notification.recipient_id for notification in existing}
+            sender_id = payload.get('sender_id')
+            # Un mismo usuario cuenta una sola vez aunque vuelva a dar like
+            existing = [
+                notification for notification in existing
+                if sender_id is None or sender_id not in notification.actor_ids
+            ]
+            target = target_name(content_types.get_for_id(payload['content_type_id']).model)
+            now = timezone.now()
+            for notification in existing:
+                notification.actor_count += 1
+                if sender_id is not None:
+                    notification.actor_ids.append(sender_id)
+                notification.sender_id = sender_id
+                notification.message = template.format(
+                    actor=payload.get('sender_name') or 'Alguien', others=notification.actor_count - 1,
+                    target=target,
+                )
+                # created_at queda fijo: la ventana de agrupado y la retención usan la edad real
+                notification.last_actor_at = now
+            coalesced = Notification.objects.bulk_update(
+                existing, ['actor_count', 'actor_ids', 'sender', 'message', 'last_actor_at']
+            )
+            for notification in existing:
+                NotificationService.publish(
+                    [notification.recipient_id], notification_type, notification.title, notification.message,
+                    notification.action_url, notification.actor_count, new=False,
+                )
+            recipient_ids = [user_id for user_id in recipient_ids if user_id not in handled]
+
+        notifications = [
+            Notification(
+                recipient_id=user_id,
+                sender_id=payload.get('sender_id'),
+                notification_type=notification_type,
+                title=payload['title'],
+                message=payload['message'],
+                content_type_id=payload.get('content_type_id'),
+                object_id=payload.get('object_id'),
+                action_url=payload.get('action_url', ''),
+                priority=payload.get('priority', 'normal'),
+                group_key=group_key,
+                actor_ids=[payload['sender_id']] if group_key and payload.get('sender_id') else [],
+            )
+            for user_id in recipient_ids
+        ]
+        Notification.objects.bulk_create(
+            notifications, batch_size=_setting('NOTIFICATION_BATCH_SIZE', 500)
+        )
+        # bulk_create no dispara post_save: los contadores se ajustan acá
+        NotificationService.adjust_unread({user_id: 1 for user_id in recipient_ids})
+        NotificationService.publish(
+            recipient_ids, notification_type, payload['title'], payload['message'], payload.get('action_url', '')
+        )
+        return coalesced + len(notifications)
+
+
+@outbox.register('notification')
+def process_notification_events(events: list) -> None:
+    """Entrega cada evento de notificación encolado."""
+    for event in events:
+        NotificationService.deliver(event.payload)
@@ -0,0 +1,146 @@
+"""
+Servicio de retención de notificaciones.
+Aplica la política de NOTIFICATION_RETENTION por tipo: borra las vencidas
+(expires_at), borra las leídas más viejas que read_days, mueve a
+NotificationArchive las que superan archive_days y descarta los meses del
+archivo que quedan fuera de NOTIFICATION_ARCHIVE_MONTHS.
+Todo se procesa en lotes de ids con una transacción corta por lote, para no
+mantener bloqueos largos sobre la tabla mientras se usa.
+"""
+
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.notification.models import Notification, NotificationArchive
+
+
+# Política para los tipos sin entrada propia (None = nunca)
+DEFAULT_POLICY = {
+    'read_days': 30,
+    'archive_days': 90,
+}
+
+ARCHIVE_FIELDS = [
+    'recipient_id', 'sender_id', 'notification_type', 'title', 'message', 'content_type_id',
+    'object_id', 'action_url', 'is_read', 'actor_count', 'created_at', 'read_at',
+]
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _months_ago(today: date, months: int) -> date:
+    month_index = today.year * 12 + today.month - 1 - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class NotificationRetentionService:
+    """Servicio para limpiar y archivar notificaciones en lotes acotados."""
+
+    @staticmethod
+    def policies() -> dict:
+        """
+        Política efectiva de cada tipo de notificación.
+
+        Returns:
+            dict {tipo: {'read_days': int|None, 'archive_days': int|None}}
+        """
+        configured = _setting('NOTIFICATION_RETENTION', {})
+        default = {**DEFAULT_POLICY, **configured.get('default', {})}
+        return {
+            notification_type: {**default, **configured.get(notification_type, {})}
+            for notification_type, _ in Notification.NOTIFICATION_TYPES
+        }
+
+    @staticmethod
+    def _types_by(field: str) -> dict:
+        """Agrupa los tipos con el mismo plazo para resolverlos con una consulta."""
+        groups = defaultdict(list)
+        for notification_type, policy in NotificationRetentionService.policies().items():
+            if policy.get(field) is not None:
+                groups[policy[field]].append(notification_type)
+        return groups
+
+    @staticmethod
+    def _run_batches(queryset, action, stats: dict, key: str, batch_size: int, max_batches: int, pause: float):
+        while not max_batches or stats['batches'] < max_batches:
+            ids = list(queryset.order_by().values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return
+            with transaction.atomic():
+                stats[key] += action(ids)
+            stats['batches'] += 1
+            if pause:
+                time.sleep(pause)
+
+    @staticmethod
+    def _delete(ids) -> int:
+        # delete() dispara los signals de Notification, que descuentan las no leídas
+        Notification.objects.filter(pk__in=ids).delete()
+        return len(ids)
+
+    @staticmethod
+    def _archive(ids) -> int:
+        month = timezone.localdate().replace(day=1)
+        rows = Notification.objects.filter(pk__in=ids).values('id', *ARCHIVE_FIELDS)
+        NotificationArchive.objects.bulk_create(
+            [NotificationArchive(original_id=row.pop('id'), archived_month=month, **row) for row in rows],
+            ignore_conflicts=True,
+        )
+        return NotificationRetentionService._delete(ids)
+
+    @staticmethod
+    def _drop_archived(ids) -> int:
+        deleted, _ = NotificationArchive.objects.filter(pk__in=ids).delete()
+        return deleted
+
+    @staticmethod
+    def sweep(batch_size: int = None, max_batches: int = 0, pause: float = 0) -> dict:
+        """
+        Ejecuta una pasada completa de retención.
+
+        Args:
+            batch_size: Filas por lote (y por transacción)
+            max_batches: Cortar después de N lotes en total (0 = sin límite)
+            pause: Segundos de espera entre lotes para ceder la base de datos
+
+        Returns:
+            dict con las filas procesadas por etapa, 'batches' y 'seconds'
+        """
+        batch_size = batch_size or _setting('NOTIFICATION_SWEEP_BATCH_SIZE', 1000)
+        started = time.monotonic()
+        now = timezone.now()
+        stats = {'expired': 0, 'read_deleted': 0, 'archived': 0, 'archive_dropped': 0, 'batches': 0}
+        run = NotificationRetentionService._run_batches
+        options = {'batch_size': batch_size, 'max_batches': max_batches, 'pause': pause}
+
+        run(Notification.objects.filter(expires_at__lt=now),
+            NotificationRetentionService._delete, stats, 'expired', **options)
+
+        for days, types in NotificationRetentionService._types_by('read_days').items():
+            run(Notification.objects.filter(
+                    notification_type__in=types, is_read=True, created_at__lt=now - timedelta(days=days)
+                ),
+                NotificationRetentionService._delete, stats, 'read_deleted', **options)
+
+        for days, types in NotificationRetentionService._types_by('archive_days').items():
+            run(Notification.objects.filter(
+                    notification_type__in=types, created_at__lt=now - timedelta(days=days)
+                ),
+                NotificationRetentionService._archive, stats, 'archived', **options)
+
+        months = _setting('NOTIFICATION_ARCHIVE_MONTHS', 12)
+        if months:
+            run(NotificationArchive.objects.filter(
+                    archived_month__lt=_months_ago(timezone.localdate(), months)
+                ),
+                NotificationRetentionService._drop_archived, stats, 'archive_dropped', **options)
+
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        return stats
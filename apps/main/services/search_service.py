@@ -0,0 +1,326 @@
+"""
+Servicio de búsqueda de texto completo.
+Mantiene un índice (SearchDocument) de posts, apuntes, grupos y usuarios
+que se actualiza al guardar cada objeto.
+En PostgreSQL la búsqueda usa tsvector con índice GIN y ts_rank; en otros
+motores (SQLite en desarrollo) usa el índice invertido SearchTerm con un
+ranking TF-IDF simple.
+"""
+
+import math
+import re
+import unicodedata
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.core.cache import cache
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Q, Sum, When
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+from apps.search.models import SearchDocument, SearchTerm
+
+
+TOKEN_RE = re.compile(r'\w+')
+SEARCH_CONFIG = 'simple'
+TITLE_WEIGHT = 3
+BODY_WEIGHT = 1
+DOCUMENT_COUNT_KEY = 'search:document_count'
+
+# kind -> modelo, campos de título y cuerpo, y condición para estar indexado
+SOURCES = {
+    'post': {
+        'model': 'post.Post',
+        'title': ['tags'],
+        'body': ['content'],
+        'indexed': {'is_hidden': False},
+    },
+    'note': {
+        'model': 'note.Note',
+        'title': ['title', 'tags'],
+        'body': ['content'],
+        'indexed': {'is_active': True},
+    },
+    'group': {
+        'model': 'group.Group',
+        'title': ['name'],
+        'body': ['description'],
+        'indexed': {'is_active': True},
+    },
+    'user': {
+        'model': 'user.User',
+        'title': ['username', 'first_name', 'last_name'],
+        'body': ['bio'],
+        'indexed': {'is_active': True},
+    },
+}
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _use_postgres() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def _prefix_end(term: str) -> str:
+    """Menor cadena mayor que todas las que empiezan con term (límite del rango)."""
+    return term[:-1] + chr(ord(term[-1]) + 1)
+
+
+def _vector():
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG) +
+        SearchVector('body', weight='B', config=SEARCH_CONFIG)
+    )
+
+
+def tokenize(text: str) -> list:
+    """
+    Normaliza un texto en términos: minúsculas, sin acentos, sin
+    puntuación y sin términos de una sola letra.
+    """
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return [
+        token[:64] for token in TOKEN_RE.findall(text)
+        if len(token) > 1 or token.isdigit()
+    ]
+
+
+class SearchService:
+    """Servicio para indexar y buscar contenido."""
+
+    @staticmethod
+    def kind_for(instance) -> str | None:
+        """Devuelve el kind indexado del objeto, o None si su modelo no se indexa."""
+        label = instance._meta.label
+        for kind, source in SOURCES.items():
+            if source['model'] == label:
+                return kind
+        return None
+
+    @staticmethod
+    def indexed_fields(kind: str) -> set:
+        """Campos del modelo cuyo cambio obliga a reindexar."""
+        source = SOURCES[kind]
+        return set(source['title']) | set(source['body']) | set(source['indexed'])
+
+    @staticmethod
+    def _text(instance, fields) -> str:
+        return ' '.join(str(value) for value in (getattr(instance, field) for field in fields) if value)
+
+    @staticmethod
+    def _terms(title: str, body: str) -> dict:
+        weights = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0) + TITLE_WEIGHT
+        for token in tokenize(body):
+            weights[token] = weights.get(token, 0) + BODY_WEIGHT
+        return {term: min(weight, 1000) for term, weight in weights.items()}
+
+    @staticmethod
+    @transaction.atomic
+    def index(instance):
+        """
+        Crea o actualiza el documento de búsqueda de un objeto.
+
+        Args:
+            instance: Post, Note, Group o User
+
+        Returns:
+            SearchDocument o None si el objeto no debe figurar en el índice
+        """
+        kind = SearchService.kind_for(instance)
+        source = SOURCES[kind]
+        if any(getattr(instance, field) != value for field, value in source['indexed'].items()):
+            SearchService.remove(instance)
+            return None
+
+        title = SearchService._text(instance, source['title'])[:255]
+        body = SearchService._text(instance, source['body'])
+        document, created = SearchDocument.objects.get_or_create(
+            kind=kind,
+            object_id=instance.pk,
+            defaults={'title': title, 'body': body}
+        )
+        if not created:
+            if document.title == title and document.body == body:
+                return document
+            document.title = title
+            document.body = body
+            document.save(update_fields=['title', 'body', 'updated_at'])
+
+        if _use_postgres():
+            SearchDocument.objects.filter(pk=document.pk).update(vector=_vector())
+        else:
+            SearchTerm.objects.filter(document=document).delete()
+            SearchTerm.objects.bulk_create([
+                SearchTerm(term=term, document=document, weight=weight)
+                for term, weight in SearchService._terms(title, body).items()
+            ])
+        return document
+
+    @staticmethod
+    def remove(instance) -> None:
+        """Quita un objeto del índice."""
+        SearchDocument.objects.filter(
+            kind=SearchService.kind_for(instance),
+            object_id=instance.pk
+        ).delete()
+
+    @staticmethod
+    def _document_count() -> int:
+        """Total de documentos para el IDF; alcanza con un valor aproximado, se cachea."""
+        return cache.get_or_set(
+            DOCUMENT_COUNT_KEY,
+            SearchDocument.objects.count,
+            _setting('SEARCH_DOCUMENT_COUNT_TIMEOUT', 60 * 10),
+        )
+
+    @staticmethod
+    def _documents(kinds, query: str):
+        """
+        Documentos que contienen todos los términos de la consulta (cada uno
+        como palabra completa o prefijo: "ali" encuentra "alice"), con su score.
+        Devuelve None si la consulta no puede tener resultados.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return None
+        documents = SearchDocument.objects.filter(kind__in=kinds)
+
+        if _use_postgres():
+            # Los términos solo tienen caracteres \w: es seguro armar la consulta raw
+            search_query = SearchQuery(
+                ' & '.join(f'{term}:*' for term in terms), search_type='raw', config=SEARCH_CONFIG
+            )
+            return documents.filter(vector=search_query).annotate(
+                score=SearchRank(F('vector'), search_query)
+            )
+
+        total = SearchService._document_count()
+        matches = Q()
+        whens = []
+        for term in terms:
+            # startswith compila a LIKE, que SQLite resuelve recorriendo todo el
+            # índice: el rango [term, siguiente prefijo) sí busca en el índice.
+            # Las palabras que coinciden se leen una vez y se reusan abajo.
+            expanded = list(
+                SearchTerm.objects.filter(term__gte=term, term__lt=_prefix_end(term))
+                .order_by('term').values_list('term', flat=True).distinct()
+                [:_setting('SEARCH_PREFIX_EXPANSIONS', 500)]
+            )
+            if not expanded:
+                return None
+            with_prefix = SearchTerm.objects.filter(term__in=expanded)
+            frequency = with_prefix.values('document_id').distinct().count()
+            idf = math.log(1 + max(total, frequency) / frequency)
+            documents = documents.filter(pk__in=with_prefix.values('document_id'))
+            matches |= Q(terms__term__in=expanded)
+            # La palabra exacta pesa el doble que una que solo empieza igual
+            whens.append(When(terms__term=term, then=ExpressionWrapper(
+                F('terms__weight') * idf, output_field=FloatField()
+            )))
+            whens.append(When(terms__term__in=expanded, then=ExpressionWrapper(
+                F('terms__weight') * idf / 2, output_field=FloatField()
+            )))
+        return documents.filter(matches).annotate(
+            score=Sum(Case(*whens, output_field=FloatField()))
+        )
+
+    @staticmethod
+    def filter(queryset, kind: str, query: str):
+        """
+        Restringe un queryset a los objetos que coinciden con la búsqueda.
+
+        Args:
+            queryset: QuerySet del modelo del kind
+            kind: 'post', 'note', 'group' o 'user'
+            query: Texto buscado
+
+        Returns:
+            QuerySet filtrado con una subconsulta sobre el índice
+        """
+        documents = SearchService._documents([kind], query)
+        if documents is None:
+            return queryset.none()
+        return queryset.filter(pk__in=documents.values('object_id'))
+
+    @staticmethod
+    def _visible(kind: str, user):
+        """Objetos de cada kind que el usuario puede ver."""
+        model = apps.get_model(SOURCES[kind]['model'])
+        authenticated = user is not None and user.is_authenticated
+
+        if kind == 'post':
+            return model.objects.filter(is_hidden=False).visible_to(user)
+        if kind == 'note':
+            qs = model.objects.filter(is_active=True)
+            if not authenticated:
+                return qs.filter(privacy_level='public')
+            from apps.main.services.block_service import BlockService
+            from apps.main.services.friend_graph import FriendGraph
+            return BlockService.exclude_blocked(qs.filter(
+                Q(privacy_level='public') |
+                Q(author_id=user.pk) |
+                Q(privacy_level='friends', author_id__in=FriendGraph.friend_ids(user))
+            ), user)
+        if kind == 'group':
+            qs = model.objects.filter(is_active=True)
+            if not authenticated:
+                return qs.exclude(privacy_level='secret')
+            from apps.group.models import GroupMembership
+            return qs.filter(
+                ~Q(privacy_level='secret') |
+                Q(creator_id=user.pk) |
+                Q(id__in=GroupMembership.objects.filter(user_id=user.pk, status='active').values('group_id'))
+            )
+        from apps.main.services.block_service import BlockService
+        return BlockService.exclude_blocked(model.objects.filter(is_active=True), user, field='pk')
+
+    @staticmethod
+    def search(query: str, user=None, kinds=None, limit: int = 20) -> list:
+        """
+        Búsqueda unificada ordenada por relevancia.
+
+        Args:
+            query: Texto buscado
+            user: Usuario que busca (para aplicar privacidad y bloqueos)
+            kinds: Tipos a buscar (por defecto todos)
+            limit: Cantidad máxima de resultados
+
+        Returns:
+            list de dicts con type, id, title, snippet y score
+        """
+        kinds = [kind for kind in (kinds or SOURCES) if kind in SOURCES]
+        documents = SearchService._documents(kinds, query)
+        if documents is None:
+            return []
+        candidates = list(
+            documents.order_by('-score', '-id').values_list(
+                'kind', 'object_id', 'title', 'body', 'score'
+            )[:limit * _setting('SEARCH_CANDIDATE_FACTOR', 3)]
+        )
+
+        # La privacidad se aplica sobre los candidatos: una consulta por tipo
+        visible = {}
+        for kind in {row[0] for row in candidates}:
+            ids = [row[1] for row in candidates if row[0] == kind]
+            visible[kind] = set(SearchService._visible(kind, user).filter(pk__in=ids).values_list('pk', flat=True))
+
+        results = []
+        for kind, object_id, title, body, score in candidates:
+            if object_id not in visible[kind]:
+                continue
+            results.append({
+                'type': kind,
+                'id': object_id,
+                'title': title or body[:80],
+                'snippet': body[:200],
+                'score': round(float(score), 4),
+            })
+            if len(results) >= limit:
+                break
+        return results
@@ -0,0 +1,77 @@
+"""
+Servicio de estadísticas de gamificación por usuario.
+Resuelve todos los conteos y sumas en una sola consulta y guarda el
+resultado en caché bajo el tag user:<id>, que se invalida cuando el usuario
+gana puntos o cambia su actividad (ver apps/main/signals.py).
+"""
+
+from django.conf import settings
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from apps.main import cache as shared_cache
+from apps.user.models import User, UserPointsHistory
+
+
+STATS_SOURCES = ['post', 'comment', 'like_received', 'note_shared', 'achievement']
+
+
+class StatsService:
+    """Servicio para obtener las estadísticas de un usuario en una consulta."""
+
+    @staticmethod
+    def _aggregate(queryset, field: str, aggregate):
+        """Agregado correlacionado con el usuario de la consulta externa (0 si no hay filas)."""
+        rows = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field)
+        return Coalesce(Subquery(rows.annotate(value=aggregate).values('value'), output_field=IntegerField()), 0)
+
+    @staticmethod
+    def get_user_stats(user: User) -> dict:
+        """
+        Obtiene estadísticas de gamificación del usuario.
+
+        Args:
+            user: Usuario a consultar
+
+        Returns:
+            dict con estadísticas
+        """
+        key = shared_cache.make_key('stats', user.id, tags=[f'user:{user.id}'])
+        return shared_cache.get_or_set(
+            key,
+            lambda: StatsService._build(user),
+            timeout=getattr(settings, 'GAMIFICATION_STATS_TIMEOUT', 300),
+        )
+
+    @staticmethod
+    def _build(user: User) -> dict:
+        from apps.achievement.models import UserAchievement
+        from apps.comment.models import Comment
+        from apps.post.models import Post
+
+        aggregate = StatsService._aggregate
+        annotations = {
+            'stat_posts': aggregate(Post.objects.all(), 'author', Count('pk')),
+            'stat_comments': aggregate(Comment.objects.all(), 'author', Count('pk')),
+            'stat_achievements': aggregate(UserAchievement.objects.all(), 'user', Count('pk')),
+        }
+        for source in STATS_SOURCES:
+            annotations[f'points_{source}'] = aggregate(
+                UserPointsHistory.objects.filter(source=source), 'user', Sum('points')
+            )
+
+        row = User.objects.filter(pk=user.pk).values(
+            'level', 'total_points', 'experience_points', **annotations
+        ).get()
+
+        return {
+            'user_id': user.id,
+            'username': user.username,
+            'level': row['level'],
+            'total_points': row['total_points'],
+            'experience_points': row['experience_points'],
+            'total_posts': row['stat_posts'],
+            'total_comments': row['stat_comments'],
+            'total_achievements': row['stat_achievements'],
+            'points_by_source': {source: row[f'points_{source}'] for source in STATS_SOURCES},
+            'points_to_next_level': ((row['level'] + 1) * 1000) - row['experience_points'],
+        }
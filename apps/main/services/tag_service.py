@@ -0,0 +1,148 @@
+"""
+Servicio de tags normalizados.
+Sincroniza el campo de texto `tags` de posts y apuntes con las tablas
+índice PostTag/NoteTag y calcula los tags en tendencia sobre una ventana
+deslizante, cacheados en la caché compartida.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.text import slugify
+
+from apps.main import cache as shared_cache
+from apps.tag.models import NoteTag, PostTag, Tag
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def parse_tags(text: str) -> dict:
+    """
+    Separa un texto de tags separados por coma.
+
+    Returns:
+        dict {slug: nombre} sin repetidos ni tags vacíos, en orden de aparición
+    """
+    tags = {}
+    for raw in (text or '').split(','):
+        name = ' '.join(raw.split()).lower()[:50]
+        slug = slugify(name)[:50]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+class TagService:
+    """Servicio para indexar y consultar tags."""
+
+    LINKS = {
+        'post': (PostTag, 'post'),
+        'note': (NoteTag, 'note'),
+    }
+
+    @staticmethod
+    def get_or_create_tags(tags: dict) -> dict:
+        """
+        Obtiene los Tag de los slugs dados, creando los que falten.
+
+        Args:
+            tags: dict {slug: nombre} (ver parse_tags)
+
+        Returns:
+            dict {slug: tag_id}
+        """
+        if not tags:
+            return {}
+        Tag.objects.bulk_create(
+            [Tag(slug=slug, name=name) for slug, name in tags.items()],
+            ignore_conflicts=True
+        )
+        return dict(Tag.objects.filter(slug__in=tags).values_list('slug', 'id'))
+
+    @staticmethod
+    @transaction.atomic
+    def sync(instance, kind: str) -> None:
+        """
+        Actualiza las filas índice de un post o apunte según su campo tags.
+
+        Args:
+            instance: Post o Note
+            kind: 'post' o 'note'
+        """
+        model, field = TagService.LINKS[kind]
+        wanted = set(TagService.get_or_create_tags(parse_tags(instance.tags)).values())
+        current = set(model.objects.filter(**{field: instance}).values_list('tag_id', flat=True))
+
+        if current - wanted:
+            model.objects.filter(**{field: instance, 'tag_id__in': current - wanted}).delete()
+        model.objects.bulk_create(
+            [
+                model(**{field: instance, 'tag_id': tag_id, 'created_at': instance.created_at})
+                for tag_id in wanted - current
+            ],
+            ignore_conflicts=True
+        )
+
+    @staticmethod
+    def filter(queryset, slug: str):
+        """
+        Restringe un queryset de posts o apuntes a los que tienen el tag.
+
+        Args:
+            queryset: QuerySet de Post o Note
+            slug: Tag buscado (se normaliza igual que al guardar)
+
+        Returns:
+            QuerySet filtrado por el índice (sin LIKE)
+        """
+        return queryset.filter(tag_links__tag__slug=slugify(slug)[:50])
+
+    @staticmethod
+    def _compute_trending(hours: int, limit: int) -> list:
+        since = timezone.now() - timedelta(hours=hours)
+        counts = Counter()
+        for tag_id, n in PostTag.objects.filter(
+            created_at__gte=since,
+            post__privacy_level='public',
+            post__is_hidden=False
+        ).values_list('tag_id').annotate(n=Count('id')):
+            counts[tag_id] += n
+        for tag_id, n in NoteTag.objects.filter(
+            created_at__gte=since,
+            note__privacy_level='public',
+            note__is_active=True
+        ).values_list('tag_id').annotate(n=Count('id')):
+            counts[tag_id] += n
+
+        top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        tags = Tag.objects.in_bulk([tag_id for tag_id, _ in top])
+        return [
+            {'name': tags[tag_id].name, 'slug': tags[tag_id].slug, 'count': n}
+            for tag_id, n in top
+        ]
+
+    @staticmethod
+    def get_trending(hours: int | None = None, limit: int = 10) -> list:
+        """
+        Tags más usados en posts y apuntes públicos de las últimas horas.
+
+        Args:
+            hours: Tamaño de la ventana (por defecto TRENDING_TAGS_WINDOW_HOURS)
+            limit: Cantidad de tags a devolver
+
+        Returns:
+            list de dicts con name, slug y count
+        """
+        hours = hours or _setting('TRENDING_TAGS_WINDOW_HOURS', 24)
+        key = shared_cache.make_key('tags_trending', hours, limit)
+        return shared_cache.get_or_set(
+            key,
+            lambda: TagService._compute_trending(hours, limit),
+            timeout=_setting('TRENDING_TAGS_TIMEOUT', 60 * 5),
+        )
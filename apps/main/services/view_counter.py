@@ -0,0 +1,198 @@
+"""
+Contador de vistas con buffer en caché.
+Acumula las visitas de posts y apuntes en la caché y las vuelca a la base
+de datos en lote con updates F('views_count') + n, en lugar de guardar la
+fila en cada visita.
+
+Cada objeto con vistas pendientes tiene una marca propia (cache.add, atómico)
+y la primera vista que la crea lo anota en un índice de solo agregado: un
+contador de posiciones (incr) y una clave por posición. El volcado recorre
+las posiciones nuevas, borra la marca antes de leer el contador y descuenta
+solo lo que volcó, así que ninguna vista ni marca se pierde entre medio.
+
+Requiere una caché con incr atómico y compartida entre procesos (Redis);
+con VIEW_COUNT_BUFFERED = False cada vista es un UPDATE directo.
+"""
+
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.functions import Now
+
+
+FLUSH_LOCK_KEY = 'views:flush_lock'
+FLUSH_RUNNING_KEY = 'views:flushing'
+INDEX_SEQ_KEY = 'views:dirty:seq'
+INDEX_DONE_KEY = 'views:dirty:done'
+INDEX_HOLE_KEY = 'views:dirty:hole'
+# La marca vence sola por si su entrada del índice se perdió; una entrada repetida no cuenta doble
+DIRTY_TIMEOUT = 60 * 60 * 24
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _updates(model) -> dict:
+    if any(field.name == 'last_activity_at' for field in model._meta.concrete_fields):
+        return {'last_activity_at': Now()}
+    return {}
+
+
+class ViewCounter:
+    """Servicio para contar vistas sin escribir la fila en cada visita."""
+
+    @staticmethod
+    def _key(label: str, pk) -> str:
+        return f'views:{label}:{pk}'
+
+    @staticmethod
+    def _dirty_key(label: str, pk) -> str:
+        return f'views:dirty:{label}:{pk}'
+
+    @staticmethod
+    def _slot_key(position: int) -> str:
+        return f'views:dirty:slot:{position}'
+
+    @staticmethod
+    def _mark_dirty(label: str, pk) -> None:
+        # Solo quien crea la marca anota el objeto en el índice
+        if not cache.add(ViewCounter._dirty_key(label, pk), 1, DIRTY_TIMEOUT):
+            return
+        cache.add(INDEX_SEQ_KEY, 0, None)
+        position = cache.incr(INDEX_SEQ_KEY)
+        cache.set(ViewCounter._slot_key(position), (label, pk), None)
+
+    @staticmethod
+    def hit(obj, viewer=None) -> bool:
+        """
+        Registra una vista del objeto.
+
+        Args:
+            obj: Instancia con campo views_count (Post, Note)
+            viewer: Identificador de quien mira (id de usuario, sesión); si
+                VIEW_COUNT_DEDUP_WINDOW > 0, sus vistas repetidas dentro de
+                esa ventana no se cuentan
+
+        Returns:
+            True si la vista se contó
+        """
+        label = obj._meta.label_lower
+        window = _setting('VIEW_COUNT_DEDUP_WINDOW', 0)
+        if viewer is not None and window:
+            if not cache.add(f'views:seen:{label}:{obj.pk}:{viewer}', 1, window):
+                return False
+
+        # Reflejar la vista en memoria para la respuesta actual
+        obj.views_count += 1
+
+        if not _setting('VIEW_COUNT_BUFFERED', True):
+            model = type(obj)
+            model._base_manager.filter(pk=obj.pk).update(views_count=F('views_count') + 1, **_updates(model))
+            return True
+
+        key = ViewCounter._key(label, obj.pk)
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                # La clave expiró entre add e incr
+                cache.set(key, 1, None)
+        # Después de contar: si un volcado borró la marca mientras tanto, se vuelve a crear
+        ViewCounter._mark_dirty(label, obj.pk)
+
+        if cache.add(FLUSH_LOCK_KEY, 1, _setting('VIEW_COUNT_FLUSH_INTERVAL', 60)):
+            ViewCounter.flush()
+        return True
+
+    @staticmethod
+    def pending(obj) -> int:
+        """Vistas acumuladas del objeto que todavía no se volcaron."""
+        return cache.get(ViewCounter._key(obj._meta.label_lower, obj.pk)) or 0
+
+    @staticmethod
+    def _read_index(done: int, limit: int) -> tuple:
+        """
+        Lee hasta limit entradas del índice a partir de la posición done.
+
+        Una posición sin entrada es una vista que hizo incr pero todavía no
+        escribió su clave: se espera hasta el volcado siguiente y, si sigue
+        vacía (el proceso murió entre las dos llamadas), se saltea.
+
+        Returns:
+            (entradas, posición hasta la que se leyó, True si quedan posiciones)
+        """
+        end = min(cache.get(INDEX_SEQ_KEY) or 0, done + limit)
+        keys = [ViewCounter._slot_key(offset) for offset in range(done + 1, end + 1)]
+        found = cache.get_many(keys) if keys else {}
+        entries = []
+        position = done
+        for offset, key in enumerate(keys, start=done + 1):
+            if key not in found:
+                if cache.get(INDEX_HOLE_KEY) != offset:
+                    cache.set(INDEX_HOLE_KEY, offset, None)
+                    return entries, position, False
+            else:
+                entries.append(found[key])
+            position = offset
+        return entries, position, position < (cache.get(INDEX_SEQ_KEY) or 0)
+
+    @staticmethod
+    def _apply(entries) -> int:
+        by_model = defaultdict(set)
+        for label, pk in entries:
+            by_model[label].add(pk)
+
+        flushed = 0
+        for label, pks in by_model.items():
+            model = apps.get_model(label)
+            # Agrupar por cantidad para resolver todos los objetos con el mismo n en un update
+            by_count = defaultdict(list)
+            for pk in pks:
+                # La marca se borra antes de leer: una vista posterior la vuelve a crear
+                cache.delete(ViewCounter._dirty_key(label, pk))
+                key = ViewCounter._key(label, pk)
+                count = cache.get(key) or 0
+                if not count:
+                    continue
+                # decr en lugar de delete: no se pierden las vistas que llegan mientras tanto
+                try:
+                    cache.decr(key, count)
+                except ValueError:
+                    continue
+                by_count[count].append(pk)
+
+            for count, ids in by_count.items():
+                model._base_manager.filter(pk__in=ids).update(
+                    views_count=F('views_count') + count, **_updates(model)
+                )
+                flushed += count * len(ids)
+        return flushed
+
+    @staticmethod
+    def flush() -> int:
+        """
+        Vuelca a la base de datos las vistas acumuladas.
+
+        Returns:
+            cantidad total de vistas volcadas
+        """
+        # Un solo volcado a la vez: dos lectores del mismo contador descontarían dos veces
+        if not cache.add(FLUSH_RUNNING_KEY, 1, 300):
+            return 0
+        try:
+            flushed = 0
+            more = True
+            while more:
+                done = cache.get(INDEX_DONE_KEY) or 0
+                entries, position, more = ViewCounter._read_index(done, _setting('VIEW_COUNT_FLUSH_BATCH', 1000))
+                flushed += ViewCounter._apply(entries)
+                if position > done:
+                    cache.set(INDEX_DONE_KEY, position, None)
+                    cache.delete_many([ViewCounter._slot_key(offset) for offset in range(done + 1, position + 1)])
+            return flushed
+        finally:
+            cache.delete(FLUSH_RUNNING_KEY)
@@ -0,0 +1,51 @@
+"""
+Signals that invalidate shared cache tags on the post, comment, like and user write paths.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.achievement.models import UserAchievement
+from apps.comment.models import Comment
+from apps.like.models import Like
+from apps.post.models import Post
+from apps.user.models import User
+from apps.main import cache as shared_cache
+from apps.main import content_types
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_tags(sender, instance, **kwargs):
+    """Drops cached data about the post and its author."""
+    shared_cache.invalidate(f'post:{instance.pk}', f'user:{instance.author_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_tags(sender, instance, **kwargs):
+    """Drops cached data about the commented post and the comment author."""
+    shared_cache.invalidate(f'post:{instance.post_id}', f'user:{instance.author_id}')
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+def invalidate_like_tags(sender, instance, **kwargs):
+    """Drops cached data about the liked object and the user who liked it."""
+    model = content_types.get_for_id(instance.content_type_id).model
+    shared_cache.invalidate(f'{model}:{instance.object_id}', f'user:{instance.user_id}')
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_tags(sender, instance, **kwargs):
+    """Drops cached data about a user whose row changed."""
+    # Logging in only touches last_login, which no cached data shows
+    if kwargs.get('update_fields') == frozenset({'last_login'}):
+        return
+    shared_cache.invalidate(f'user:{instance.pk}')
+
+
+@receiver(post_save, sender=UserAchievement)
+@receiver(post_delete, sender=UserAchievement)
+def invalidate_achievement_tags(sender, instance, **kwargs):
+    """Drops the user's cached data when an achievement is granted or revoked."""
+    shared_cache.invalidate(f'user:{instance.user_id}')
@@ -1,2 +1,245 @@
-from django.test import TestCase
+import asyncio
+from datetime import timedelta
+from io import StringIO
 
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.like.models import Like
+from apps.main import cache as shared_cache
+from apps.main import live
+from apps.main import outbox
+from apps.main.models import LiveEvent, OutboxEvent
+from apps.main.services.gamification_service import GamificationService
+from apps.notification.models import Notification
+from apps.post.models import Post
+from apps.user.models import UserPointsHistory
+
+User = get_user_model()
+
+
+class GamificationOutboxTestCase(TestCase):
+    def setUp(self):
+        """Set up a user that will receive queued points"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='outbox_user', email='outbox@example.com', password='testpass123', student_id='O-1'
+        )
+
+    def test_enqueue_defers_points(self):
+        """Test enqueueing an event does not touch the user row"""
+        result = GamificationService.enqueue_event(self.user, 'post_created', object_id=1)
+        self.assertTrue(result['queued'])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_points, 0)
+        self.assertEqual(OutboxEvent.objects.filter(status='pending').count(), 1)
+
+    def test_duplicate_events_are_ignored(self):
+        """Test the same source object is only enqueued once"""
+        GamificationService.enqueue_event(self.user, 'like_received', object_id=7)
+        GamificationService.enqueue_event(self.user, 'like_received', object_id=7)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_enqueue_returns_none_for_duplicates(self):
+        """Test enqueue only returns the event when it was actually created"""
+        event = outbox.enqueue('gamification.test', self.user, dedupe_key='dup-1')
+        self.assertIsNotNone(event.pk)
+        self.assertIsNone(outbox.enqueue('gamification.test', self.user, dedupe_key='dup-1'))
+
+    def test_worker_coalesces_events_per_user(self):
+        """Test the worker applies all of a user's events in one pass"""
+        GamificationService.enqueue_event(self.user, 'post_created', object_id=1)
+        GamificationService.enqueue_event(self.user, 'comment_created', object_id=1)
+        GamificationService.enqueue_event(self.user, 'like_received', object_id=1)
+
+        call_command('process_outbox', stdout=StringIO())
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_points, 16)
+        self.assertEqual(UserPointsHistory.objects.filter(user=self.user).count(), 3)
+        self.assertFalse(OutboxEvent.objects.exclude(status='done').exists())
+
+        # Una segunda corrida no vuelve a otorgar puntos
+        call_command('process_outbox', stdout=StringIO())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.total_points, 16)
+
+
+class UserStatsTestCase(TestCase):
+    def setUp(self):
+        """Set up a user with a post and some points"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='stats_user', email='stats@example.com', password='testpass123', student_id='S-1'
+        )
+        Post.objects.create(author=self.user, content='Stats post')
+        GamificationService.award_points(self.user, 'post')
+
+    def test_stats_in_one_query_then_cached(self):
+        """Test stats are computed with one query and then served from cache"""
+        with self.assertNumQueries(1):
+            stats = GamificationService.get_user_stats(self.user)
+        self.assertEqual(stats['total_posts'], 1)
+        self.assertEqual(stats['points_by_source']['post'], 10)
+        self.assertEqual(stats['total_points'], 10)
+
+        with self.assertNumQueries(0):
+            GamificationService.get_user_stats(self.user)
+
+    def test_awarding_points_invalidates_stats(self):
+        """Test new points are reflected on the next read"""
+        GamificationService.get_user_stats(self.user)
+        GamificationService.award_points(self.user, 'comment')
+        stats = GamificationService.get_user_stats(self.user)
+        self.assertEqual(stats['total_points'], 15)
+        self.assertEqual(stats['points_by_source']['comment'], 5)
+
+
+class SharedCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_invalidating_a_tag_changes_the_key(self):
+        """Test keys built with a tag go stale when the tag is invalidated"""
+        key = shared_cache.make_key('thing', 1, tags=['post:1'])
+        self.assertEqual(shared_cache.make_key('thing', 1, tags=['post:1']), key)
+        shared_cache.invalidate('post:1')
+        self.assertNotEqual(shared_cache.make_key('thing', 1, tags=['post:1']), key)
+
+    def test_get_or_set_computes_once(self):
+        """Test the value is computed on the first miss only"""
+        calls = []
+        for _ in range(3):
+            value = shared_cache.get_or_set('answer', lambda: calls.append(1) or 42)
+        self.assertEqual(value, 42)
+        self.assertEqual(len(calls), 1)
+
+    def test_get_or_set_waits_for_lock_holder(self):
+        """Test a caller that loses the lock falls back after lock_timeout"""
+        cache.add('lock:busy', 1, 60)
+        self.assertEqual(shared_cache.get_or_set('busy', lambda: 'fallback', lock_timeout=0.05), 'fallback')
+
+    def test_login_does_not_invalidate_user_tag(self):
+        """Test saving only last_login keeps the user's cached keys"""
+        user = User.objects.create_user(
+            username='tag_user', email='tag@example.com', password='testpass123', student_id='T-1'
+        )
+        key = shared_cache.make_key('profile', user.pk, tags=[f'user:{user.pk}'])
+        self.client.login(username='tag_user', password='testpass123')
+        self.assertEqual(shared_cache.make_key('profile', user.pk, tags=[f'user:{user.pk}']), key)
+
+        user.bio = 'changed'
+        user.save()
+        self.assertNotEqual(shared_cache.make_key('profile', user.pk, tags=[f'user:{user.pk}']), key)
+
+
+class LiveChannelTestCase(TestCase):
+    def setUp(self):
+        """Set up a user with a post and an already published event"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='live_user', email='live@example.com', password='testpass123', student_id='L-1'
+        )
+        self.fan = User.objects.create_user(
+            username='live_fan', email='live_fan@example.com', password='testpass123', student_id='L-2'
+        )
+        self.post = Post.objects.create(author=self.user, content='Live post')
+        self.first = LiveEvent.objects.create(user=self.user, event='unread', data={'count': 1})
+
+    def test_events_are_published_on_commit(self):
+        """Test likes and points reach the relay table only after the transaction commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.toggle_like(self.fan, self.post)
+            self.assertFalse(LiveEvent.objects.filter(event='like_count').exists())
+        event = LiveEvent.objects.get(event='like_count')
+        self.assertEqual(event.user, self.user)
+        self.assertEqual(event.data, {'target': f'post-{self.post.id}', 'like_count': 1})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            GamificationService.enqueue_event(self.user, 'post_created', object_id=self.post.id)
+            call_command('process_outbox', stdout=StringIO())
+        self.assertEqual(LiveEvent.objects.get(event='points').data['total_points'], 10)
+
+    @override_settings(LIVE_POLL_INTERVAL=0.01)
+    async def test_stream_replays_then_pushes(self):
+        """Test a reconnecting client gets missed events, then new ones through the broker"""
+        stream = live.stream(self.user.pk, last_event_id='0', snapshot={'unread': {'count': 1}})
+        chunks = [await stream.__anext__() for _ in range(3)]
+        self.assertTrue(chunks[0].startswith('retry:'))
+        self.assertEqual(chunks[1], 'event: unread\ndata: {"count": 1}\n\n')
+        self.assertEqual(chunks[2], live.format_event(self.first))
+
+        second = await sync_to_async(LiveEvent.objects.create)(user=self.user, event='points', data={'level': 2})
+        self.assertEqual(await asyncio.wait_for(stream.__anext__(), 5), live.format_event(second))
+        await stream.aclose()
+        self.assertNotIn(self.user.pk, live.broker._queues)
+
+    @override_settings(LIVE_POLL_INTERVAL=0.01)
+    async def test_concurrent_subscribers_share_one_reader(self):
+        """Test connections opened at the same time start a single broker task"""
+        broker = live.Broker()
+        queues = await asyncio.gather(broker.subscribe(self.user.pk), broker.subscribe(self.user.pk))
+        task = broker._task
+        await broker.subscribe(self.fan.pk)
+        self.assertIs(broker._task, task)
+        readers = [
+            running for running in asyncio.all_tasks()
+            if running.get_coro().__qualname__ == 'Broker._run'
+            and running.get_coro().cr_frame.f_locals.get('self') is broker
+        ]
+        self.assertEqual(readers, [task])
+
+        second = await sync_to_async(LiveEvent.objects.create)(user=self.user, event='points', data={'level': 2})
+        for queue in queues:
+            self.assertEqual((await asyncio.wait_for(queue.get(), 5)).pk, second.pk)
+            self.assertTrue(queue.empty())
+        for queue in queues:
+            broker.unsubscribe(self.user.pk, queue)
+        broker.unsubscribe(self.fan.pk, broker._queues[self.fan.pk].copy().pop())
+        await asyncio.wait_for(task, 5)
+
+    def test_stream_requires_login(self):
+        """Test anonymous clients are rejected"""
+        self.assertEqual(self.client.get('/live/').status_code, 401)
+
+    def test_stream_is_disabled_under_wsgi(self):
+        """Test WSGI requests get 204 and pages do not open the stream"""
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/live/').status_code, 204)
+        response = self.client.get('/post/')
+        self.assertContains(response, 'window.liveEnabled = false;')
+        self.assertNotContains(response, 'liveChannel.connect()')
+
+    @override_settings(LIVE_SEPARATE_SERVER=True)
+    def test_wsgi_pages_connect_to_separate_live_server(self):
+        """Test pages served by WSGI open the stream when a separate ASGI process serves /live/"""
+        self.client.force_login(self.user)
+        response = self.client.get('/post/')
+        self.assertContains(response, 'window.liveEnabled = true;')
+        self.assertContains(response, 'liveChannel.connect()')
+
+    def test_navbar_shows_unread_badge(self):
+        """Test pages render the unread count in the live badge"""
+        Notification.objects.create(recipient=self.user, notification_type='system', title='Hi', message='Hi')
+        self.client.force_login(self.user)
+        response = self.client.get('/post/')
+        self.assertContains(response, '>1</span>', count=2)
+        self.assertContains(response, 'data-live-unread', count=2)
+
+    async def test_stream_opens_under_asgi(self):
+        """Test ASGI requests get the event stream"""
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get('/live/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        self.assertTrue((await anext(chunks)).startswith(b'retry:'))
+        await response.streaming_content.aclose()
+
+    def test_prune_live_events(self):
+        """Test old relay rows are removed"""
+        LiveEvent.objects.filter(pk=self.first.pk).update(created_at=timezone.now() - timedelta(hours=2))
+        call_command('prune_live_events', stdout=StringIO())
+        self.assertFalse(LiveEvent.objects.exists())
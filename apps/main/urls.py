@@ -18,4 +18,7 @@ urlpatterns = [
     path('api/points-history/', views.PointsHistoryView.as_view(), name='get_points_history'),
     path('api/check-achievements/', views.CheckAchievementsView.as_view(), name='check_achievements'),
     path('api/leaderboard/', views.LeaderboardView.as_view(), name='leaderboard'),
+
+    # Eventos en vivo (SSE)
+    path('live/', views.LiveStreamView.as_view(), name='live'),
 ]
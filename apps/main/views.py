@@ -1,5 +1,5 @@
 from django.shortcuts import redirect
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.conf import settings
 from django.views.generic import TemplateView, ListView, FormView
 from django.views import View
@@ -7,11 +7,16 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 import django
 import json
+from asgiref.sync import sync_to_async
+from django.db.models import Count
 from apps.user.models import User
 from apps.career.models import Career
 from apps.achievement.models import Achievement
 from apps.main.services.gamification_service import GamificationService
+from apps.main.services.leaderboard_service import LeaderboardService
 from apps.main.forms import FeedbackForm
+from apps.main import live
+from apps.main.services.notification_service import NotificationService
 
 
 class InicioRedirectView(View):
@@ -180,21 +185,37 @@ class LeaderboardView(LoginRequiredMixin, View):
 
     def get(self, request, *args, **kwargs):
         try:
-            limit = int(request.GET.get('limit', 50))
-            users = User.objects.all().order_by('-total_points')[:limit]
+            limit = max(1, min(int(request.GET.get('limit', 50)), 100))
+            period = request.GET.get('period', 'all')
+            career_id = int(request.GET['career']) if request.GET.get('career') else None
+            board = LeaderboardService.get_board(period, limit, career_id)
+
+            # Conteos de actividad en una sola consulta para todo el ranking
+            activity = User.objects.filter(id__in=[entry['id'] for entry in board]).annotate(
+                posts_total=Count('posts', distinct=True),
+                achievements_total=Count('user_achievements', distinct=True),
+            ).values('id', 'experience_points', 'posts_total', 'achievements_total')
+            activity = {row['id']: row for row in activity}
+
             leaderboard_data = []
-            for idx, user in enumerate(users, 1):
+            for entry in board:
+                row = activity.get(entry['id'], {})
                 leaderboard_data.append({
-                    'rank': idx,
-                    'id': user.id,
-                    'username': user.username,
-                    'total_points': user.total_points,
-                    'level': user.level,
-                    'experience_points': user.experience_points,
-                    'posts': user.posts.count(),
-                    'achievements': user.user_achievements.count(),
+                    'rank': entry['rank'],
+                    'id': entry['id'],
+                    'username': entry['username'],
+                    'total_points': entry['total_points'],
+                    'level': entry['level'],
+                    'experience_points': row.get('experience_points', 0),
+                    'posts': row.get('posts_total', 0),
+                    'achievements': row.get('achievements_total', 0),
+                    **({'period_points': entry['period_points']} if 'period_points' in entry else {}),
                 })
-            return JsonResponse({'leaderboard': leaderboard_data, 'total': len(leaderboard_data)})
+            return JsonResponse({
+                'leaderboard': leaderboard_data,
+                'total': len(leaderboard_data),
+                'me': LeaderboardService.get_rank(request.user),
+            })
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
 
@@ -210,3 +231,36 @@ class CheckAchievementsView(LoginRequiredMixin, View):
             return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
+
+
+# ===== EVENTOS EN VIVO =====
+
+
+class LiveStreamView(View):
+    """
+    Server-Sent Events con notificaciones, contadores y puntos del usuario.
+    Es asíncrona: servida por ASGI, una conexión abierta no ocupa un thread.
+    Bajo WSGI responde 204 (ver live.available).
+    """
+
+    async def get(self, request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return HttpResponse(status=401)
+        if not live.available(request):
+            # 204 hace que EventSource deje de reconectar
+            return HttpResponse(status=204)
+
+        snapshot = {
+            'unread': {'count': await sync_to_async(NotificationService.unread_count)(user.pk)},
+            'points': {'total_points': user.total_points, 'level': user.level, 'level_up': False},
+        }
+        last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        response = StreamingHttpResponse(
+            live.stream(user.pk, last_event_id, snapshot),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Evita que nginx acumule la respuesta antes de enviarla
+        response['X-Accel-Buffering'] = 'no'
+        return response
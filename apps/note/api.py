@@ -3,6 +3,9 @@ from typing import List
 from ninja_jwt.authentication import JWTAuth
 
 from apps.note.models import Note
+from apps.main.pagination import keyset_page, estimate_count
+from apps.main.services.search_service import SearchService
+from apps.main.services.tag_service import TagService
 
 router = Router()
 
@@ -40,10 +43,11 @@ class NoteUpdate(Schema):
 
 
 class PaginatedNotesOut(Schema):
-    total: int
+    total: int | None = None
     page: int
     size: int
     items: List[NoteOut]
+    next_cursor: str | None = None
 
 
 class DeleteResponse(Schema):
@@ -51,7 +55,8 @@ class DeleteResponse(Schema):
 
 
 @router.get("/", response=PaginatedNotesOut)
-def list_notes(request, page: int = 1, size: int = 20, author_id: int | None = None, subject_id: int | None = None, search: str | None = None):
+def list_notes(request, page: int = 1, size: int = 20, author_id: int | None = None, subject_id: int | None = None, search: str | None = None,
+               tag: str | None = None, cursor: str | None = None, with_total: bool = False):
     size = max(1, min(size, 100))
     qs = Note.objects.select_related('author', 'subject').filter(is_active=True, privacy_level='public')
     if author_id:
@@ -59,12 +64,19 @@ def list_notes(request, page: int = 1, size: int = 20, author_id: int | None = N
     if subject_id:
         qs = qs.filter(subject_id=subject_id)
     if search:
-        qs = qs.filter(title__icontains=search)
-    qs = qs.order_by('-created_at')
-    total = qs.count()
-    start = (page - 1) * size
-    end = start + size
-    qs_page = qs[start:end]
+        qs = SearchService.filter(qs, 'note', search)
+    if tag:
+        qs = TagService.filter(qs, tag)
+    next_cursor = None
+    if cursor is not None:
+        qs_page, next_cursor = keyset_page(qs, '-created_at', cursor, size)
+        total = estimate_count(qs) if with_total else None
+    else:
+        qs = qs.order_by('-created_at')
+        total = qs.count()
+        start = (page - 1) * size
+        end = start + size
+        qs_page = qs[start:end]
     items = [NoteOut(
         id=n.id,
         title=n.title,
@@ -79,7 +91,7 @@ def list_notes(request, page: int = 1, size: int = 20, author_id: int | None = N
         is_featured=n.is_featured,
         created_at=n.created_at.isoformat(),
     ) for n in qs_page]
-    return PaginatedNotesOut(total=total, page=page, size=size, items=items)
+    return PaginatedNotesOut(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
 @router.get("/{note_id}", response=NoteOut)
@@ -0,0 +1,19 @@
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('note', '0002_initial'),
+        ('subject', '0002_alter_subject_options_alter_subject_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['is_active', 'privacy_level', '-created_at', '-id'], name='note_note_is_acti_506a67_idx'),
+        ),
+    ]
@@ -98,6 +98,9 @@ class Note(models.Model):
         verbose_name = "Note"
         verbose_name_plural = "Notes"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['is_active', 'privacy_level', '-created_at', '-id']),
+        ]
         
     def __str__(self):
         return f"{self.title} - {self.subject.name}"
@@ -111,10 +114,10 @@ class Note(models.Model):
             return [tag.strip() for tag in self.tags.split(',')]
         return []
     
-    def increment_views(self):
-        """Increment views count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+    def increment_views(self, viewer=None):
+        """Increment views count (buffered, see ViewCounter)"""
+        from apps.main.services.view_counter import ViewCounter
+        return ViewCounter.hit(self, viewer)
     
     def increment_downloads(self):
         """Increment downloads count"""
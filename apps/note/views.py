@@ -4,6 +4,7 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView, D
 from django.contrib import messages
 from apps.note.models import Note
 from apps.note.forms import NoteForm
+from apps.main.services.search_service import SearchService
 
 
 class NoteListView(LoginRequiredMixin, ListView):
@@ -17,7 +18,7 @@ class NoteListView(LoginRequiredMixin, ListView):
 		q = self.request.GET.get('q')
 		note_type = self.request.GET.get('type')
 		if q:
-			qs = qs.filter(title__icontains=q)
+			qs = SearchService.filter(qs, 'note', q)
 		if note_type:
 			qs = qs.filter(note_type=note_type)
 		return qs.order_by('-created_at')
@@ -31,7 +32,7 @@ class NoteDetailView(LoginRequiredMixin, DetailView):
 
 	def get_object(self, queryset=None):
 		obj = super().get_object(queryset)
-		obj.increment_views()
+		obj.increment_views(viewer=self.request.user.pk)
 		return obj
 
 
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Notification, NotificationPreference
+from django.utils import timezone
+from .models import Notification, NotificationArchive, NotificationPreference
 
 
 @admin.register(Notification)
@@ -9,6 +10,8 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ('title', 'message', 'recipient__username', 'sender__username')
     readonly_fields = ('created_at', 'read_at', 'sent_at')
     ordering = ('-created_at',)
+    # Evita el COUNT(*) sin filtros sobre toda la tabla en cada página
+    show_full_result_count = False
     
     fieldsets = (
         ('Recipients', {
@@ -33,7 +36,10 @@ class NotificationAdmin(admin.ModelAdmin):
     actions = ['mark_as_read', 'mark_as_sent']
     
     def mark_as_read(self, request, queryset):
-        queryset.update(is_read=True)
+        from apps.main.services.notification_service import NotificationService
+        recipients = set(queryset.filter(is_read=False).values_list('recipient_id', flat=True))
+        queryset.update(is_read=True, read_at=timezone.now())
+        NotificationService.invalidate_unread(*recipients)
     mark_as_read.short_description = "Mark selected notifications as read"
     
     def mark_as_sent(self, request, queryset):
@@ -44,6 +50,20 @@ class NotificationAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related('recipient', 'sender')
 
 
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('title', 'recipient', 'notification_type', 'is_read', 'created_at', 'archived_month')
+    list_filter = ('notification_type', 'archived_month')
+    search_fields = ('title', 'recipient__username')
+    readonly_fields = ('archived_at',)
+    raw_id_fields = ('recipient',)
+    ordering = ('-created_at',)
+    show_full_result_count = False
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('recipient')
+
+
 @admin.register(NotificationPreference)
 class NotificationPreferenceAdmin(admin.ModelAdmin):
     list_display = ('user', 'email_notifications', 'app_notifications', 'digest_frequency', 'updated_at')
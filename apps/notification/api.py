@@ -0,0 +1,93 @@
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from ninja import Router, Schema
+from ninja.security import django_auth
+from typing import List
+from ninja_jwt.authentication import JWTAuth, JWTStatelessUserAuthentication
+
+from apps.notification.models import Notification
+from apps.main import content_types
+from apps.main.pagination import keyset_page
+from apps.main.services.notification_service import NotificationService
+
+router = Router()
+
+
+class NotificationOut(Schema):
+    id: int
+    notification_type: str
+    title: str
+    message: str
+    sender_id: int | None = None
+    sender_username: str | None = None
+    priority: str
+    actor_count: int
+    is_read: bool
+    action_url: str
+    created_at: str
+    last_actor_at: str
+
+
+class MarkReadOut(Schema):
+    updated: int
+    unread: int
+
+
+class NotificationsPageOut(Schema):
+    size: int
+    items: List[NotificationOut]
+    next_cursor: str | None = None
+
+
+@router.get("/", auth=JWTAuth(), response=NotificationsPageOut)
+def list_notifications(request, size: int = 20, cursor: str = '', unread: bool = False):
+    size = max(1, min(size, 100))
+    qs = Notification.objects.select_related('sender').filter(recipient=request.user)
+    if unread:
+        qs = qs.filter(is_read=False)
+    qs_page, next_cursor = keyset_page(qs, '-last_actor_at', cursor, size)
+    # Una consulta por tipo de objeto relacionado en lugar de una por notificación
+    qs_page = content_types.prefetch_content_objects(qs_page)
+    items = [NotificationOut(
+        id=n.id,
+        notification_type=n.notification_type,
+        title=n.title,
+        message=n.message,
+        sender_id=n.sender_id,
+        sender_username=n.sender.username if n.sender else None,
+        priority=n.priority,
+        actor_count=n.actor_count,
+        is_read=n.is_read,
+        action_url=n.get_action_url(),
+        created_at=n.created_at.isoformat(),
+        last_actor_at=n.last_actor_at.isoformat(),
+    ) for n in qs_page]
+    return NotificationsPageOut(size=size, items=items, next_cursor=next_cursor)
+
+
+# El token se valida sin cargar el usuario: el sondeo frecuente solo lee la caché
+@router.get("/unread-count", auth=[JWTStatelessUserAuthentication(), django_auth])
+def unread_count(request):
+    unread = NotificationService.unread_count(request.auth.pk)
+    etag = f'"unread-{request.auth.pk}-{unread}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=304)
+    else:
+        response = JsonResponse({'unread': unread})
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@router.post("/read-all", auth=JWTAuth(), response=MarkReadOut)
+def mark_all_read(request):
+    updated = NotificationService.mark_all_read(request.user)
+    return MarkReadOut(updated=updated, unread=0)
+
+
+@router.post("/{notification_id}/read", auth=JWTAuth(), response=MarkReadOut)
+def mark_read(request, notification_id: int):
+    notification = get_object_or_404(Notification, pk=notification_id, recipient=request.user)
+    updated = 0 if notification.is_read else 1
+    notification.mark_as_read()
+    return MarkReadOut(updated=updated, unread=NotificationService.unread_count(request.user))
@@ -0,0 +1,36 @@
+"""
+Envía por email el digest de notificaciones pendientes de los usuarios con
+la frecuencia indicada. Pensado para correr desde cron.
+
+Uso: python manage.py send_notification_digests --frequency daily
+     python manage.py send_notification_digests --frequency weekly --batch-size 200
+"""
+
+from django.core.management.base import BaseCommand
+from apps.main.services.digest_service import DigestService
+
+
+class Command(BaseCommand):
+    help = 'Envía los digests de notificaciones por email en lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--frequency', default='daily', choices=['immediate', 'daily', 'weekly', 'never'],
+            help="Frecuencia de digest a procesar ('never' solo marca como enviadas)",
+        )
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails por envío')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Filas por lectura del cursor')
+
+    def handle(self, *args, **options):
+        stats = DigestService.send(
+            options['frequency'],
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+        )
+        rate = stats['users'] / stats['seconds'] if stats['seconds'] else stats['users']
+        self.stdout.write(self.style.SUCCESS(
+            f"Usuarios: {stats['users']} | Emails: {stats['emails']} | "
+            f"Notificaciones enviadas: {stats['notifications']} | Omitidas: {stats['skipped']} | "
+            f"Rechazados: {stats['failed']} | "
+            f"{stats['seconds']:.2f}s ({rate:.0f} usuarios/s)"
+        ))
@@ -0,0 +1,41 @@
+"""
+Worker de retención de notificaciones: borra las vencidas y las leídas
+viejas, archiva las antiguas y purga los meses viejos del archivo.
+
+Uso: python manage.py sweep_notifications --batch-size 1000 --pause 0.1
+     python manage.py sweep_notifications --loop --interval 3600
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from apps.main.services.retention_service import NotificationRetentionService
+
+
+class Command(BaseCommand):
+    help = 'Aplica la política de retención de notificaciones en lotes acotados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Filas por lote')
+        parser.add_argument('--max-batches', type=int, default=0, help='Cortar después de N lotes (0 = sin límite)')
+        parser.add_argument('--pause', type=float, default=0.0, help='Segundos de espera entre lotes')
+        parser.add_argument('--loop', action='store_true', help='Repetir la limpieza periódicamente')
+        parser.add_argument('--interval', type=float, default=3600.0, help='Segundos entre pasadas con --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            stats = NotificationRetentionService.sweep(
+                batch_size=options['batch_size'],
+                max_batches=options['max_batches'],
+                pause=options['pause'],
+            )
+            rows = stats['expired'] + stats['read_deleted'] + stats['archived'] + stats['archive_dropped']
+            rate = rows / stats['seconds'] if stats['seconds'] else rows
+            self.stdout.write(self.style.SUCCESS(
+                f"Vencidas: {stats['expired']} | Leídas borradas: {stats['read_deleted']} | "
+                f"Archivadas: {stats['archived']} | Archivo purgado: {stats['archive_dropped']} | "
+                f"{rows} filas en {stats['batches']} lotes, {stats['seconds']:.2f}s ({rate:.0f} filas/s)"
+            ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
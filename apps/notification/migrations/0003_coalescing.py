@@ -0,0 +1,34 @@
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notification', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='actor_count',
+            field=models.PositiveIntegerField(default=1, verbose_name='Actor count'),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Group key'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('like', 'Like Received'), ('comment', 'Comment on Post'), ('reply', 'Reply to Comment'), ('friendship_request', 'Friendship Request'), ('friendship_accepted', 'Friendship Accepted'), ('follow', 'New Follower'), ('mention', 'Mentioned in Post'), ('group_invite', 'Group Invitation'), ('group_join', 'Joined Group'), ('achievement', 'Achievement Unlocked'), ('post_featured', 'Post Featured'), ('note_shared', 'Note Shared'), ('reaction', 'Reaction Received'), ('group_post', 'New Group Post'), ('system', 'System Notification')], max_length=20, verbose_name='Type'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'group_key', 'is_read'], name='notificatio_recipie_fea2bd_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notification', '0004_notification_unread_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True, verbose_name='Original ID')),
+                ('sender_id', models.BigIntegerField(blank=True, null=True, verbose_name='Sender ID')),
+                ('notification_type', models.CharField(choices=[('like', 'Like Received'), ('comment', 'Comment on Post'), ('reply', 'Reply to Comment'), ('friendship_request', 'Friendship Request'), ('friendship_accepted', 'Friendship Accepted'), ('follow', 'New Follower'), ('mention', 'Mentioned in Post'), ('group_invite', 'Group Invitation'), ('group_join', 'Joined Group'), ('achievement', 'Achievement Unlocked'), ('post_featured', 'Post Featured'), ('note_shared', 'Note Shared'), ('reaction', 'Reaction Received'), ('group_post', 'New Group Post'), ('system', 'System Notification')], max_length=20, verbose_name='Type')),
+                ('title', models.CharField(max_length=100, verbose_name='Title')),
+                ('message', models.TextField(verbose_name='Message')),
+                ('content_type_id', models.IntegerField(blank=True, null=True, verbose_name='Content type ID')),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True, verbose_name='Object ID')),
+                ('action_url', models.URLField(blank=True, verbose_name='Action URL')),
+                ('is_read', models.BooleanField(default=False, verbose_name='Read')),
+                ('actor_count', models.PositiveIntegerField(default=1, verbose_name='Actor count')),
+                ('created_at', models.DateTimeField(verbose_name='Created at')),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('archived_month', models.DateField(verbose_name='Archived month')),
+            ],
+            options={
+                'verbose_name': 'Archived Notification',
+                'verbose_name_plural': 'Archived Notifications',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['notification_type', 'is_read', 'created_at'], name='notificatio_notific_bb9c01_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['expires_at'], name='notificatio_expires_e87528_idx'),
+        ),
+        migrations.AddField(
+            model_name='notificationarchive',
+            name='recipient',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_notifications', to=settings.AUTH_USER_MODEL, verbose_name='Recipient'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['recipient', '-created_at'], name='notificatio_recipie_49da05_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['archived_month'], name='notificatio_archive_b3984d_idx'),
+        ),
+    ]
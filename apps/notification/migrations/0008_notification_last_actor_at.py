@@ -0,0 +1,43 @@
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def init_last_actor_at(apps, schema_editor):
+    Notification = apps.get_model('notification', 'Notification')
+    Notification.objects.update(last_actor_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notification', '0007_notification_actor_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_recipie_a95ed4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_recipie_fe3355_idx',
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='last_actor_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Last actor at'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-last_actor_at'], name='notificatio_recipie_e345fe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', '-last_actor_at'], name='notificatio_recipie_e993c8_idx'),
+        ),
+        migrations.RunPython(init_last_actor_at, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.urls import reverse
+from django.utils import timezone
 
 
 class Notification(models.Model):
@@ -20,6 +21,7 @@ class Notification(models.Model):
         ('post_featured', 'Post Featured'),
         ('note_shared', 'Note Shared'),
         ('reaction', 'Reaction Received'),
+        ('group_post', 'New Group Post'),
         ('system', 'System Notification'),
     ]
     
@@ -80,6 +82,25 @@ class Notification(models.Model):
         verbose_name="Read"
     )
     
+    # Unread notifications with the same group key are coalesced into one row
+    group_key = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Group key"
+    )
+    
+    actor_count = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Actor count"
+    )
+    
+    # Distinct senders already counted in actor_count for a coalesced row
+    actor_ids = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name="Actor IDs"
+    )
+    
     is_sent = models.BooleanField(
         default=False,
         verbose_name="Sent"
@@ -98,6 +119,8 @@ class Notification(models.Model):
     )
     
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped when another actor is coalesced into the row; orders the list
+    last_actor_at = models.DateTimeField(default=timezone.now, verbose_name="Last actor at")
     read_at = models.DateTimeField(null=True, blank=True)
     sent_at = models.DateTimeField(null=True, blank=True)
     expires_at = models.DateTimeField(null=True, blank=True)
@@ -107,20 +130,33 @@ class Notification(models.Model):
         verbose_name_plural = "Notifications"
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient', '-created_at']),
+            models.Index(fields=['recipient', '-last_actor_at']),
+            models.Index(fields=['recipient', 'is_read', '-last_actor_at']),
+            models.Index(fields=['notification_type', 'is_read', 'created_at']),
+            models.Index(fields=['expires_at']),
             models.Index(fields=['is_read', '-created_at']),
             models.Index(fields=['notification_type']),
+            models.Index(fields=['recipient', 'group_key', 'is_read']),
+            models.Index(fields=['is_sent', 'recipient', 'id']),
         ]
         
     def __str__(self):
         return f"{self.title} for {self.recipient.username}"
     
     def mark_as_read(self):
-        """Mark notification as read"""
+        """Mark notification as read and discount it from the recipient's unread counter"""
         if not self.is_read:
+            from apps.main import live
+            from apps.main.services.notification_service import NotificationService
+            self.read_at = timezone.now()
+            # The conditional update keeps concurrent calls from discounting twice
+            updated = Notification.objects.filter(pk=self.pk, is_read=False).update(
+                is_read=True, read_at=self.read_at
+            )
             self.is_read = True
-            self.read_at = models.timezone.now()
-            self.save(update_fields=['is_read', 'read_at'])
+            if updated:
+                NotificationService.adjust_unread({self.recipient_id: -updated})
+                live.publish(self.recipient_id, 'unread', {'delta': -updated})
     
     def get_action_url(self):
         """Get the action URL for this notification"""
@@ -146,6 +182,7 @@ class Notification(models.Model):
             'post_featured': 'fa-star',
             'note_shared': 'fa-file-alt',
             'reaction': 'fa-smile',
+            'group_post': 'fa-users',
             'system': 'fa-info-circle',
         }
         return icon_map.get(self.notification_type, 'fa-bell')
@@ -153,7 +190,10 @@ class Notification(models.Model):
     @classmethod
     def create_notification(cls, recipient, notification_type, title, message, 
                           sender=None, content_object=None, action_url=None, priority='normal'):
-        """Helper method to create notifications"""
+        """Helper method to create one notification (skipped when blocked or disabled in the recipient's preferences)"""
+        from apps.main.services.notification_service import NotificationService
+        if not NotificationService.filter_recipients([recipient.pk], notification_type, sender):
+            return None
         notification = cls.objects.create(
             recipient=recipient,
             sender=sender,
@@ -161,12 +201,97 @@ class Notification(models.Model):
             title=title,
             message=message,
             content_object=content_object,
-            action_url=action_url,
+            action_url=action_url or '',
             priority=priority
         )
         return notification
 
 
+class NotificationArchive(models.Model):
+    """
+    Old notifications moved out of the live table by sweep_notifications.
+    archived_month works as the partition key: whole months are dropped
+    once they fall out of NOTIFICATION_ARCHIVE_MONTHS.
+    """
+    
+    original_id = models.BigIntegerField(
+        unique=True,
+        verbose_name="Original ID"
+    )
+    
+    recipient = models.ForeignKey(
+        'user.User',
+        on_delete=models.CASCADE,
+        related_name='archived_notifications',
+        verbose_name="Recipient"
+    )
+    
+    sender_id = models.BigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Sender ID"
+    )
+    
+    notification_type = models.CharField(
+        max_length=20,
+        choices=Notification.NOTIFICATION_TYPES,
+        verbose_name="Type"
+    )
+    
+    title = models.CharField(
+        max_length=100,
+        verbose_name="Title"
+    )
+    
+    message = models.TextField(
+        verbose_name="Message"
+    )
+    
+    content_type_id = models.IntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Content type ID"
+    )
+    
+    object_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Object ID"
+    )
+    
+    action_url = models.URLField(
+        blank=True,
+        verbose_name="Action URL"
+    )
+    
+    is_read = models.BooleanField(
+        default=False,
+        verbose_name="Read"
+    )
+    
+    actor_count = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Actor count"
+    )
+    
+    created_at = models.DateTimeField(verbose_name="Created at")
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+    archived_month = models.DateField(verbose_name="Archived month")
+    
+    class Meta:
+        verbose_name = "Archived Notification"
+        verbose_name_plural = "Archived Notifications"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at']),
+            models.Index(fields=['archived_month']),
+        ]
+        
+    def __str__(self):
+        return f"{self.title} for user {self.recipient_id} (archived)"
+
+
 class NotificationPreference(models.Model):
     """User preferences for notifications"""
     
@@ -0,0 +1,106 @@
+"""
+Signals that queue notifications for likes, reactions, comments, group
+posts and achievements, keep the cached unread counters in sync and drop
+cached preferences when they change.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.achievement.models import UserAchievement
+from apps.comment.models import Comment
+from apps.like.models import Like
+from apps.notification.models import Notification, NotificationPreference
+from apps.post.models import Post
+from apps.reaction.models import Reaction
+from apps.main.services.notification_service import NotificationService, target_name
+
+
+@receiver(post_save, sender=NotificationPreference)
+@receiver(post_delete, sender=NotificationPreference)
+def invalidate_notification_preferences(sender, instance, **kwargs):
+    """Drops the user's cached preferences."""
+    NotificationService.invalidate_preferences(instance.user_id)
+
+
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, **kwargs):
+    """Counts a new unread notification for its recipient and pushes it to their live channel."""
+    if created and not instance.is_read:
+        NotificationService.adjust_unread({instance.recipient_id: 1})
+        NotificationService.publish(
+            [instance.recipient_id], instance.notification_type, instance.title, instance.message,
+            instance.action_url, instance.actor_count,
+        )
+
+
+@receiver(post_delete, sender=Notification)
+def discount_deleted_notification(sender, instance, **kwargs):
+    """Discounts a deleted unread notification."""
+    if not instance.is_read:
+        NotificationService.adjust_unread({instance.recipient_id: -1})
+
+
+@receiver(post_save, sender=Like)
+def notify_like(sender, instance, created, **kwargs):
+    """Notifies the author of the liked object."""
+    target = instance.content_object if created else None
+    if getattr(target, 'author_id', None):
+        NotificationService.dispatch(
+            'like', 'Nuevo like', f'{instance.user.username} te dio like',
+            recipients=[target.author_id], sender=instance.user, content_object=target,
+            dedupe_key=f'notification:like:{instance.pk}',
+        )
+
+
+@receiver(post_save, sender=Reaction)
+def notify_reaction(sender, instance, created, **kwargs):
+    """Notifies the author of the object that received a reaction."""
+    target = instance.content_object if created else None
+    if getattr(target, 'author_id', None):
+        NotificationService.dispatch(
+            'reaction', 'Nueva reacción', f'{instance.user.username} reaccionó a {target_name(target._meta.model_name)}',
+            recipients=[target.author_id], sender=instance.user, content_object=target,
+            dedupe_key=f'notification:reaction:{instance.pk}',
+        )
+
+
+@receiver(post_save, sender=Comment)
+def notify_comment(sender, instance, created, **kwargs):
+    """Notifies the post author, and the parent comment's author for replies."""
+    if not created:
+        return
+    if instance.parent_id:
+        NotificationService.dispatch(
+            'reply', 'Nueva respuesta', f'{instance.author.username} respondió tu comentario',
+            recipients=[instance.parent.author_id], sender=instance.author, content_object=instance,
+            dedupe_key=f'notification:reply:{instance.pk}',
+        )
+    NotificationService.dispatch(
+        'comment', 'Nuevo comentario', f'{instance.author.username} comentó tu publicación',
+        recipients=[instance.post.author_id], sender=instance.author, content_object=instance.post,
+        action_url=instance.get_absolute_url(),
+        dedupe_key=f'notification:comment:{instance.pk}',
+    )
+
+
+@receiver(post_save, sender=Post)
+def notify_group_post(sender, instance, created, **kwargs):
+    """Notifies the active members of the group a post was published in."""
+    if created and instance.group_id:
+        NotificationService.dispatch(
+            'group_post', 'Nueva publicación en tu grupo',
+            f'{instance.author.username} publicó en {instance.group.name}',
+            group=instance.group_id, sender=instance.author, content_object=instance,
+            dedupe_key=f'notification:group_post:{instance.pk}',
+        )
+
+
+@receiver(post_save, sender=UserAchievement)
+def notify_achievement(sender, instance, created, **kwargs):
+    """Notifies the user of a newly earned achievement."""
+    if created:
+        NotificationService.dispatch(
+            'achievement', 'Logro desbloqueado', f'Obtuviste el logro "{instance.achievement.name}"',
+            recipients=[instance.user_id], content_object=instance.achievement,
+            dedupe_key=f'notification:achievement:{instance.pk}',
+        )
@@ -1,2 +1,470 @@
-from django.test import TestCase
+import smtplib
+from datetime import timedelta
+from io import StringIO
 
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from apps.comment.models import Comment
+from apps.friendship.models import Block
+from apps.group.models import Group, GroupMembership
+from apps.like.models import Like
+from apps.main import content_types
+from apps.main import outbox
+from apps.main.services.digest_service import DigestService
+from apps.main.services.notification_service import NotificationService
+from apps.main.services.retention_service import NotificationRetentionService
+from apps.notification.models import Notification, NotificationArchive, NotificationPreference
+from apps.post.models import Post
+
+User = get_user_model()
+
+
+class NotificationListTestCase(TestCase):
+    def setUp(self):
+        """Set up a recipient with notifications about posts and comments"""
+        cache.clear()
+        self.recipient = User.objects.create_user(
+            username='recipient', email='recipient@example.com', password='testpass123', student_id='N-1'
+        )
+        self.sender = User.objects.create_user(
+            username='sender', email='sender@example.com', password='testpass123', student_id='N-2'
+        )
+        for i in range(3):
+            post = Post.objects.create(author=self.recipient, content=f'Post {i}')
+            comment = Comment.objects.create(author=self.sender, post=post, content='Hi')
+            Notification.create_notification(
+                self.recipient, 'like', 'Like', 'Liked your post', sender=self.sender, content_object=post
+            )
+            Notification.create_notification(
+                self.recipient, 'comment', 'Comment', 'Commented', sender=self.sender, content_object=comment
+            )
+
+    def get_jwt_token(self, username, password):
+        """Helper to get JWT token"""
+        response = self.client.post('/api/token/pair', {
+            'username': username,
+            'password': password
+        }, content_type='application/json')
+        return response.json().get('access')
+
+    def test_registry_answers_from_memory(self):
+        """Test content type lookups hit the database only to warm the registry"""
+        content_types.clear()
+        content_types.get_for_model(Post)
+        with self.assertNumQueries(0):
+            post_type = content_types.get_for_model(Post)
+            self.assertEqual(content_types.get_for_id(post_type.id), post_type)
+
+    def test_content_objects_prefetched_per_type(self):
+        """Test action URLs are resolved with one query per target model"""
+        notifications = list(Notification.objects.filter(recipient=self.recipient))
+        content_types.get_for_model(Post)
+        with self.assertNumQueries(2):
+            content_types.prefetch_content_objects(notifications)
+            urls = [n.get_action_url() for n in notifications]
+        self.assertTrue(all(url.startswith('/') for url in urls))
+
+    def test_list_notifications_endpoint(self):
+        """Test listing notifications with cursor pagination"""
+        token = self.get_jwt_token('recipient', 'testpass123')
+        response = self.client.get('/api/notifications/?size=4', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['items']), 4)
+        self.assertEqual(data['items'][0]['sender_username'], 'sender')
+
+        response = self.client.get(
+            f"/api/notifications/?size=4&cursor={data['next_cursor']}", HTTP_AUTHORIZATION=f'Bearer {token}'
+        )
+        self.assertEqual(len(response.json()['items']), 2)
+        self.assertIsNone(response.json()['next_cursor'])
+
+    def test_list_my_likes_endpoint(self):
+        """Test the liked items listing resolves targets across content types"""
+        post = Post.objects.filter(author=self.recipient).first()
+        Like.objects.toggle_like(self.sender, post)
+        Like.objects.toggle_like(self.sender, Comment.objects.first())
+        token = self.get_jwt_token('sender', 'testpass123')
+        response = self.client.get('/api/likes/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(item['type'] for item in response.json()['items']), ['comment', 'post'])
+
+
+class NotificationDispatchTestCase(TestCase):
+    def setUp(self):
+        """Set up an author with a post and a few fans"""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='dispatch_author', email='da@example.com', password='testpass123', student_id='D-1'
+        )
+        self.fans = [
+            User.objects.create_user(
+                username=f'fan{i}', email=f'fan{i}@example.com', password='testpass123', student_id=f'D-F{i}'
+            )
+            for i in range(20)
+        ]
+        self.post = Post.objects.create(author=self.author, content='Popular post')
+
+    def test_likes_are_queued_and_coalesced(self):
+        """Test twenty likes on one post end up as a single aggregated notification"""
+        for fan in self.fans:
+            Like.objects.toggle_like(fan, self.post)
+        self.assertFalse(Notification.objects.exists())
+
+        outbox.process_batch(topic_prefix='notification')
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(notification.actor_count, 20)
+        self.assertEqual(notification.sender, self.fans[-1])
+        self.assertEqual(notification.message, 'fan19 y 19 personas más dieron like a tu publicación')
+
+    def test_coalescing_counts_distinct_senders(self):
+        """Test a fan who unlikes and likes again is not counted twice"""
+        Like.objects.toggle_like(self.fans[0], self.post)
+        Like.objects.toggle_like(self.fans[1], self.post)
+        Like.objects.toggle_like(self.fans[0], self.post)
+        Like.objects.toggle_like(self.fans[0], self.post)
+        outbox.process_batch(topic_prefix='notification')
+
+        notification = Notification.objects.get(recipient=self.author)
+        self.assertEqual(notification.actor_count, 2)
+        self.assertEqual(notification.message, 'fan1 y 1 personas más dieron like a tu publicación')
+
+    def test_coalescing_keeps_created_at(self):
+        """Test a coalesced like moves the row up the list without making it look newer to retention"""
+        Like.objects.toggle_like(self.fans[0], self.post)
+        outbox.process_batch(topic_prefix='notification')
+        first = Notification.objects.get(recipient=self.author)
+        Notification.objects.filter(pk=first.pk).update(
+            created_at=timezone.now() - timedelta(hours=2), last_actor_at=timezone.now() - timedelta(hours=2)
+        )
+        other = Notification.objects.create(
+            recipient=self.author, notification_type='system', title='Hi', message='Hi'
+        )
+
+        Like.objects.toggle_like(self.fans[1], self.post)
+        outbox.process_batch(topic_prefix='notification')
+        first.refresh_from_db()
+        self.assertEqual(first.actor_count, 2)
+        self.assertLess(first.created_at, timezone.now() - timedelta(hours=1))
+        self.assertGreater(first.last_actor_at, other.last_actor_at)
+
+        token = self.client.post('/api/token/pair', {
+            'username': self.author.username, 'password': 'testpass123'
+        }, content_type='application/json').json()['access']
+        items = self.client.get('/api/notifications/', HTTP_AUTHORIZATION=f'Bearer {token}').json()['items']
+        self.assertEqual([item['id'] for item in items], [first.pk, other.pk])
+
+    def test_comment_likes_name_the_comment(self):
+        """Test coalesced likes on a comment say so instead of naming the post"""
+        comment = Comment.objects.create(post=self.post, author=self.author, content='My comment')
+        for fan in self.fans[:2]:
+            Like.objects.toggle_like(fan, comment)
+        outbox.process_batch(topic_prefix='notification')
+
+        notification = Notification.objects.get(recipient=self.author, notification_type='like')
+        self.assertEqual(notification.message, 'fan1 y 1 personas más dieron like a tu comentario')
+
+    def test_read_notifications_are_not_coalesced(self):
+        """Test a new like after reading the aggregated row starts a new one"""
+        Like.objects.toggle_like(self.fans[0], self.post)
+        outbox.process_batch(topic_prefix='notification')
+        Notification.objects.update(is_read=True)
+
+        Like.objects.toggle_like(self.fans[1], self.post)
+        outbox.process_batch(topic_prefix='notification')
+        self.assertEqual(Notification.objects.filter(recipient=self.author).count(), 2)
+
+    def test_preferences_are_cached_and_respected(self):
+        """Test disabled types are skipped and preference changes apply immediately"""
+        preference = NotificationPreference.objects.create(user=self.author, app_likes=False)
+        self.assertEqual(NotificationService.filter_recipients([self.author.id], 'like'), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.filter_recipients([self.author.id], 'comment'), [self.author.id])
+
+        preference.app_likes = True
+        preference.save()
+        self.assertEqual(NotificationService.filter_recipients([self.author.id], 'like'), [self.author.id])
+
+    def test_group_post_fans_out_in_bulk(self):
+        """Test a group post notifies active members except the author and blocked users"""
+        group = Group.objects.create(name='Fans', description='Group', creator=self.author)
+        for fan in [self.author] + self.fans:
+            GroupMembership.objects.get_or_create(group=group, user=fan, defaults={'status': 'active'})
+        Block.objects.create(blocker=self.fans[0], blocked=self.author)
+        NotificationPreference.objects.create(user=self.fans[1], app_groups=False)
+
+        Post.objects.create(author=self.author, content='Hello group', group=group, privacy_level='group')
+        with self.assertNumQueries(10):
+            outbox.process_batch(topic_prefix='notification')
+
+        recipients = set(Notification.objects.filter(notification_type='group_post').values_list('recipient', flat=True))
+        self.assertEqual(recipients, {fan.id for fan in self.fans[2:]})
+
+
+class UnreadCounterTestCase(TestCase):
+    def setUp(self):
+        """Set up a recipient with two unread notifications"""
+        cache.clear()
+        self.recipient = User.objects.create_user(
+            username='badge_user', email='badge@example.com', password='testpass123', student_id='U-1'
+        )
+        self.sender = User.objects.create_user(
+            username='badge_sender', email='badge_sender@example.com', password='testpass123', student_id='U-2'
+        )
+        self.notifications = [
+            Notification.create_notification(self.recipient, 'system', 'Hello', f'Message {i}')
+            for i in range(2)
+        ]
+
+    def get_jwt_token(self, username, password):
+        """Helper to get JWT token"""
+        response = self.client.post('/api/token/pair', {
+            'username': username,
+            'password': password
+        }, content_type='application/json')
+        return response.json().get('access')
+
+    def test_counter_follows_writes(self):
+        """Test the cached counter is kept in sync on create, read, delivery and mark-all"""
+        self.assertEqual(NotificationService.unread_count(self.recipient), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.unread_count(self.recipient), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notifications[0].mark_as_read()
+            self.notifications[0].mark_as_read()
+        self.assertIsNotNone(Notification.objects.get(pk=self.notifications[0].pk).read_at)
+        self.assertEqual(NotificationService.unread_count(self.recipient), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.dispatch('system', 'Hi', 'Queued', recipients=[self.recipient])
+            outbox.process_batch(topic_prefix='notification')
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.unread_count(self.recipient), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(NotificationService.mark_all_read(self.recipient), 2)
+        self.assertEqual(NotificationService.unread_count(self.recipient), 0)
+
+    @override_settings(NOTIFICATION_UNREAD_INCR=False)
+    def test_counter_is_recalculated_without_atomic_incr(self):
+        """Test caches without atomic incr drop the counter instead of adjusting it"""
+        self.assertEqual(NotificationService.unread_count(self.recipient), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notifications[0].mark_as_read()
+        self.assertIsNone(cache.get(f'notification:unread:{self.recipient.pk}'))
+        self.assertEqual(NotificationService.unread_count(self.recipient), 1)
+
+    def test_badge_endpoint_supports_etag(self):
+        """Test the badge answers 304 while the count does not change"""
+        token = self.get_jwt_token('badge_user', 'testpass123')
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        response = self.client.get('/api/notifications/unread-count', **auth)
+        self.assertEqual(response.json(), {'unread': 2})
+
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/notifications/unread-count', HTTP_IF_NONE_MATCH=etag, **auth)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/notifications/{self.notifications[1].pk}/read', **auth)
+        self.assertEqual(NotificationService.unread_count(self.recipient), 1)
+        response = self.client.get('/api/notifications/unread-count', HTTP_IF_NONE_MATCH=etag, **auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.post('/api/notifications/read-all', **auth)
+        self.assertEqual(response.json(), {'updated': 1, 'unread': 0})
+
+
+@override_settings(
+    NOTIFICATION_RETENTION={'default': {'read_days': 30, 'archive_days': 90}, 'like': {'read_days': 7}},
+    NOTIFICATION_ARCHIVE_MONTHS=12,
+)
+class NotificationRetentionTestCase(TestCase):
+    def setUp(self):
+        """Set up notifications of different ages, types and states"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='retention_user', email='retention@example.com', password='testpass123', student_id='R-1'
+        )
+        now = timezone.now()
+
+        def make(title, notification_type='system', days=0, is_read=False, expires_at=None):
+            notification = Notification.objects.create(
+                recipient=self.user, notification_type=notification_type, title=title, message=title,
+                is_read=is_read, expires_at=expires_at,
+            )
+            Notification.objects.filter(pk=notification.pk).update(created_at=now - timedelta(days=days))
+            return notification
+
+        make('fresh')
+        make('expired', expires_at=now - timedelta(minutes=1))
+        make('old read like', 'like', days=10, is_read=True)
+        make('recent read system', days=10, is_read=True)
+        make('old unread system', days=100)
+        NotificationArchive.objects.create(
+            original_id=999, recipient=self.user, notification_type='system', title='ancient', message='',
+            created_at=now - timedelta(days=800), archived_month=timezone.localdate().replace(day=1) - timedelta(days=500),
+        )
+
+    def test_policies_merge_defaults_per_type(self):
+        """Test per-type settings override only the keys they set"""
+        policies = NotificationRetentionService.policies()
+        self.assertEqual(policies['like'], {'read_days': 7, 'archive_days': 90})
+        self.assertEqual(policies['comment'], {'read_days': 30, 'archive_days': 90})
+
+    def test_sweep_deletes_archives_and_reports(self):
+        """Test one pass applies every rule in small batches and reports the work done"""
+        stdout = StringIO()
+        call_command('sweep_notifications', '--batch-size', '1', stdout=stdout)
+
+        self.assertEqual(
+            sorted(Notification.objects.values_list('title', flat=True)), ['fresh', 'recent read system']
+        )
+        self.assertEqual(list(NotificationArchive.objects.values_list('title', flat=True)), ['old unread system'])
+        self.assertIn('Vencidas: 1 | Leídas borradas: 1 | Archivadas: 1 | Archivo purgado: 1', stdout.getvalue())
+        self.assertIn('4 filas en 4 lotes', stdout.getvalue())
+
+    def test_sweep_respects_batch_budget(self):
+        """Test max_batches bounds the work done in one run"""
+        stats = NotificationRetentionService.sweep(batch_size=1, max_batches=2)
+        self.assertEqual(stats['batches'], 2)
+        self.assertEqual(Notification.objects.count(), 3)
+
+
+class RefusingEmailBackend(EmailBackend):
+    """Backend that refuses one address permanently and can drop the connection"""
+    disconnect_after = None
+
+    def send_messages(self, messages):
+        for message in messages:
+            if 'daily@example.com' in message.to:
+                raise smtplib.SMTPRecipientsRefused({'daily@example.com': (550, b'No such user')})
+            limit = RefusingEmailBackend.disconnect_after
+            if limit is not None and len(mail.outbox) >= limit:
+                raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+
+class NotificationDigestTestCase(TestCase):
+    def setUp(self):
+        """Set up users with different digest preferences and pending notifications"""
+        cache.clear()
+        self.daily = User.objects.create_user(
+            username='digest_daily', email='daily@example.com', password='testpass123', student_id='D-1'
+        )
+        self.weekly = User.objects.create_user(
+            username='digest_weekly', email='weekly@example.com', password='testpass123', student_id='D-2'
+        )
+        self.muted = User.objects.create_user(
+            username='digest_muted', email='muted@example.com', password='testpass123', student_id='D-3'
+        )
+        NotificationPreference.objects.create(user=self.weekly, digest_frequency='weekly')
+        NotificationPreference.objects.create(user=self.muted, email_likes=False)
+
+        def make(user, title, notification_type='comment', is_read=False):
+            return Notification.objects.create(
+                recipient=user, notification_type=notification_type, title=title, message=f'{title} message',
+                action_url='/post/1/', is_read=is_read,
+            )
+
+        make(self.daily, 'first comment')
+        make(self.daily, 'second comment')
+        make(self.daily, 'already read', is_read=True)
+        make(self.weekly, 'weekly comment')
+        make(self.muted, 'muted like', 'like')
+
+    def test_daily_digest_sends_one_email_per_user(self):
+        """Test users on the default frequency get a single email and every scanned row is marked sent"""
+        stats = DigestService.send('daily', batch_size=1, chunk_size=2)
+
+        self.assertEqual(len(mail.outbox), 1)
+        email = mail.outbox[0]
+        self.assertEqual(email.to, ['daily@example.com'])
+        self.assertIn('2 notificaciones', email.subject)
+        self.assertIn('first comment', email.body)
+        self.assertIn('second comment', email.body)
+        self.assertNotIn('already read', email.body)
+        self.assertIn('http://localhost:8000/post/1/', email.alternatives[0][0])
+        self.assertEqual(stats['users'], 2)
+        self.assertEqual(stats['notifications'], 2)
+        self.assertEqual(stats['skipped'], 2)
+
+        # La del usuario semanal queda pendiente; la del que desactivó likes se marca sin email
+        self.assertEqual(
+            list(Notification.objects.filter(is_sent=False).values_list('title', flat=True)), ['weekly comment']
+        )
+        self.assertFalse(Notification.objects.filter(is_sent=True, sent_at__isnull=True).exists())
+
+    def test_second_run_sends_nothing(self):
+        """Test notifications are only included in one digest"""
+        DigestService.send('daily')
+        mail.outbox.clear()
+        stats = DigestService.send('daily')
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(stats['users'], 0)
+
+    def test_digest_caps_items(self):
+        """Test long digests list the first items and summarize the rest"""
+        for i in range(3):
+            Notification.objects.create(
+                recipient=self.weekly, notification_type='comment', title=f'extra {i}', message='extra'
+            )
+        with override_settings(NOTIFICATION_DIGEST_MAX_ITEMS=2):
+            call_command('send_notification_digests', '--frequency', 'weekly', stdout=StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('4 notificaciones', mail.outbox[0].subject)
+        self.assertIn('y 2 más', mail.outbox[0].body)
+        self.assertNotIn('extra 2', mail.outbox[0].body)
+
+    def test_command_reports_stats(self):
+        """Test the command prints what it sent"""
+        stdout = StringIO()
+        call_command('send_notification_digests', '--frequency', 'daily', stdout=stdout)
+        self.assertIn('Usuarios: 2 | Emails: 1 | Notificaciones enviadas: 2 | Omitidas: 2', stdout.getvalue())
+
+    @override_settings(EMAIL_BACKEND='apps.notification.tests.RefusingEmailBackend')
+    def test_refused_recipient_does_not_block_others(self):
+        """Test a permanently refused address is logged and marked while later users still get their digest"""
+        later = User.objects.create_user(
+            username='digest_later', email='later@example.com', password='testpass123', student_id='D-4'
+        )
+        Notification.objects.create(recipient=later, notification_type='comment', title='later comment', message='x')
+
+        with self.assertLogs('apps.main.services.digest_service', 'WARNING'):
+            stats = DigestService.send('daily', batch_size=1)
+
+        self.assertEqual([email.to for email in mail.outbox], [['later@example.com']])
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['emails'], 1)
+        self.assertFalse(Notification.objects.filter(recipient=self.daily, is_sent=False).exists())
+
+    @override_settings(EMAIL_BACKEND='apps.notification.tests.RefusingEmailBackend')
+    def test_transient_error_keeps_unsent_rows_pending(self):
+        """Test a dropped connection stops the run and leaves only the unsent digests pending"""
+        first = User.objects.create_user(
+            username='digest_first', email='first@example.com', password='testpass123', student_id='D-0'
+        )
+        Notification.objects.create(recipient=first, notification_type='comment', title='first', message='x')
+        later = User.objects.create_user(
+            username='digest_later', email='later@example.com', password='testpass123', student_id='D-4'
+        )
+        Notification.objects.create(recipient=later, notification_type='comment', title='later', message='x')
+
+        RefusingEmailBackend.disconnect_after = 1
+        self.addCleanup(setattr, RefusingEmailBackend, 'disconnect_after', None)
+        with self.assertLogs('apps.main.services.digest_service', 'WARNING'):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                DigestService.send('daily', batch_size=1)
+
+        self.assertEqual([email.to for email in mail.outbox], [['first@example.com']])
+        self.assertTrue(Notification.objects.filter(recipient=first, is_sent=True).exists())
+        self.assertTrue(Notification.objects.filter(recipient=later, is_sent=False).exists())
@@ -8,7 +8,7 @@ class PostAdmin(admin.ModelAdmin):
     list_display = ('content_preview', 'author', 'post_type', 'privacy_level', 'subject', 'group', 'views_count', 'is_pinned', 'created_at')
     list_filter = ('post_type', 'privacy_level', 'is_pinned', 'is_featured', 'is_hidden', 'created_at', 'subject__career')
     search_fields = ('content', 'author__username', 'author__email', 'tags')
-    readonly_fields = ('views_count', 'created_at', 'updated_at', 'like_count', 'reaction_counts')
+    readonly_fields = ('views_count', 'created_at', 'updated_at', 'like_count', 'comment_count', 'reaction_counts')
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -26,7 +26,7 @@ class PostAdmin(admin.ModelAdmin):
             'fields': ('is_pinned', 'is_featured', 'is_hidden')
         }),
         ('Statistics', {
-            'fields': ('views_count', 'like_count', 'reaction_counts'),
+            'fields': ('views_count', 'like_count', 'comment_count', 'reaction_counts'),
             'classes': ('collapse',)
         }),
         ('Timestamps', {
@@ -39,10 +39,6 @@ class PostAdmin(admin.ModelAdmin):
         return obj.content[:50] + "..." if len(obj.content) > 50 else obj.content
     content_preview.short_description = "Content"
     
-    def like_count(self, obj):
-        return obj.get_like_count()
-    like_count.short_description = "Likes"
-    
     def reaction_counts(self, obj):
         counts = obj.get_reaction_counts()
         if counts:
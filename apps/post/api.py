@@ -3,6 +3,12 @@ from typing import List
 from ninja_jwt.authentication import JWTAuth
 
 from apps.post.models import Post
+from apps.like.models import Like
+from apps.reaction.models import Reaction
+from apps.main.auth import optional_auth
+from apps.main.pagination import keyset_page, estimate_count
+from apps.main.services.search_service import SearchService
+from apps.main.services.tag_service import TagService
 
 router = Router()
 
@@ -24,6 +30,9 @@ class PostOut(Schema):
     views_count: int
     like_count: int
     comment_count: int
+    reactions: dict[str, int] = {}
+    liked_by_me: bool = False
+    my_reaction: str | None = None
     created_at: str
 
 
@@ -36,34 +45,48 @@ class PostUpdate(Schema):
 
 
 class PaginatedPostsOut(Schema):
-    total: int
+    total: int | None = None
     page: int
     size: int
     items: List[PostOut]
+    next_cursor: str | None = None
 
 
 class DeleteResponse(Schema):
     success: bool
 
 
-@router.get("/", response=PaginatedPostsOut)
-def list_posts(request, page: int = 1, size: int = 20, search: str | None = None, ordering: str | None = None):
+@router.get("/", auth=optional_auth, response=PaginatedPostsOut)
+def list_posts(request, page: int = 1, size: int = 20, search: str | None = None, ordering: str | None = None,
+               tag: str | None = None, cursor: str | None = None, with_total: bool = False):
     size = max(1, min(size, 100))
-    qs = Post.objects.select_related('author').filter(is_hidden=False)
+    qs = Post.objects.select_related('author').filter(is_hidden=False).visible_to(request.user)
     if search:
-        qs = qs.filter(content__icontains=search)
+        qs = SearchService.filter(qs, 'post', search)
+    if tag:
+        qs = TagService.filter(qs, tag)
     allowed_ordering = {
         'created_at': 'created_at',
         '-created_at': '-created_at',
         'views_count': 'views_count',
         '-views_count': '-views_count',
+        'hot': '-hot_score',
     }
     order_field = allowed_ordering.get(ordering or '-created_at', '-created_at')
-    qs = qs.order_by(order_field)
-    total = qs.count()
-    start = (page - 1) * size
-    end = start + size
-    qs_page = qs[start:end]
+    next_cursor = None
+    if cursor is not None:
+        # Keyset mode: no OFFSET and no COUNT(*) unless explicitly requested
+        qs_page, next_cursor = keyset_page(qs, order_field, cursor, size)
+        total = estimate_count(qs) if with_total else None
+    else:
+        qs = qs.order_by(order_field)
+        total = qs.count()
+        start = (page - 1) * size
+        end = start + size
+        qs_page = qs[start:end]
+    qs_page = Reaction.objects.prefetch_reaction_counts(qs_page)
+    Like.objects.prefetch_liked_by(request.user, qs_page)
+    Reaction.objects.prefetch_user_reactions(request.user, qs_page)
     items = [PostOut(
         id=p.id,
         author_id=p.author_id,
@@ -79,16 +102,21 @@ def list_posts(request, page: int = 1, size: int = 20, search: str | None = None
         views_count=p.views_count,
         like_count=p.get_like_count(),
         comment_count=p.get_comment_count(),
+        reactions=p.get_reaction_counts(),
+        liked_by_me=p.liked_by_me,
+        my_reaction=p.my_reaction,
         created_at=p.created_at.isoformat(),
     ) for p in qs_page]
-    return PaginatedPostsOut(total=total, page=page, size=size, items=items)
+    return PaginatedPostsOut(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
-@router.get("/{post_id}", response=PostOut)
+@router.get("/{post_id}", auth=optional_auth, response=PostOut)
 def get_post(request, post_id: int):
-    p = Post.objects.select_related('author').filter(id=post_id, is_hidden=False).first()
+    p = Post.objects.select_related('author').filter(id=post_id, is_hidden=False).visible_to(request.user).first()
     if not p:
         return None
+    Like.objects.prefetch_liked_by(request.user, [p])
+    Reaction.objects.prefetch_user_reactions(request.user, [p])
     return PostOut(
         id=p.id,
         author_id=p.author_id,
@@ -104,6 +132,9 @@ def get_post(request, post_id: int):
         views_count=p.views_count,
         like_count=p.get_like_count(),
         comment_count=p.get_comment_count(),
+        reactions=p.get_reaction_counts(),
+        liked_by_me=p.liked_by_me,
+        my_reaction=p.my_reaction,
         created_at=p.created_at.isoformat(),
     )
 
@@ -140,6 +171,8 @@ def update_post(request, post_id: int, data: PostUpdate):
         return None  # could raise 403; returning None yields 404 style
     p.content = data.content
     p.save(update_fields=["content", "updated_at"])
+    Like.objects.prefetch_liked_by(request.user, [p])
+    Reaction.objects.prefetch_user_reactions(request.user, [p])
     return PostOut(
         id=p.id,
         author_id=p.author_id,
@@ -155,6 +188,9 @@ def update_post(request, post_id: int, data: PostUpdate):
         views_count=p.views_count,
         like_count=p.get_like_count(),
         comment_count=p.get_comment_count(),
+        reactions=p.get_reaction_counts(),
+        liked_by_me=p.liked_by_me,
+        my_reaction=p.my_reaction,
         created_at=p.created_at.isoformat(),
     )
 
@@ -0,0 +1,55 @@
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Post = apps.get_model('post', 'Post')
+    Comment = apps.get_model('comment', 'Comment')
+    Like = apps.get_model('like', 'Like')
+    Reaction = apps.get_model('reaction', 'Reaction')
+
+    def count_of(queryset, group_field):
+        return Coalesce(Subquery(
+            queryset.order_by().values(group_field).annotate(total=Count('*')).values('total')[:1]
+        ), 0)
+
+    post_ct = ContentType.objects.filter(app_label='post', model='post').first()
+    if post_ct is None:
+        return
+    Post.objects.update(
+        like_count=count_of(Like.objects.filter(content_type=post_ct, object_id=OuterRef('pk')), 'object_id'),
+        reaction_count=count_of(Reaction.objects.filter(content_type=post_ct, object_id=OuterRef('pk')), 'object_id'),
+        comment_count=count_of(Comment.objects.filter(post=OuterRef('pk')), 'post'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('post', '0002_initial'),
+        ('comment', '0002_initial'),
+        ('like', '0002_initial'),
+        ('reaction', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Comment count'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Like count'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='reaction_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reaction count'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0002_initial'),
+        ('post', '0003_post_comment_count_post_like_count_and_more'),
+        ('subject', '0002_alter_subject_options_alter_subject_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_hidden', '-created_at', '-id'], name='post_post_is_hidd_e3209d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_hidden', '-views_count', '-id'], name='post_post_is_hidd_3698db_idx'),
+        ),
+    ]
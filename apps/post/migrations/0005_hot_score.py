@@ -0,0 +1,42 @@
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def init_last_activity(apps, schema_editor):
+    Post = apps.get_model('post', 'Post')
+    Post.objects.update(last_activity_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0002_initial'),
+        ('post', '0004_post_post_post_is_hidd_e3209d_idx_and_more'),
+        ('subject', '0002_alter_subject_options_alter_subject_unique_together_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0, verbose_name='Hot score'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Last activity'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['is_hidden', '-hot_score', '-id'], name='post_post_is_hidd_72ab4d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['last_activity_at'], name='post_post_last_ac_d3be5f_idx'),
+        ),
+        migrations.RunPython(init_last_activity, migrations.RunPython.noop),
+    ]
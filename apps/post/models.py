@@ -1,8 +1,37 @@
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericRelation
 
 
+class PostQuerySet(models.QuerySet):
+    """QuerySet for Post with privacy-aware filters"""
+    
+    def visible_to(self, user):
+        """
+        Posts the user is allowed to see, as a single SQL predicate:
+        public posts, own posts, friends-only posts from friends and group
+        posts from groups with an active membership, excluding authors that
+        blocked or were blocked by the user (cached list, see BlockService).
+        """
+        if user is None or not user.is_authenticated:
+            return self.filter(privacy_level='public')
+        
+        from apps.friendship.models import FriendEdge
+        from apps.group.models import GroupMembership
+        from apps.main.services.block_service import BlockService
+        
+        friends = FriendEdge.objects.filter(user=user).values('friend_id')
+        groups = GroupMembership.objects.filter(user=user, status='active').values('group_id')
+        
+        return BlockService.exclude_blocked(self.filter(
+            models.Q(author=user) |
+            models.Q(privacy_level='public') |
+            models.Q(privacy_level='friends', author__in=friends) |
+            models.Q(privacy_level='group', group__in=groups)
+        ), user)
+
+
 class Post(models.Model):
     
     POST_TYPES = [
@@ -104,6 +133,31 @@ class Post(models.Model):
         verbose_name="Views count"
     )
     
+    like_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Like count"
+    )
+    
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Comment count"
+    )
+    
+    reaction_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Reaction count"
+    )
+    
+    hot_score = models.FloatField(
+        default=0,
+        verbose_name="Hot score"
+    )
+    
+    last_activity_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Last activity"
+    )
+    
     is_pinned = models.BooleanField(
         default=False,
         verbose_name="Pinned"
@@ -122,6 +176,8 @@ class Post(models.Model):
     likes = GenericRelation('like.Like')
     reactions = GenericRelation('reaction.Reaction')
     
+    objects = PostQuerySet.as_manager()
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -133,14 +189,25 @@ class Post(models.Model):
             models.Index(fields=['author', '-created_at']),
             models.Index(fields=['post_type', '-created_at']),
             models.Index(fields=['subject', '-created_at']),
+            models.Index(fields=['is_hidden', '-created_at', '-id']),
+            models.Index(fields=['is_hidden', '-views_count', '-id']),
+            models.Index(fields=['is_hidden', '-hot_score', '-id']),
+            models.Index(fields=['last_activity_at']),
         ]
         
     def __str__(self):
         content_preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
         return f"{self.author.username}: {content_preview}"
     
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.hot_score:
+            # Score inicial; update_hot_scores lo recalcula con la actividad
+            from apps.main.services.hot_service import HotScoreService
+            self.hot_score = HotScoreService.score(timezone.now())
+        super().save(*args, **kwargs)
+    
     def get_absolute_url(self):
-        return reverse('post:detail', kwargs={'pk': self.pk})
+        return reverse('post:detalle', kwargs={'post_id': self.pk})
     
     def get_tags_list(self):
         """Returns tags as a list"""
@@ -150,30 +217,42 @@ class Post(models.Model):
     
     def get_like_count(self):
         """Get total likes for this post"""
-        return self.likes.count()
+        return self.like_count
     
     def get_reaction_counts(self):
-        """Get reaction counts for this post"""
+        """Get reaction counts for this post (prefetched by Reaction.objects.prefetch_reaction_counts)"""
+        if hasattr(self, '_reaction_counts'):
+            return self._reaction_counts
         from apps.reaction.models import Reaction
         return Reaction.objects.get_reaction_counts_for_object(self)
     
     def get_comment_count(self):
         """Get total comments for this post"""
-        return self.comments.count()
+        return self.comment_count
     
-    def increment_views(self):
-        """Increment views count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+    def increment_views(self, viewer=None):
+        """Increment views count (buffered, see ViewCounter)"""
+        from apps.main.services.view_counter import ViewCounter
+        return ViewCounter.hit(self, viewer)
     
     def can_view(self, user):
-        """Check if user can view this post"""
+        """Check if user can view this post (same rules as PostQuerySet.visible_to)"""
+        if user is not None and user.is_authenticated:
+            from apps.main.services.block_service import BlockService
+            if BlockService.is_blocked(user, self.author_id):
+                return False
+        
         if self.privacy_level == 'public':
             return True
         elif self.privacy_level == 'private':
             return user == self.author
         elif self.privacy_level == 'friends':
-            return user == self.author or user in self.author.get_friends()
+            return user == self.author or getattr(user, 'pk', None) in self.author.get_friend_ids()
         elif self.privacy_level == 'group':
-            return self.group and user in self.group.members.all()
+            if user == self.author:
+                return True
+            from apps.group.models import GroupMembership
+            return bool(self.group_id) and getattr(user, 'pk', None) is not None and GroupMembership.objects.filter(
+                group_id=self.group_id, user_id=user.pk, status='active'
+            ).exists()
         return False
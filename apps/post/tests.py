@@ -1,2 +1,355 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from apps.comment.models import Comment
+from apps.friendship.models import Block, Friendship
+from apps.group.models import Group, GroupMembership
+from apps.like.models import Like
+from apps.main.models import OutboxEvent
+from apps.main.pagination import encode_cursor
+from apps.main.services.hot_service import HotScoreService
+from apps.main.services.view_counter import FLUSH_LOCK_KEY, INDEX_SEQ_KEY, ViewCounter
+from apps.post.models import Post
+from apps.reaction.models import Reaction
+
+User = get_user_model()
+
+
+class PostCountersTestCase(TestCase):
+    def setUp(self):
+        """Set up a post and a second user to interact with it"""
+        self.author = User.objects.create_user(
+            username='counter_author', email='ca@example.com', password='testpass123', student_id='C-1'
+        )
+        self.reader = User.objects.create_user(
+            username='counter_reader', email='cr@example.com', password='testpass123', student_id='C-2'
+        )
+        self.post = Post.objects.create(author=self.author, content='Counted post')
+
+    def test_toggle_like_updates_like_count(self):
+        """Test toggling a like increments and decrements like_count"""
+        Like.objects.toggle_like(self.reader, self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+
+        Like.objects.toggle_like(self.reader, self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_relike_does_not_award_points_again(self):
+        """Test unliking and liking again through the view only queues one like_received event"""
+        self.client.login(username='counter_reader', password='testpass123')
+        for _ in range(3):
+            self.client.post(f'/post/{self.post.pk}/like/')
+        self.assertEqual(OutboxEvent.objects.filter(topic='gamification.like_received').count(), 1)
+
+    def test_comments_update_comment_count(self):
+        """Test comment creation and deletion keep comment_count in sync"""
+        comment = Comment.objects.create(author=self.reader, post=self.post, content='Hi')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.get_comment_count(), 1)
+
+        comment.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.get_comment_count(), 0)
+
+    def test_reactions_update_per_type_counts(self):
+        """Test setting, changing and removing a reaction"""
+        Reaction.objects.set_reaction(self.reader, self.post, 'love')
+        self.assertEqual(self.post.get_reaction_counts(), {'love': 1})
+
+        Reaction.objects.set_reaction(self.reader, self.post, 'wow')
+        self.assertEqual(self.post.get_reaction_counts(), {'wow': 1})
+
+        Reaction.objects.remove_reaction(self.reader, self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.get_reaction_counts(), {})
+        self.assertEqual(self.post.reaction_count, 0)
+
+    def test_bulk_reaction_counts(self):
+        """Test reaction summaries for many posts come from one query, with or without the counter table"""
+        other = Post.objects.create(author=self.author, content='Second post')
+        empty = Post.objects.create(author=self.author, content='Third post')
+        Reaction.objects.set_reaction(self.reader, self.post, 'love')
+        Reaction.objects.set_reaction(self.author, self.post, 'love')
+        Reaction.objects.set_reaction(self.reader, other, 'wow')
+        expected = {self.post.id: {'love': 2}, other.id: {'wow': 1}, empty.id: {}}
+
+        posts = [self.post, other, empty]
+        with self.assertNumQueries(1):
+            Reaction.objects.prefetch_reaction_counts(posts)
+        with self.assertNumQueries(0):
+            self.assertEqual({p.id: p.get_reaction_counts() for p in posts}, expected)
+
+        with override_settings(REACTION_COUNTS_DENORMALIZED=False):
+            with self.assertNumQueries(1):
+                self.assertEqual(Reaction.objects.get_reaction_counts_for_objects(posts), expected)
+
+    def test_bulk_viewer_state(self):
+        """Test liked and reacted state for many posts costs one query each"""
+        other = Post.objects.create(author=self.author, content='Second post')
+        Like.objects.toggle_like(self.reader, other)
+        Reaction.objects.set_reaction(self.reader, self.post, 'wow')
+
+        posts = [self.post, other]
+        with self.assertNumQueries(2):
+            Like.objects.prefetch_liked_by(self.reader, posts)
+            Reaction.objects.prefetch_user_reactions(self.reader, posts)
+        self.assertEqual([p.liked_by_me for p in posts], [False, True])
+        self.assertEqual([p.my_reaction for p in posts], ['wow', None])
+
+        content_type = ContentType.objects.get_for_model(Post)
+        self.assertEqual(Like.objects.liked_ids(self.reader, [self.post.id, other.id], content_type), {other.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(Like.objects.liked_ids(AnonymousUser(), posts), set())
+
+    def test_timeline_renders_viewer_state(self):
+        """Test the timeline marks liked posts and shows the viewer's reaction"""
+        other = Post.objects.create(author=self.author, content='Second post')
+        Like.objects.toggle_like(self.author, self.post)
+        Reaction.objects.set_reaction(self.author, other, 'wow')
+        call_command('rebuild_feeds', stdout=StringIO())
+
+        self.client.force_login(self.author)
+        response = self.client.get('/post/')
+        self.assertContains(response, 'like-btn liked', count=1)
+        self.assertContains(response, 'Tu reacción: 😮 Wow', count=1)
+
+    def test_api_resolves_viewer_from_jwt(self):
+        """Test token clients get their liked and reaction state and their friends-only posts"""
+        Like.objects.toggle_like(self.reader, self.post)
+        Reaction.objects.set_reaction(self.reader, self.post, 'wow')
+        Friendship.objects.create(sender=self.author, receiver=self.reader).accept()
+        private = Post.objects.create(author=self.author, content='Friends only', privacy_level='friends')
+        token = self.client.post('/api/token/pair', {
+            'username': 'counter_reader', 'password': 'testpass123'
+        }, content_type='application/json').json()['access']
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+        item = self.client.get(f'/api/posts/{self.post.pk}', **auth).json()
+        self.assertEqual((item['liked_by_me'], item['my_reaction']), (True, 'wow'))
+        ids = [item['id'] for item in self.client.get('/api/posts/', **auth).json()['items']]
+        self.assertIn(private.pk, ids)
+        self.assertNotIn(private.pk, [item['id'] for item in self.client.get('/api/posts/').json()['items']])
+
+        comment = Comment.objects.create(post=self.post, author=self.reader, content='Mine')
+        Like.objects.toggle_like(self.reader, comment)
+        response = self.client.put(
+            f'/api/comments/{comment.pk}', {'content': 'Edited'}, content_type='application/json', **auth
+        )
+        self.assertTrue(response.json()['liked_by_me'])
+        self.assertTrue(self.client.get(f'/api/comments/{comment.pk}', **auth).json()['liked_by_me'])
+
+    def test_recount_counters_repairs_drift(self):
+        """Test recount_counters rebuilds counters from the source rows"""
+        Like.objects.toggle_like(self.reader, self.post)
+        Post.objects.filter(pk=self.post.pk).update(like_count=42, comment_count=7)
+
+        call_command('recount_counters', stdout=StringIO())
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.post.comment_count, 0)
+
+
+class PostCursorPaginationTestCase(TestCase):
+    def setUp(self):
+        """Set up five posts from one author"""
+        self.author = User.objects.create_user(
+            username='cursor_author', email='cursor@example.com', password='testpass123', student_id='K-1'
+        )
+        self.posts = [
+            Post.objects.create(author=self.author, content=f'Cursor post {i}') for i in range(5)
+        ]
+
+    def test_cursor_walks_all_pages(self):
+        """Test following next_cursor returns every post exactly once"""
+        seen = []
+        cursor = ''
+        while cursor is not None:
+            data = self.client.get('/api/posts/', {'size': 2, 'cursor': cursor}).json()
+            self.assertIsNone(data['total'])
+            seen.extend(item['id'] for item in data['items'])
+            cursor = data['next_cursor']
+        self.assertEqual(seen, [p.id for p in reversed(self.posts)])
+
+    def test_cursor_with_total(self):
+        """Test with_total returns a row estimate in cursor mode"""
+        data = self.client.get('/api/posts/', {'size': 2, 'cursor': '', 'with_total': True}).json()
+        self.assertEqual(data['total'], 5)
+
+    def test_invalid_cursor_400(self):
+        """Test a malformed cursor is rejected"""
+        response = self.client.get('/api/posts/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_from_other_ordering_400(self):
+        """Test a cursor replayed with a different ordering is rejected instead of failing in the query"""
+        cursor = self.client.get('/api/posts/', {'size': 2, 'cursor': ''}).json()['next_cursor']
+        for ordering in ('-views_count', 'hot'):
+            response = self.client.get('/api/posts/', {'size': 2, 'cursor': cursor, 'ordering': ordering})
+            self.assertEqual(response.status_code, 400)
+        tampered = encode_cursor(['not', 'a', 'date'], self.posts[0].pk)
+        response = self.client.get('/api/posts/', {'cursor': tampered})
+        self.assertEqual(response.status_code, 400)
+
+
+class PostViewCounterTestCase(TestCase):
+    def setUp(self):
+        """Set up a post and hold off the automatic flush"""
+        cache.clear()
+        cache.set(FLUSH_LOCK_KEY, 1, 60)
+        self.author = User.objects.create_user(
+            username='views_author', email='views@example.com', password='testpass123', student_id='V-1'
+        )
+        self.post = Post.objects.create(author=self.author, content='Viewed post')
+
+    def test_views_are_buffered_until_flush(self):
+        """Test hits accumulate in cache and are written in one update"""
+        with self.assertNumQueries(0):
+            for _ in range(3):
+                self.post.increment_views()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 0)
+
+        call_command('flush_view_counts', stdout=StringIO())
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 3)
+        self.assertEqual(ViewCounter.flush(), 0)
+
+    @override_settings(VIEW_COUNT_DEDUP_WINDOW=60)
+    def test_repeated_views_are_deduplicated(self):
+        """Test the same viewer is counted once within the window"""
+        self.assertTrue(self.post.increment_views(viewer=1))
+        self.assertFalse(self.post.increment_views(viewer=1))
+        self.assertTrue(self.post.increment_views(viewer=2))
+        ViewCounter.flush()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 2)
+
+
+    def test_hits_during_flush_are_flushed_next_time(self):
+        """Test a view counted while a flush is running is marked again and not lost"""
+        for _ in range(3):
+            self.post.increment_views()
+        decr = cache.decr
+
+        def concurrent_decr(key, delta=1, version=None):
+            # Otra vista llega entre la lectura del contador y el descuento
+            Post.objects.get(pk=self.post.pk).increment_views()
+            return decr(key, delta, version)
+
+        with mock.patch.object(cache, 'decr', side_effect=concurrent_decr):
+            self.assertEqual(ViewCounter.flush(), 3)
+        self.assertEqual(ViewCounter.pending(self.post), 1)
+        self.assertEqual(ViewCounter.flush(), 1)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 4)
+
+    def test_index_waits_once_for_unwritten_entries(self):
+        """Test a reserved index slot without an entry blocks one flush, then is skipped"""
+        cache.add(INDEX_SEQ_KEY, 0, None)
+        cache.incr(INDEX_SEQ_KEY)
+        self.post.increment_views()
+        self.assertEqual(ViewCounter.flush(), 0)
+        self.assertEqual(ViewCounter.flush(), 1)
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 1)
+
+    @override_settings(VIEW_COUNT_BUFFERED=False)
+    def test_unbuffered_views_are_written_directly(self):
+        """Test caches without atomic counters fall back to one update per view"""
+        self.post.increment_views()
+        self.post.increment_views()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).views_count, 2)
+        self.assertEqual(ViewCounter.pending(self.post), 0)
+
+
+class PostVisibilityTestCase(TestCase):
+    def setUp(self):
+        """Set up an author, a friend, a group member and a stranger"""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='vis_author', email='va@example.com', password='testpass123', student_id='P-1'
+        )
+        self.friend = User.objects.create_user(
+            username='vis_friend', email='vf@example.com', password='testpass123', student_id='P-2'
+        )
+        self.member = User.objects.create_user(
+            username='vis_member', email='vm@example.com', password='testpass123', student_id='P-3'
+        )
+        self.stranger = User.objects.create_user(
+            username='vis_stranger', email='vs@example.com', password='testpass123', student_id='P-4'
+        )
+        Friendship.objects.create(sender=self.author, receiver=self.friend).accept()
+        group = Group.objects.create(name='Study group', description='Group', creator=self.author)
+        GroupMembership.objects.create(group=group, user=self.member, status='active')
+
+        self.public = Post.objects.create(author=self.author, content='Public')
+        self.friends_only = Post.objects.create(author=self.author, content='Friends', privacy_level='friends')
+        self.group_only = Post.objects.create(author=self.author, content='Group', privacy_level='group', group=group)
+        self.private = Post.objects.create(author=self.author, content='Private', privacy_level='private')
+
+    def visible(self, user):
+        return set(Post.objects.visible_to(user).values_list('content', flat=True))
+
+    def test_visible_to_matches_can_view(self):
+        """Test the queryset filter agrees with Post.can_view for every user"""
+        for user in [self.author, self.friend, self.member, self.stranger]:
+            expected = {p.content for p in Post.objects.all() if p.can_view(user)}
+            self.assertEqual(self.visible(user), expected, user.username)
+
+        self.assertEqual(self.visible(self.friend), {'Public', 'Friends'})
+        self.assertEqual(self.visible(self.member), {'Public', 'Group'})
+        self.assertEqual(self.visible(self.stranger), {'Public'})
+
+    def test_blocks_hide_posts_both_ways(self):
+        """Test a block hides the author's posts from the blocked user and vice versa"""
+        Block.objects.create(blocker=self.author, blocked=self.stranger)
+        self.assertEqual(self.visible(self.stranger), set())
+        self.assertFalse(self.public.can_view(self.stranger))
+
+
+class PostHotScoreTestCase(TestCase):
+    def setUp(self):
+        """Set up two posts and a reader"""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='testpass123', student_id='H-1'
+        )
+        self.reader = User.objects.create_user(
+            username='reader', email='reader@example.com', password='testpass123', student_id='H-2'
+        )
+        self.quiet = Post.objects.create(author=self.author, content='Quiet post')
+        self.busy = Post.objects.create(author=self.author, content='Busy post')
+        HotScoreService.update_scores(full=True)
+
+    def test_new_posts_get_an_initial_score(self):
+        """Test a new post starts with a time-based score"""
+        self.assertGreater(self.busy.hot_score, 0)
+
+    def test_only_active_posts_are_rescored(self):
+        """Test an incremental run touches only posts with new activity"""
+        Post.objects.filter(pk=self.quiet.pk).update(last_activity_at=timezone.now() - timedelta(days=1))
+        Like.objects.toggle_like(self.reader, self.busy)
+        Comment.objects.create(post=self.busy, author=self.reader, content='Nice')
+
+        self.assertEqual(HotScoreService.update_scores(), 1)
+        self.busy.refresh_from_db()
+        self.quiet.refresh_from_db()
+        self.assertGreater(self.busy.hot_score, self.quiet.hot_score)
+        self.assertEqual(HotScoreService.get_hot(self.reader, limit=2), [self.busy, self.quiet])
+
+        response = self.client.get('/api/posts/?ordering=hot&cursor=')
+        self.assertEqual([item['id'] for item in response.json()['items']], [self.busy.id, self.quiet.id])
+
+    def test_timeline_renders_trending_posts(self):
+        """Test the timeline page shows the trending section"""
+        self.client.force_login(self.reader)
+        response = self.client.get('/post/')
+        self.assertTemplateUsed(response, 'post/timeline.html')
+        self.assertContains(response, 'En tendencia')
+        self.assertContains(response, 'class="trending-item"', count=2)
@@ -8,7 +8,12 @@ from django.views.generic import ListView, CreateView, DetailView, UpdateView, D
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from apps.post.models import Post
 from apps.post.forms import PostForm
+from apps.like.models import Like
+from apps.reaction.models import Reaction
+from apps.main.services.block_service import BlockService
 from apps.main.services.gamification_service import GamificationService
+from apps.main.services.feed_service import FeedService
+from apps.main.services.hot_service import HotScoreService
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,7 +24,9 @@ def is_ajax(request):
 
 
 def get_comments_data(post, current_user):
-    comments = post.comments.select_related('author').order_by('-created_at')
+    comments = BlockService.exclude_blocked(
+        post.comments.select_related('author').order_by('-created_at'), current_user
+    )
     comments_data = []
     for comment in comments:
         comments_data.append({
@@ -43,12 +50,20 @@ class TimelineView(LoginRequiredMixin, ListView):
     login_url = 'user:login'
 
     def get_queryset(self):
-        return Post.objects.select_related('author').filter(is_hidden=False).order_by('-created_at')[:50]
+        posts = FeedService.get_feed(self.request.user, limit=50)
+        # Estado de like/reacción del usuario para toda la página en dos consultas
+        Like.objects.prefetch_liked_by(self.request.user, posts)
+        Reaction.objects.prefetch_user_reactions(self.request.user, posts)
+        labels = dict(Reaction.REACTION_TYPES)
+        for post in posts:
+            post.my_reaction_label = labels.get(post.my_reaction, '')
+        return posts
 
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx['titulo'] = 'Timeline - Red Social'
         ctx['is_authenticated'] = self.request.user.is_authenticated
+        ctx['trending_posts'] = HotScoreService.get_hot(self.request.user, limit=5)
         return ctx
 
 
@@ -66,15 +81,15 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         p = form.save()
 
         try:
-            gamification_result = GamificationService.award_points(
+            gamification_result = GamificationService.enqueue_event(
                 user=self.request.user,
-                source='post',
+                topic='post_created',
+                object_id=p.id,
                 description=f'Post creado: "{p.content[:50]}..."'
             )
-            achievements_result = GamificationService.check_achievements(self.request.user)
         except Exception:
             gamification_result = {}
-            achievements_result = []
+        achievements_result = []
 
         if is_ajax(self.request):
             return JsonResponse({
@@ -110,8 +125,10 @@ class PostDetailView(LoginRequiredMixin, DetailView):
         if not self.object.can_view(request.user):
             return render(request, 'errors/403.html', status=403)
 
-        self.object.increment_views()
-        comments = self.object.comments.select_related('author').order_by('-created_at')
+        self.object.increment_views(viewer=request.user.pk)
+        comments = BlockService.exclude_blocked(
+            self.object.comments.select_related('author').order_by('-created_at'), request.user
+        )
         context = {
             'post': self.object,
             'comments': comments,
@@ -135,9 +152,10 @@ class PostDetailView(LoginRequiredMixin, DetailView):
             )
 
             try:
-                gamification_result = GamificationService.award_points(
+                gamification_result = GamificationService.enqueue_event(
                     user=request.user,
-                    source='comment',
+                    topic='comment_created',
+                    object_id=comment.id,
                     description=f'Comment created in post by {self.object.author.username}'
                 )
             except Exception:
@@ -241,61 +259,30 @@ class ToggleLikeView(LoginRequiredMixin, View):
                     'error': 'No tienes permiso para dar like a este post'
                 }, status=403)
 
-            from apps.like.models import Like
-            from django.contrib.contenttypes.models import ContentType
-
             try:
-                content_type = ContentType.objects.get_for_model(Post)
-                if content_type is None:
-                    raise ValueError("ContentType para Post no pudo ser determinado")
-
-                like, created = Like.objects.get_or_create(
-                    user=request.user,
-                    content_type=content_type,
-                    object_id=post.id
-                )
-            except ContentType.DoesNotExist as e:
-                logger.error(f"ContentType para Post no existe: {e}", exc_info=True)
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Error del sistema: tipo de contenido no encontrado'
-                }, status=500)
-            except ValueError as e:
-                logger.error(f"No se pudo obtener ContentType: {e}", exc_info=True)
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Error del sistema: no se pudo obtener el tipo de contenido'
-                }, status=500)
+                like, created = Like.objects.toggle_like(request.user, post)
             except Exception as e:
-                logger.error(f"Error al crear/obtener like: {e}", exc_info=True)
+                logger.error(f"Error al alternar like: {e}", exc_info=True)
                 return JsonResponse({
                     'success': False,
                     'error': f'Error al procesar like: {str(e)}'
                 }, status=500)
 
-            # Contar likes de forma segura
-            try:
-                like_count = Like.objects.filter(
-                    content_type=content_type,
-                    object_id=post.id
-                ).count()
-            except Exception as e:
-                logger.error(f"Error contando likes: {e}", exc_info=True)
-                like_count = 0
+            like_count = post.like_count
 
             if created:
                 try:
-                    gamification_result = GamificationService.award_points(
+                    gamification_result = GamificationService.enqueue_event(
                         user=post.author,
-                        source='like_received',
+                        topic='like_received',
+                        # Por usuario y post, no por Like: sacar y volver a dar like no suma puntos
+                        object_id=f'{post.pk}:{request.user.pk}',
                         description=f'{request.user.username} te dio like en un post'
                     )
-
-                    achievements_result = GamificationService.check_achievements(post.author)
                 except Exception as e:
                     logger.error(f"Error en gamification: {e}", exc_info=True)
                     gamification_result = {'points': 0}
-                    achievements_result = []
+                achievements_result = []
 
                 return JsonResponse({
                     'success': True,
@@ -307,15 +294,6 @@ class ToggleLikeView(LoginRequiredMixin, View):
                     }
                 })
             else:
-                try:
-                    like.delete()
-                except Exception as e:
-                    logger.error(f"Error eliminando like: {e}", exc_info=True)
-                    return JsonResponse({
-                        'success': False,
-                        'error': f'Error al eliminar like: {str(e)}'
-                    }, status=500)
-
                 return JsonResponse({
                     'success': True,
                     'liked': False,
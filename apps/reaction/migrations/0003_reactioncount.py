@@ -0,0 +1,48 @@
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_reaction_counts(apps, schema_editor):
+    Reaction = apps.get_model('reaction', 'Reaction')
+    ReactionCount = apps.get_model('reaction', 'ReactionCount')
+    totals = Reaction.objects.order_by().values(
+        'content_type_id', 'object_id', 'reaction_type'
+    ).annotate(total=Count('id'))
+    ReactionCount.objects.bulk_create(
+        (ReactionCount(
+            content_type_id=row['content_type_id'],
+            object_id=row['object_id'],
+            reaction_type=row['reaction_type'],
+            count=row['total'],
+        ) for row in totals.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('reaction', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReactionCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Object ID')),
+                ('reaction_type', models.CharField(choices=[('like', '👍 Like'), ('love', '❤️ Love'), ('laugh', '😂 Laugh'), ('wow', '😮 Wow'), ('sad', '😢 Sad'), ('angry', '😠 Angry'), ('celebrate', '🎉 Celebrate'), ('support', '💪 Support')], max_length=15, verbose_name='Reaction type')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Count')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='Content type')),
+            ],
+            options={
+                'verbose_name': 'Reaction Count',
+                'verbose_name_plural': 'Reaction Counts',
+                'unique_together': {('content_type', 'object_id', 'reaction_type')},
+            },
+        ),
+        migrations.RunPython(backfill_reaction_counts, migrations.RunPython.noop),
+    ]
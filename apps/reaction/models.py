@@ -1,8 +1,150 @@
-from django.db import models
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
 from django.contrib.contenttypes.models import ContentType
+from apps.main import content_types
 from django.contrib.contenttypes.fields import GenericForeignKey
 
 
+class ReactionManager(models.Manager):
+    """Custom manager for Reaction model with utility methods"""
+    
+    def get_reactions_for_object(self, obj):
+        """Get all reactions for a specific object"""
+        content_type = content_types.get_for_model(obj)
+        return self.filter(
+            content_type=content_type,
+            object_id=obj.pk
+        )
+    
+    def get_reaction_counts_for_object(self, obj):
+        """Get reaction counts grouped by type for a specific object"""
+        return self.get_reaction_counts_for_objects([obj])[obj.pk]
+    
+    def get_reaction_counts_for_objects(self, objects):
+        """
+        Get reaction counts for many objects of the same model in one query,
+        as {object_id: {reaction_type: count}}. Reads the denormalized
+        ReactionCount rows unless REACTION_COUNTS_DENORMALIZED is off, in
+        which case it runs a single GROUP BY over the reactions.
+        """
+        if getattr(settings, 'REACTION_COUNTS_DENORMALIZED', True):
+            return ReactionCount.objects.get_counts_for_objects(objects)
+        
+        objects = list(objects)
+        if not objects:
+            return {}
+        content_type = content_types.get_for_model(objects[0])
+        counts = {obj.pk: {} for obj in objects}
+        rows = self.filter(
+            content_type=content_type,
+            object_id__in=list(counts)
+        ).order_by().values_list('object_id', 'reaction_type').annotate(n=Count('id'))
+        for object_id, reaction_type, n in rows:
+            counts[object_id][reaction_type] = n
+        return counts
+    
+    def prefetch_reaction_counts(self, objects):
+        """Attach reaction counts to each object so get_reaction_counts needs no query"""
+        objects = list(objects)
+        counts = self.get_reaction_counts_for_objects(objects)
+        for obj in objects:
+            obj._reaction_counts = counts[obj.pk]
+        return objects
+    
+    def get_total_reactions_for_object(self, obj):
+        """Get total reaction count for a specific object"""
+        return self.get_reactions_for_object(obj).count()
+    
+    def user_reaction_for_object(self, user, obj):
+        """Get user's reaction for a specific object"""
+        if not user.is_authenticated:
+            return None
+        content_type = content_types.get_for_model(obj)
+        try:
+            return self.get(
+                user=user,
+                content_type=content_type,
+                object_id=obj.pk
+            )
+        except self.model.DoesNotExist:
+            return None
+    
+    def user_reactions(self, user, objects, content_type=None):
+        """
+        User's reaction type for each of the given objects, in one query,
+        as {object_id: reaction_type}. Accepts model instances, or IDs plus
+        their content type.
+        """
+        objects = list(objects)
+        if not objects or user is None or not user.is_authenticated:
+            return {}
+        if content_type is None:
+            content_type = content_types.get_for_model(objects[0])
+        ids = [getattr(obj, 'pk', obj) for obj in objects]
+        return dict(self.filter(
+            user=user,
+            content_type=content_type,
+            object_id__in=ids
+        ).order_by().values_list('object_id', 'reaction_type'))
+    
+    def prefetch_user_reactions(self, user, objects):
+        """Set obj.my_reaction on each object with a single query"""
+        objects = list(objects)
+        reactions = self.user_reactions(user, objects)
+        for obj in objects:
+            obj.my_reaction = reactions.get(obj.pk)
+        return objects
+    
+    @transaction.atomic
+    def set_reaction(self, user, obj, reaction_type):
+        """Set or update user's reaction for an object"""
+        from apps.main.services.counter_service import CounterService
+        content_type = content_types.get_for_model(obj)
+        reaction = self.select_for_update().filter(
+            user=user,
+            content_type=content_type,
+            object_id=obj.pk
+        ).first()
+        
+        if reaction is None:
+            reaction = self.create(
+                user=user,
+                content_type=content_type,
+                object_id=obj.pk,
+                reaction_type=reaction_type
+            )
+            ReactionCount.objects.bump(content_type, obj.pk, reaction_type, 1)
+            CounterService.increment(obj, 'reaction_count', 1)
+            return reaction, True
+        
+        if reaction.reaction_type != reaction_type:
+            ReactionCount.objects.bump(content_type, obj.pk, reaction.reaction_type, -1)
+            ReactionCount.objects.bump(content_type, obj.pk, reaction_type, 1)
+            reaction.reaction_type = reaction_type
+            reaction.save(update_fields=['reaction_type', 'updated_at'])
+        return reaction, False
+    
+    @transaction.atomic
+    def remove_reaction(self, user, obj):
+        """Remove user's reaction from an object"""
+        from apps.main.services.counter_service import CounterService
+        content_type = content_types.get_for_model(obj)
+        reaction = self.select_for_update().filter(
+            user=user,
+            content_type=content_type,
+            object_id=obj.pk
+        ).first()
+        if reaction is None:
+            return False
+        
+        reaction.delete()
+        ReactionCount.objects.bump(content_type, obj.pk, reaction.reaction_type, -1)
+        CounterService.increment(obj, 'reaction_count', -1)
+        return True
+
+
 class Reaction(models.Model):
     """
     Generic reaction model for expressing different emotions
@@ -48,6 +190,8 @@ class Reaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ReactionManager()
+    
     class Meta:
         verbose_name = "Reaction"
         verbose_name_plural = "Reactions"
@@ -77,64 +221,83 @@ class Reaction(models.Model):
         return emoji_map.get(self.reaction_type, '👍')
 
 
-class ReactionManager(models.Manager):
-    """Custom manager for Reaction model with utility methods"""
+class ReactionCountManager(models.Manager):
+    """Manager for the denormalized per-object reaction counters"""
     
-    def get_reactions_for_object(self, obj):
-        """Get all reactions for a specific object"""
-        content_type = ContentType.objects.get_for_model(obj)
-        return self.filter(
+    def bump(self, content_type, object_id, reaction_type, delta):
+        """Atomically add delta to the counter of one reaction type"""
+        counters = self.filter(
             content_type=content_type,
-            object_id=obj.pk
+            object_id=object_id,
+            reaction_type=reaction_type
         )
+        updated = counters.update(count=Greatest(F('count') + delta, 0))
+        if not updated and delta > 0:
+            try:
+                with transaction.atomic():
+                    self.create(
+                        content_type=content_type,
+                        object_id=object_id,
+                        reaction_type=reaction_type,
+                        count=delta
+                    )
+            except IntegrityError:
+                counters.update(count=F('count') + delta)
     
-    def get_reaction_counts_for_object(self, obj):
+    def get_counts_for_object(self, obj):
         """Get reaction counts grouped by type for a specific object"""
-        reactions = self.get_reactions_for_object(obj)
-        counts = {}
-        for reaction in reactions:
-            reaction_type = reaction.reaction_type
-            counts[reaction_type] = counts.get(reaction_type, 0) + 1
+        return self.get_counts_for_objects([obj])[obj.pk]
+    
+    def get_counts_for_objects(self, objects):
+        """Get reaction counts for many objects of the same model as {object_id: {type: count}}"""
+        objects = list(objects)
+        if not objects:
+            return {}
+        content_type = content_types.get_for_model(objects[0])
+        counts = {obj.pk: {} for obj in objects}
+        rows = self.filter(
+            content_type=content_type,
+            object_id__in=list(counts),
+            count__gt=0
+        ).values_list('object_id', 'reaction_type', 'count')
+        for object_id, reaction_type, count in rows:
+            counts[object_id][reaction_type] = count
         return counts
+
+
+class ReactionCount(models.Model):
+    """
+    Denormalized reaction totals per object and reaction type,
+    maintained by ReactionManager.set_reaction/remove_reaction
+    """
     
-    def get_total_reactions_for_object(self, obj):
-        """Get total reaction count for a specific object"""
-        return self.get_reactions_for_object(obj).count()
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name="Content type"
+    )
     
-    def user_reaction_for_object(self, user, obj):
-        """Get user's reaction for a specific object"""
-        if not user.is_authenticated:
-            return None
-        content_type = ContentType.objects.get_for_model(obj)
-        try:
-            return self.get(
-                user=user,
-                content_type=content_type,
-                object_id=obj.pk
-            )
-        except self.model.DoesNotExist:
-            return None
+    object_id = models.PositiveIntegerField(
+        verbose_name="Object ID"
+    )
     
-    def set_reaction(self, user, obj, reaction_type):
-        """Set or update user's reaction for an object"""
-        content_type = ContentType.objects.get_for_model(obj)
-        reaction, created = self.update_or_create(
-            user=user,
-            content_type=content_type,
-            object_id=obj.pk,
-            defaults={'reaction_type': reaction_type}
-        )
-        return reaction, created
+    reaction_type = models.CharField(
+        max_length=15,
+        choices=Reaction.REACTION_TYPES,
+        verbose_name="Reaction type"
+    )
     
-    def remove_reaction(self, user, obj):
-        """Remove user's reaction from an object"""
-        content_type = ContentType.objects.get_for_model(obj)
-        deleted, _ = self.filter(
-            user=user,
-            content_type=content_type,
-            object_id=obj.pk
-        ).delete()
-        return deleted > 0
-
-
-Reaction.objects = ReactionManager()
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Count"
+    )
+    
+    objects = ReactionCountManager()
+    
+    class Meta:
+        verbose_name = "Reaction Count"
+        verbose_name_plural = "Reaction Counts"
+        unique_together = ['content_type', 'object_id', 'reaction_type']
+        
+    def __str__(self):
+        return f"{self.content_type_id}:{self.object_id} {self.reaction_type}={self.count}"
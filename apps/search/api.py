@@ -0,0 +1,28 @@
+from ninja import Router, Schema
+from typing import List
+
+from apps.main.auth import optional_auth
+from apps.main.services.search_service import SOURCES, SearchService
+
+router = Router()
+
+
+class SearchHit(Schema):
+    type: str
+    id: int
+    title: str
+    snippet: str
+    score: float
+
+
+class SearchOut(Schema):
+    query: str
+    items: List[SearchHit]
+
+
+@router.get("/", auth=optional_auth, response=SearchOut)
+def search(request, q: str, type: str | None = None, limit: int = 20):
+    limit = max(1, min(limit, 50))
+    kinds = [kind for kind in (type or '').split(',') if kind in SOURCES] or None
+    items = SearchService.search(q, request.user, kinds=kinds, limit=limit)
+    return SearchOut(query=q, items=[SearchHit(**item) for item in items])
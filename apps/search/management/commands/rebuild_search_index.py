@@ -0,0 +1,35 @@
+"""
+Comando para reconstruir el índice de búsqueda a partir del contenido existente.
+
+Uso: python manage.py rebuild_search_index --kind post --missing
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from apps.search.models import SearchDocument
+from apps.main.services.search_service import SOURCES, SearchService
+
+
+class Command(BaseCommand):
+    help = 'Indexa posts, apuntes, grupos y usuarios para la búsqueda'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', choices=list(SOURCES), help='Indexar solo este tipo')
+        parser.add_argument('--missing', action='store_true', help='Indexar solo objetos sin documento')
+
+    def handle(self, *args, **options):
+        kinds = [options['kind']] if options['kind'] else list(SOURCES)
+
+        indexed = 0
+        for kind in kinds:
+            source = SOURCES[kind]
+            qs = apps.get_model(source['model']).objects.filter(**source['indexed'])
+            if options['missing']:
+                qs = qs.exclude(pk__in=SearchDocument.objects.filter(kind=kind).values('object_id'))
+            for instance in qs.iterator(chunk_size=500):
+                if SearchService.index(instance) is not None:
+                    indexed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Documentos indexados: {indexed}')
+        )
@@ -0,0 +1,82 @@
+from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable projection of a post, note, group or user.
+    On PostgreSQL the text is matched through `vector` (GIN index);
+    elsewhere through the SearchTerm inverted index.
+    """
+
+    KINDS = [
+        ('post', 'Post'),
+        ('note', 'Note'),
+        ('group', 'Group'),
+        ('user', 'User'),
+    ]
+
+    kind = models.CharField(
+        max_length=10,
+        choices=KINDS,
+        verbose_name="Kind"
+    )
+
+    object_id = models.PositiveIntegerField(
+        verbose_name="Object ID"
+    )
+
+    title = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Title"
+    )
+
+    body = models.TextField(
+        blank=True,
+        verbose_name="Body"
+    )
+
+    vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        unique_together = ['kind', 'object_id']
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.title[:50]}"
+
+
+class SearchTerm(models.Model):
+    """Inverted index row: one normalized term found in one document"""
+
+    term = models.CharField(
+        max_length=64,
+        verbose_name="Term"
+    )
+
+    document = models.ForeignKey(
+        SearchDocument,
+        on_delete=models.CASCADE,
+        related_name='terms',
+        verbose_name="Document"
+    )
+
+    weight = models.PositiveSmallIntegerField(
+        default=1,
+        verbose_name="Weight"
+    )
+
+    class Meta:
+        verbose_name = "Search Term"
+        verbose_name_plural = "Search Terms"
+        unique_together = ['term', 'document']
+
+    def __str__(self):
+        return f"{self.term} -> {self.document_id} ({self.weight})"
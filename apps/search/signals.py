@@ -0,0 +1,35 @@
+"""
+Signals that keep the search index in sync with posts, notes, groups
+and users.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from apps.group.models import Group
+from apps.note.models import Note
+from apps.post.models import Post
+from apps.user.models import User
+from apps.main.services.search_service import SearchService
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Note)
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=User)
+def index_document(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Reindexes the saved object when one of its searchable fields may have changed."""
+    if raw:
+        return
+    kind = SearchService.kind_for(instance)
+    if update_fields and not SearchService.indexed_fields(kind) & set(update_fields):
+        return
+    SearchService.index(instance)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=User)
+def remove_document(sender, instance, **kwargs):
+    """Drops the deleted object from the index."""
+    SearchService.remove(instance)
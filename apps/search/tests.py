@@ -0,0 +1,111 @@
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from apps.friendship.models import Block
+from apps.note.models import Note
+from apps.post.models import Post
+from apps.search.models import SearchDocument, SearchTerm
+from apps.subject.models import Subject
+from apps.main.services.search_service import SearchService, tokenize
+
+User = get_user_model()
+
+
+class SearchServiceTestCase(TestCase):
+    def setUp(self):
+        """Set up two users with a few posts"""
+        cache.clear()
+        self.alice = User.objects.create_user(
+            username='alice', email='alice@example.com', password='testpass123', student_id='S-1'
+        )
+        self.bob = User.objects.create_user(
+            username='bob', email='bob@example.com', password='testpass123', student_id='S-2'
+        )
+        self.django_post = Post.objects.create(author=self.bob, content='Aprendiendo Django y Python')
+        self.tagged_post = Post.objects.create(author=self.bob, content='Apuntes de Python', tags='django')
+        self.other_post = Post.objects.create(author=self.bob, content='Algoritmos de ordenamiento')
+
+    def test_tokenize_normalizes_text(self):
+        """Test tokens are lowercased, without accents or punctuation"""
+        self.assertEqual(tokenize('¡Árboles, GRAFOS y C!'), ['arboles', 'grafos'])
+
+    def test_index_follows_saves_and_deletes(self):
+        """Test documents are updated on save and removed on delete or hide"""
+        self.assertTrue(SearchDocument.objects.filter(kind='post', object_id=self.other_post.id).exists())
+        self.other_post.content = 'Grafos dirigidos'
+        self.other_post.save()
+        self.assertTrue(SearchTerm.objects.filter(term='grafos', document__object_id=self.other_post.id).exists())
+        self.assertFalse(SearchTerm.objects.filter(term='algoritmos').exists())
+
+        self.other_post.is_hidden = True
+        self.other_post.save()
+        self.assertFalse(SearchDocument.objects.filter(kind='post', object_id=self.other_post.id).exists())
+        self.django_post.delete()
+        self.assertFalse(SearchDocument.objects.filter(kind='post', object_id=self.django_post.id).exists())
+
+    def test_search_requires_all_terms_and_ranks_title_first(self):
+        """Test every term must match and tag matches outrank body matches"""
+        results = SearchService.search('python django', self.alice, kinds=['post'])
+        self.assertEqual([hit['id'] for hit in results], [self.tagged_post.id, self.django_post.id])
+        self.assertEqual(SearchService.search('python grafos', self.alice), [])
+
+    def test_partial_words_match_as_prefixes(self):
+        """Test partial words find longer terms and exact words rank first"""
+        results = SearchService.search('ali', self.bob, kinds=['user'])
+        self.assertEqual([hit['id'] for hit in results], [self.alice.id])
+        self.assertEqual(list(SearchService.filter(Post.objects.all(), 'post', 'algo orden')), [self.other_post])
+
+        exact = Post.objects.create(author=self.bob, content='Pyth')
+        results = SearchService.search('pyth', self.alice, kinds=['post'])
+        self.assertEqual(results[0]['id'], exact.id)
+        self.assertEqual(len(results), 3)
+
+        response = self.client.get('/api/users/?search=ali')
+        self.assertEqual([item['username'] for item in response.json()['items']], ['alice'])
+
+    def test_document_count_is_cached(self):
+        """Test repeated searches do not count the whole index again"""
+        SearchService.search('python', self.alice)
+        with self.assertNumQueries(4):
+            SearchService.search('python', self.alice)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Query plan of the SQLite fallback')
+    def test_prefix_lookups_use_the_term_index(self):
+        """Test every SearchTerm lookup of a prefix search is an index search, not a scan"""
+        with CaptureQueriesContext(connection) as queries:
+            SearchService.search('pyth', self.alice, kinds=['post'])
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if 'search_searchterm' in query['sql']:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                    plans += [row[-1] for row in cursor.fetchall() if 'search_searchterm' in row[-1]]
+        self.assertTrue(plans)
+        self.assertFalse([plan for plan in plans if plan.startswith('SCAN')], plans)
+
+    def test_filter_applies_to_querysets(self):
+        """Test list endpoints can filter through the index"""
+        qs = SearchService.filter(Post.objects.all(), 'post', 'ALGORITMOS')
+        self.assertEqual(list(qs), [self.other_post])
+
+    def test_search_respects_privacy_and_blocks(self):
+        """Test private notes and blocked authors are not returned"""
+        subject = Subject.objects.create(name='Programación', code='PRG-1', semester=1, credits=4)
+        Note.objects.create(author=self.bob, subject=subject, title='Django privado', content='x', privacy_level='private')
+        public_note = Note.objects.create(author=self.bob, subject=subject, title='Django público', content='x')
+        results = SearchService.search('django', self.alice, kinds=['note'])
+        self.assertEqual([hit['id'] for hit in results], [public_note.id])
+
+        Block.objects.create(blocker=self.alice, blocked=self.bob)
+        self.assertEqual(SearchService.search('django', self.alice), [])
+
+    def test_search_endpoint(self):
+        """Test the unified endpoint returns typed hits"""
+        response = self.client.get('/api/search/?q=bob&type=user')
+        self.assertEqual(response.status_code, 200)
+        items = response.json()['items']
+        self.assertEqual([(item['type'], item['id']) for item in items], [('user', self.bob.id)])
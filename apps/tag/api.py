@@ -0,0 +1,20 @@
+from ninja import Router, Schema
+from typing import List
+
+from apps.main.services.tag_service import TagService
+
+router = Router()
+
+
+class TrendingTagOut(Schema):
+    name: str
+    slug: str
+    count: int
+
+
+@router.get("/trending", response=List[TrendingTagOut])
+def trending_tags(request, hours: int | None = None, limit: int = 10):
+    limit = max(1, min(limit, 50))
+    if hours is not None:
+        hours = max(1, min(hours, 24 * 30))
+    return [TrendingTagOut(**tag) for tag in TagService.get_trending(hours, limit)]
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class TagConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.tag'
+
+    def ready(self):
+        import apps.tag.signals  # noqa: F401
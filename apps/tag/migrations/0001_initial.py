@@ -0,0 +1,93 @@
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def _parse(text):
+    tags = {}
+    for raw in (text or '').split(','):
+        name = ' '.join(raw.split()).lower()[:50]
+        slug = slugify(name)[:50]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+def backfill_tags(apps, schema_editor):
+    Tag = apps.get_model('tag', 'Tag')
+    sources = [
+        (apps.get_model('post', 'Post'), apps.get_model('tag', 'PostTag'), 'post_id'),
+        (apps.get_model('note', 'Note'), apps.get_model('tag', 'NoteTag'), 'note_id'),
+    ]
+    tag_ids = {}
+    for model, link_model, field in sources:
+        links = []
+        rows = model.objects.exclude(tags='').values_list('id', 'tags', 'created_at')
+        for object_id, text, created_at in rows.iterator(chunk_size=2000):
+            for slug, name in _parse(text).items():
+                if slug not in tag_ids:
+                    tag_ids[slug] = Tag.objects.get_or_create(slug=slug, defaults={'name': name})[0].id
+                links.append(link_model(**{field: object_id, 'tag_id': tag_ids[slug], 'created_at': created_at}))
+            if len(links) >= 2000:
+                link_model.objects.bulk_create(links, ignore_conflicts=True)
+                links = []
+        link_model.objects.bulk_create(links, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('note', '0003_note_note_note_is_acti_506a67_idx'),
+        ('post', '0004_post_post_post_is_hidd_e3209d_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, verbose_name='Name')),
+                ('slug', models.SlugField(unique=True, verbose_name='Slug')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(verbose_name='Post created at')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='post.post', verbose_name='Post')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='post_links', to='tag.tag', verbose_name='Tag')),
+            ],
+            options={
+                'verbose_name': 'Post Tag',
+                'verbose_name_plural': 'Post Tags',
+                'indexes': [models.Index(fields=['tag', '-created_at'], name='tag_posttag_tag_id_709cd3_idx'), models.Index(fields=['created_at', 'tag'], name='tag_posttag_created_873241_idx')],
+                'unique_together': {('post', 'tag')},
+            },
+        ),
+        migrations.CreateModel(
+            name='NoteTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(verbose_name='Note created at')),
+                ('note', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='note.note', verbose_name='Note')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='note_links', to='tag.tag', verbose_name='Tag')),
+            ],
+            options={
+                'verbose_name': 'Note Tag',
+                'verbose_name_plural': 'Note Tags',
+                'indexes': [models.Index(fields=['tag', '-created_at'], name='tag_notetag_tag_id_55305e_idx'), models.Index(fields=['created_at', 'tag'], name='tag_notetag_created_59c085_idx')],
+                'unique_together': {('note', 'tag')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,94 @@
+from django.db import models
+
+
+class Tag(models.Model):
+    """Normalized tag shared by posts and notes"""
+
+    name = models.CharField(
+        max_length=50,
+        verbose_name="Name"
+    )
+
+    slug = models.SlugField(
+        max_length=50,
+        unique=True,
+        verbose_name="Slug"
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Tag"
+        verbose_name_plural = "Tags"
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class PostTag(models.Model):
+    """Index row linking a post to one of its tags"""
+
+    post = models.ForeignKey(
+        'post.Post',
+        on_delete=models.CASCADE,
+        related_name='tag_links',
+        verbose_name="Post"
+    )
+
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='post_links',
+        verbose_name="Tag"
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Post created at"
+    )
+
+    class Meta:
+        verbose_name = "Post Tag"
+        verbose_name_plural = "Post Tags"
+        unique_together = ['post', 'tag']
+        indexes = [
+            models.Index(fields=['tag', '-created_at']),
+            models.Index(fields=['created_at', 'tag']),
+        ]
+
+    def __str__(self):
+        return f"post {self.post_id} #{self.tag_id}"
+
+
+class NoteTag(models.Model):
+    """Index row linking a note to one of its tags"""
+
+    note = models.ForeignKey(
+        'note.Note',
+        on_delete=models.CASCADE,
+        related_name='tag_links',
+        verbose_name="Note"
+    )
+
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='note_links',
+        verbose_name="Tag"
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name="Note created at"
+    )
+
+    class Meta:
+        verbose_name = "Note Tag"
+        verbose_name_plural = "Note Tags"
+        unique_together = ['note', 'tag']
+        indexes = [
+            models.Index(fields=['tag', '-created_at']),
+            models.Index(fields=['created_at', 'tag']),
+        ]
+
+    def __str__(self):
+        return f"note {self.note_id} #{self.tag_id}"
@@ -0,0 +1,19 @@
+"""
+Signals that keep the tag index in sync with the comma-separated tags of
+posts and notes.
+"""
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from apps.note.models import Note
+from apps.post.models import Post
+from apps.main.services.tag_service import TagService
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Note)
+def sync_tags(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Rewrites the tag links when the tags field may have changed."""
+    if raw or (update_fields and 'tags' not in update_fields):
+        return
+    TagService.sync(instance, 'post' if sender is Post else 'note')
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.post.models import Post
+from apps.tag.models import PostTag, Tag
+from apps.main.services.tag_service import TagService, parse_tags
+
+User = get_user_model()
+
+
+class TagServiceTestCase(TestCase):
+    def setUp(self):
+        """Set up an author"""
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='testpass123', student_id='T-1'
+        )
+
+    def test_parse_tags_normalizes(self):
+        """Test tags are trimmed, lowercased and deduplicated"""
+        self.assertEqual(parse_tags(' Django ,python,  DJANGO,, Base  de Datos'), {
+            'django': 'django',
+            'python': 'python',
+            'base-de-datos': 'base de datos',
+        })
+
+    def test_links_follow_tags_field(self):
+        """Test saving a post rewrites its tag links"""
+        post = Post.objects.create(author=self.author, content='Hola', tags='django, python')
+        self.assertEqual(set(post.tag_links.values_list('tag__slug', flat=True)), {'django', 'python'})
+        post.tags = 'python, sql'
+        post.save()
+        self.assertEqual(set(post.tag_links.values_list('tag__slug', flat=True)), {'python', 'sql'})
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_filter_has_no_false_positives(self):
+        """Test filtering by tag does not match tags that only contain the text"""
+        tagged = Post.objects.create(author=self.author, content='A', tags='java')
+        Post.objects.create(author=self.author, content='B', tags='javascript')
+        self.assertEqual(list(TagService.filter(Post.objects.all(), 'Java')), [tagged])
+
+    def test_trending_uses_window_and_privacy(self):
+        """Test trending counts only recent public content"""
+        Post.objects.create(author=self.author, content='A', tags='django')
+        Post.objects.create(author=self.author, content='B', tags='django, python')
+        Post.objects.create(author=self.author, content='C', tags='python', privacy_level='private')
+        old = Post.objects.create(author=self.author, content='D', tags='cobol')
+        PostTag.objects.filter(post=old).update(created_at=timezone.now() - timedelta(days=3))
+
+        trending = TagService.get_trending(hours=24, limit=5)
+        self.assertEqual([(tag['slug'], tag['count']) for tag in trending], [('django', 2), ('python', 1)])
+
+        response = self.client.get('/api/tags/trending?hours=24&limit=1')
+        self.assertEqual(response.json(), [{'name': 'django', 'slug': 'django', 'count': 2}])
@@ -3,6 +3,10 @@ from typing import List
 from ninja_jwt.authentication import JWTAuth
 
 from apps.user.models import User
+from apps.main.auth import optional_auth
+from apps.main.pagination import keyset_page, estimate_count
+from apps.main.services.block_service import BlockService
+from apps.main.services.search_service import SearchService
 
 router = Router()
 
@@ -42,27 +46,34 @@ class UserUpdate(Schema):
 
 
 class PaginatedUsersOut(Schema):
-    total: int
+    total: int | None = None
     page: int
     size: int
     items: List[UserOut]
+    next_cursor: str | None = None
 
 
 class DeleteResponse(Schema):
     success: bool
 
 
-@router.get("/", response=PaginatedUsersOut)
-def list_users(request, page: int = 1, size: int = 20, search: str | None = None):
+@router.get("/", auth=optional_auth, response=PaginatedUsersOut)
+def list_users(request, page: int = 1, size: int = 20, search: str | None = None,
+               cursor: str | None = None, with_total: bool = False):
     size = max(1, min(size, 100))
-    qs = User.objects.all()
+    qs = BlockService.exclude_blocked(User.objects.all(), request.user, field='pk')
     if search:
-        qs = qs.filter(username__icontains=search)
-    qs = qs.order_by('-created_at')
-    total = qs.count()
-    start = (page - 1) * size
-    end = start + size
-    qs_page = qs[start:end]
+        qs = SearchService.filter(qs, 'user', search)
+    next_cursor = None
+    if cursor is not None:
+        qs_page, next_cursor = keyset_page(qs, '-created_at', cursor, size)
+        total = estimate_count(qs) if with_total else None
+    else:
+        qs = qs.order_by('-created_at')
+        total = qs.count()
+        start = (page - 1) * size
+        end = start + size
+        qs_page = qs[start:end]
     items = []
     for u in qs_page:
         achievements = [AchievementSummary(
@@ -82,7 +93,7 @@ def list_users(request, page: int = 1, size: int = 20, search: str | None = None
             is_verified=u.is_verified,
             achievements=achievements,
         ))
-    return PaginatedUsersOut(total=total, page=page, size=size, items=items)
+    return PaginatedUsersOut(total=total, page=page, size=size, items=items, next_cursor=next_cursor)
 
 
 @router.get("/{user_id}", response=UserOut)
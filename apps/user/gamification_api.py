@@ -1,9 +1,12 @@
 from ninja import Router, Schema
-from typing import List
+from typing import List, Literal
 from ninja_jwt.authentication import JWTAuth
+from ninja.errors import HttpError
 
 from apps.user.models import User, UserPointsHistory
 from apps.achievement.models import UserAchievement
+from apps.main.services.leaderboard_service import LeaderboardService
+from apps.main.services.stats_service import StatsService
 
 router = Router()
 
@@ -34,12 +37,20 @@ class LeaderboardEntry(Schema):
     total_points: int
     level: int
     is_verified: bool
+    period_points: int | None = None
 
 
 class LeaderboardOut(Schema):
     entries: List[LeaderboardEntry]
 
 
+class RankOut(Schema):
+    user_id: int
+    rank: int
+    total_points: int
+    total_users: int
+
+
 class PointsHistoryOut(Schema):
     points: int
     source: str
@@ -66,19 +77,17 @@ def get_user_stats(request, user_id: int):
     if not user:
         return None
     
-    achievements_count = user.user_achievements.count()
-    posts_count = user.posts.count()
-    comments_count = user.comments.count()
+    stats = StatsService.get_user_stats(user)
     
     return UserStatsOut(
         user_id=user.id,
         username=user.username,
-        total_points=user.total_points,
-        level=user.level,
-        experience_points=user.experience_points,
-        achievements_count=achievements_count,
-        posts_count=posts_count,
-        comments_count=comments_count,
+        total_points=stats['total_points'],
+        level=stats['level'],
+        experience_points=stats['experience_points'],
+        achievements_count=stats['total_achievements'],
+        posts_count=stats['total_posts'],
+        comments_count=stats['total_comments'],
     )
 
 
@@ -100,22 +109,32 @@ def get_user_achievements(request, user_id: int):
 
 
 @router.get("/leaderboard", response=LeaderboardOut)
-def get_leaderboard(request, limit: int = 50):
+def get_leaderboard(request, limit: int = 50, period: Literal['all', 'week', 'month'] = 'all',
+                    career_id: int | None = None):
     limit = max(1, min(limit, 100))
-    top_users = User.objects.order_by('-total_points')[:limit]
+    board = LeaderboardService.get_board(period, limit, career_id)
     
     entries = [LeaderboardEntry(
-        rank=idx + 1,
-        user_id=u.id,
-        username=u.username,
-        total_points=u.total_points,
-        level=u.level,
-        is_verified=u.is_verified,
-    ) for idx, u in enumerate(top_users)]
+        rank=entry['rank'],
+        user_id=entry['id'],
+        username=entry['username'],
+        total_points=entry['total_points'],
+        level=entry['level'],
+        is_verified=entry['is_verified'],
+        period_points=entry.get('period_points'),
+    ) for entry in board]
     
     return LeaderboardOut(entries=entries)
 
 
+@router.get("/leaderboard/rank/{user_id}", response=RankOut)
+def get_user_rank(request, user_id: int):
+    user = User.objects.filter(id=user_id).first()
+    if not user:
+        raise HttpError(404, 'User not found')
+    return RankOut(**LeaderboardService.get_rank(user))
+
+
 @router.get("/{user_id}/points-history", response=List[PointsHistoryOut])
 def get_points_history(request, user_id: int, limit: int = 50):
     limit = max(1, min(limit, 100))
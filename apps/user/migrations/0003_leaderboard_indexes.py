@@ -0,0 +1,26 @@
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('career', '0001_initial'),
+        ('user', '0002_user_user_user_created_a9f810_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-total_points', 'id'], name='user_user_total_p_55e46c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['career', '-total_points', 'id'], name='user_user_career__6a620e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userpointshistory',
+            index=models.Index(fields=['created_at', 'user'], name='user_userpo_created_043a9b_idx'),
+        ),
+    ]
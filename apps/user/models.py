@@ -117,6 +117,11 @@ class User(AbstractUser):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['-total_points', 'id']),
+            models.Index(fields=['career', '-total_points', 'id']),
+        ]
         
     def __str__(self):
         return self.username
@@ -133,6 +138,9 @@ class User(AbstractUser):
         self.experience_points += points
         self.update_level()
         self.save(update_fields=['total_points', 'experience_points', 'level'])
+        
+        from apps.main.services.leaderboard_service import LeaderboardService
+        LeaderboardService.record_score(self)
     
     def update_level(self):
         new_level = (self.experience_points // 1000) + 1
@@ -144,14 +152,15 @@ class User(AbstractUser):
     def get_achievements(self):
         return self.user_achievements.select_related('achievement')
     
+    def get_friend_ids(self):
+        from apps.main.services.friend_graph import FriendGraph
+        return FriendGraph.friend_ids(self)
+    
     def get_friends(self):
-        return User.objects.filter(
-            models.Q(sent_friendships__receiver=self, sent_friendships__status='accepted') |
-            models.Q(received_friendships__sender=self, received_friendships__status='accepted')
-        ).distinct()
+        return User.objects.filter(id__in=self.get_friend_ids())
     
     def get_friend_count(self):
-        return self.get_friends().count()
+        return len(self.get_friend_ids())
     
     def can_view_profile(self, viewer):
         if self.profile_visibility == 'public':
@@ -159,7 +168,7 @@ class User(AbstractUser):
         elif self.profile_visibility == 'private':
             return viewer == self
         elif self.profile_visibility == 'friends':
-            return viewer == self or viewer in self.get_friends()
+            return viewer == self or getattr(viewer, 'pk', None) in self.get_friend_ids()
         return False
 
 
@@ -205,6 +214,9 @@ class UserPointsHistory(models.Model):
         verbose_name = "Points History"
         verbose_name_plural = "Points History"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'user']),
+        ]
         
     def __str__(self):
         return f"{self.user.username}: {self.points} points ({self.source})"
@@ -1 +1,78 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from apps.main.services.leaderboard_service import LeaderboardService
+from apps.user.models import UserPointsHistory
+
+User = get_user_model()
+
+
+class LeaderboardServiceTestCase(TestCase):
+    def setUp(self):
+        """Set up three users with different scores"""
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f'board_{i}', email=f'board{i}@example.com', password='testpass123',
+                student_id=f'L-{i}', total_points=points,
+            )
+            for i, points in enumerate([300, 100, 200])
+        ]
+
+    def test_top_is_ordered_by_points(self):
+        """Test the cached top lists users by total points"""
+        board = LeaderboardService.get_top(10)
+        self.assertEqual([e['username'] for e in board], ['board_0', 'board_2', 'board_1'])
+        self.assertEqual([e['rank'] for e in board], [1, 2, 3])
+
+    def test_add_points_updates_cached_top(self):
+        """Test add_points moves the user inside the cached snapshot"""
+        LeaderboardService.get_top(10)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[1].add_points(500)
+        with self.assertNumQueries(0):
+            board = LeaderboardService.get_top(10)
+        self.assertEqual(board[0]['username'], 'board_1')
+        self.assertEqual(board[0]['total_points'], 600)
+
+    @override_settings(LEADERBOARD_SIZE=2)
+    def test_user_entering_full_top(self):
+        """Test a user passing the last entry of a full top replaces it"""
+        LeaderboardService.get_top(2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.users[1].add_points(150)
+        self.assertEqual([e['username'] for e in LeaderboardService.get_top(2)], ['board_0', 'board_1'])
+
+    def test_rolled_back_points_leave_cached_top_alone(self):
+        """Test the cached top only changes once the points are committed"""
+        LeaderboardService.get_top(10)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.users[1].add_points(500)
+                    raise IntegrityError('rolled back')
+            except IntegrityError:
+                pass
+        self.assertEqual(LeaderboardService.get_top(10)[0]['username'], 'board_0')
+
+    def test_rank_lookup(self):
+        """Test rank counts users with strictly more points"""
+        self.assertEqual(LeaderboardService.get_rank(self.users[0])['rank'], 1)
+        self.assertEqual(LeaderboardService.get_rank(self.users[1])['rank'], 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(LeaderboardService.get_rank(self.users[2])['rank'], 2)
+
+    def test_weekly_board_uses_recent_history(self):
+        """Test the weekly board ranks by points earned in the period"""
+        UserPointsHistory.objects.create(user=self.users[1], points=50, source='post')
+        UserPointsHistory.objects.create(user=self.users[2], points=10, source='post')
+        board = LeaderboardService.get_board('week', 10)
+        self.assertEqual([(e['username'], e['period_points']) for e in board], [('board_1', 50), ('board_2', 10)])
+
+    def test_leaderboard_endpoint_rejects_unknown_period(self):
+        """Test an unknown period is a validation error instead of the all-time board"""
+        response = self.client.get('/api/users/leaderboard', {'period': 'year'})
+        self.assertEqual(response.status_code, 422)
+        response = self.client.get('/api/users/leaderboard', {'period': 'week'})
+        self.assertEqual(response.status_code, 200)
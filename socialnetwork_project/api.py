@@ -5,7 +5,10 @@ from apps.user.gamification_api import router as gamification_router
 from apps.post.api import router as post_router
 from apps.comment.api import router as comment_router
 from apps.note.api import router as note_router
-from apps.like.api import router as like_router
+from apps.like.api import router as like_router, likes_router
+from apps.notification.api import router as notification_router
+from apps.search.api import router as search_router
+from apps.tag.api import router as tag_router
 
 # token routers provided by ninja_jwt
 from ninja_jwt.routers.obtain import obtain_pair_router, sliding_router
@@ -14,12 +17,17 @@ from ninja_jwt.routers.blacklist import blacklist_router
 
 api = NinjaAPI(title="Social Network API", version="1.0")
 
-api.add_router("/users/", user_router)
+# Antes que user_router: /users/{user_id} capturaría /users/leaderboard
 api.add_router("/users/", gamification_router)
+api.add_router("/users/", user_router)
 api.add_router("/posts/", post_router)
 api.add_router("/comments/", comment_router)
 api.add_router("/notes/", note_router)
 api.add_router("/posts/", like_router)
+api.add_router("/likes/", likes_router)
+api.add_router("/notifications/", notification_router)
+api.add_router("/search/", search_router)
+api.add_router("/tags/", tag_router)
 
 # mount token endpoints
 api.add_router("/token/", obtain_pair_router)
@@ -2,6 +2,8 @@
 ASGI config for socialnetwork_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+start.sh serves it with gunicorn + uvicorn workers so the async live
+stream (/live/) holds connections without tying up a thread each.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -8,6 +8,8 @@ import os
 from decouple import config
 
 DEBUG = config('DEBUG', default=False, cast=bool)
+# Sin DEBUG los eventos del outbox los procesa el worker de start.sh
+OUTBOX_EAGER = config('OUTBOX_EAGER', default=DEBUG, cast=bool)
 
 
 ALLOWED_HOSTS_ENV = config('ALLOWED_HOSTS', default='localhost,127.0.0.1')
@@ -110,12 +112,45 @@ LOGGING = {
     },
 }
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Caché compartida entre los workers de gunicorn.
+# Con REDIS_URL se usa Redis (requiere el paquete redis); si no, una tabla
+# de la base de datos creada con `manage.py createcachetable` (ver start.sh).
+# La tabla alcanza para valores recalculables, pero al llegar a MAX_ENTRIES
+# borra claves al azar (versiones de tags incluidas: solo provoca misses) y
+# su incr no es atómico, así que los contadores en caché requieren Redis.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'socialnetwork',
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'KEY_PREFIX': 'socialnetwork',
+            'OPTIONS': {
+                'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=50000, cast=int),
+            },
+        }
+    }
+
+# El buffer de vistas y el ajuste de no leídas necesitan incr atómico y compartido: solo con Redis
+VIEW_COUNT_BUFFERED = config('VIEW_COUNT_BUFFERED', default=bool(REDIS_URL), cast=bool)
+NOTIFICATION_UNREAD_INCR = config('NOTIFICATION_UNREAD_INCR', default=bool(REDIS_URL), cast=bool)
+
+# Email por SMTP (digests de notificaciones)
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=30, cast=int)
 
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SECURE = not DEBUG
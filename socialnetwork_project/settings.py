@@ -35,6 +35,9 @@ INSTALLED_APPS = [
     'apps.note',
     'apps.like',
     'apps.reaction',
+    'apps.feed',
+    'apps.search',
+    'apps.tag',
     'apps.main',
 ]
 
@@ -64,6 +67,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'apps.main.context_processors.live_channel',
             ],
         },
     },
@@ -185,6 +189,110 @@ LOGGING = {
     },
 }
 
+# Caché: LocMem en desarrollo; en producción ver production_settings.py
+# Subir CACHE_KEY_VERSION invalida todas las claves de apps.main.cache
+CACHE_KEY_VERSION = 1
+
+# Grafo de amistades en caché
+FRIEND_GRAPH_TIMEOUT = 60 * 60
+
+# Bloqueos entre usuarios en caché
+BLOCK_LIST_TIMEOUT = 60 * 60
+
+# Home feed (fan-out on write)
+FEED_FANOUT_LIMIT = config('FEED_FANOUT_LIMIT', default=1000, cast=int)
+FEED_CACHE_SIZE = 500
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Outbox (eventos procesados por process_outbox)
+# OUTBOX_EAGER procesa los eventos al confirmar la transacción, así runserver funciona sin worker
+OUTBOX_EAGER = config('OUTBOX_EAGER', default=DEBUG, cast=bool)
+OUTBOX_MAX_ATTEMPTS = 5
+
+# Rankings
+LEADERBOARD_SIZE = 100
+LEADERBOARD_CACHE_TIMEOUT = 60 * 5
+LEADERBOARD_RANK_TIMEOUT = 60
+LEADERBOARD_PERIOD_TIMEOUT = 60
+GAMIFICATION_STATS_TIMEOUT = 60 * 5
+
+# Contador de vistas (buffer en caché, volcado periódico)
+VIEW_COUNT_FLUSH_INTERVAL = 60
+# Objetos por lectura del índice de pendientes al volcar
+VIEW_COUNT_FLUSH_BATCH = 1000
+# False = un UPDATE por vista (cachés sin incr atómico compartido, ej: DatabaseCache)
+VIEW_COUNT_BUFFERED = True
+# Ventana en segundos para no contar vistas repetidas del mismo usuario (0 = sin dedup)
+VIEW_COUNT_DEDUP_WINDOW = config('VIEW_COUNT_DEDUP_WINDOW', default=0, cast=int)
+
+# Búsqueda: candidatos leídos por resultado pedido (margen para filtrar privacidad)
+SEARCH_CANDIDATE_FACTOR = 3
+# Vida en caché del total de documentos que usa el ranking TF-IDF (SQLite)
+SEARCH_DOCUMENT_COUNT_TIMEOUT = 60 * 10
+# Palabras distintas a las que se expande cada prefijo buscado (SQLite); la exacta va primera
+SEARCH_PREFIX_EXPANSIONS = 500
+
+# Tags en tendencia (ventana deslizante en horas)
+TRENDING_TAGS_WINDOW_HOURS = 24
+TRENDING_TAGS_TIMEOUT = 60 * 5
+
+# Hot score de posts (update_hot_scores)
+# Segundos de antigüedad que equivalen a 10 veces menos interacción
+HOT_SCORE_DECAY = 45000
+HOT_SCORE_WINDOW_DAYS = 7
+HOT_SCORE_BATCH_SIZE = 500
+
+# Resúmenes de reacciones: leer la tabla ReactionCount (False = GROUP BY sobre Reaction)
+REACTION_COUNTS_DENORMALIZED = True
+
+# Notificaciones (encoladas en el outbox y entregadas por process_outbox)
+NOTIFICATION_PREFERENCES_TIMEOUT = 60 * 60
+NOTIFICATION_BATCH_SIZE = 500
+# Horas en que las notificaciones repetidas sobre un mismo objeto se agrupan
+NOTIFICATION_COALESCE_HOURS = 24
+# Vida del contador de no leídas en caché (se recalcula con el índice al expirar)
+NOTIFICATION_UNREAD_TIMEOUT = 60 * 5
+# False = ajustar el contador borrándolo en lugar de incr (cachés sin incr atómico, ej: DatabaseCache)
+NOTIFICATION_UNREAD_INCR = True
+# Retención (sweep_notifications): días para borrar leídas y para archivar, por tipo (None = nunca)
+NOTIFICATION_RETENTION = {
+    'default': {'read_days': 30, 'archive_days': 90},
+    'like': {'read_days': 7, 'archive_days': 30},
+    'reaction': {'read_days': 7, 'archive_days': 30},
+    'achievement': {'read_days': None, 'archive_days': 365},
+}
+NOTIFICATION_SWEEP_BATCH_SIZE = 1000
+# Meses completos que se conservan en el archivo
+NOTIFICATION_ARCHIVE_MONTHS = 12
+
+# Eventos en vivo (SSE en /live/, servido por ASGI)
+# Solo funciona servido por ASGI (uvicorn/gunicorn con UvicornWorker); bajo runserver queda apagado
+LIVE_ENABLED = config('LIVE_ENABLED', default=True, cast=bool)
+# True cuando /live/ lo atiende un proceso ASGI aparte (el proxy enruta /live/ a ese puerto):
+# las páginas servidas por WSGI también abren la conexión
+LIVE_SEPARATE_SERVER = config('LIVE_SEPARATE_SERVER', default=False, cast=bool)
+LIVE_POLL_INTERVAL = 1.0
+LIVE_HEARTBEAT = 15
+# Cada conexión se corta a los N segundos y el navegador reconecta con Last-Event-ID
+LIVE_STREAM_MAX_SECONDS = 300
+LIVE_QUEUE_SIZE = 100
+LIVE_RETRY_MS = 3000
+LIVE_EVENT_RETENTION_MINUTES = 60
+
+# Email (en desarrollo los mensajes se escriben en logs/emails)
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.filebased.EmailBackend')
+EMAIL_FILE_PATH = BASE_DIR / 'logs' / 'emails'
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Red Social IFTS <no-reply@localhost>')
+# URL pública usada en los links de los emails
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+
+# Digests por email (send_notification_digests --frequency daily|weekly|immediate)
+NOTIFICATION_DIGEST_MAX_ITEMS = 20
+# Emails por envío sobre la misma conexión
+NOTIFICATION_DIGEST_SEND_BATCH = 100
+# Filas por lectura del cursor del lado del servidor
+NOTIFICATION_DIGEST_CHUNK_SIZE = 2000
+
 # Django Debug Toolbar
 INTERNAL_IPS = [
     '127.0.0.1',
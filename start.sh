@@ -11,6 +11,10 @@ python manage.py check --database default
 if [ -z "$SKIP_MIGRATIONS" ]; then
   echo "Ejecutando migraciones de base de datos..."
   python manage.py migrate --noinput
+  echo "Creando tabla de caché (si no existe)..."
+  python manage.py createcachetable
+  echo "Indexando contenido pendiente para la búsqueda..."
+  python manage.py rebuild_search_index --missing
 else
   echo "⏭️  Saltando migraciones (SKIP_MIGRATIONS=true)"
 fi
@@ -26,6 +30,50 @@ echo "¡Configuración completa finalizada!"
 echo "Red Social IFTS lista para usar"
 echo "URL: http://tu-dominio.com/"
 
+# Procesos permanentes: supervise <log> <programa> [args...] lo relanza si termina
+# (set -e no cubre los procesos en segundo plano)
+supervise() {
+  local log=$1
+  shift
+  ( while true; do
+      "$@" || echo "$(date -Is) $1 terminó con código $?, reiniciando"
+      sleep 5
+    done ) >> "/app/logs/$log.log" 2>&1 &
+}
+
+# Tareas periódicas: periodic <segundos> <comando> [args...]
+periodic() {
+  local interval=$1
+  shift
+  ( while true; do python manage.py "$@" || true; sleep "$interval"; done ) >> "/app/logs/$1.log" 2>&1 &
+}
+
+echo "Iniciando worker del outbox..."
+# Puntos, logros y notificaciones se aplican fuera del request (ver apps/main/outbox.py)
+supervise outbox python manage.py process_outbox --loop
+
+echo "Iniciando tareas periódicas..."
+# Hot score de los posts con actividad reciente (sección "En tendencia")
+periodic "${HOT_SCORES_INTERVAL:-300}" update_hot_scores
+# Vistas que quedaron en el buffer de la caché sin nuevas visitas que disparen el volcado
+periodic 60 flush_view_counts
+# Eventos en vivo ya entregados (LIVE_EVENT_RETENTION_MINUTES)
+periodic 600 prune_live_events
+# Notificaciones vencidas (expires_at), leídas viejas y archivado (NOTIFICATION_RETENTION)
+periodic "${SWEEP_NOTIFICATIONS_INTERVAL:-3600}" sweep_notifications --pause 0.1
+
+echo "Iniciando servidor de eventos en vivo..."
+# Solo /live/ corre bajo ASGI: las conexiones SSE esperan sin ocupar un thread por cliente.
+# El proxy debe enviar /live/ a este puerto (ver API_README, "Eventos en vivo")
+supervise live gunicorn socialnetwork_project.asgi:application \
+    --bind 0.0.0.0:"${LIVE_PORT:-8001}" \
+    --workers "${LIVE_WORKERS:-1}" \
+    --worker-class uvicorn_worker.UvicornWorker \
+    --timeout 30 \
+    --graceful-timeout 5 \
+    --access-logfile /app/logs/live_access.log \
+    --log-level info
+
 echo "Iniciando servidor web..."
 exec gunicorn socialnetwork_project.wsgi:application \
     --bind 0.0.0.0:8000 \
@@ -38,4 +86,4 @@ exec gunicorn socialnetwork_project.wsgi:application \
     --keep-alive 2 \
     --access-logfile /app/logs/access.log \
     --error-logfile /app/logs/error.log \
-    --log-level info
\ No newline at end of file
+    --log-level info
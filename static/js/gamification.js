@@ -264,12 +264,74 @@ class Leaderboard {
   }
 }
 
+class LiveChannel {
+  constructor(url = "/live/") {
+    this.url = url;
+    this.source = null;
+    this.unread = 0;
+    this.enabled = window.liveEnabled !== false;
+  }
+  connect() {
+    if (this.source) return true;
+    if (!this.enabled || !window.EventSource) return false;
+    this.source = new EventSource(this.url);
+    ["notification", "unread", "like_count", "points"].forEach((type) => {
+      this.source.addEventListener(type, (e) =>
+        this.handle(type, JSON.parse(e.data))
+      );
+    });
+    return true;
+  }
+  handle(type, data) {
+    if (type === "unread") {
+      this.unread =
+        data.count !== undefined
+          ? data.count
+          : Math.max(this.unread + data.delta, 0);
+      this.renderUnread();
+    } else if (type === "notification" && data.new) {
+      this.unread += 1;
+      this.renderUnread();
+    } else if (type === "like_count") {
+      document
+        .querySelectorAll(`[data-live-like-count="${data.target}"]`)
+        .forEach((el) => (el.textContent = data.like_count));
+    } else if (type === "points" && data.level_up) {
+      this.showLevelUp(data.level);
+    }
+    document.dispatchEvent(new CustomEvent(`live:${type}`, { detail: data }));
+  }
+  renderUnread() {
+    document.querySelectorAll("[data-live-unread]").forEach((el) => {
+      el.textContent = this.unread;
+      el.style.display = this.unread === 0 ? "none" : "";
+    });
+  }
+  showLevelUp(level) {
+    const n = document.createElement("div");
+    n.className = "points-notification";
+    n.innerHTML = `<div class="points-notification-title">🎉 ¡LEVEL UP!</div><div class="points-notification-message">Nivel ${level}</div>`;
+    document.body.appendChild(n);
+    setTimeout(() => {
+      n.classList.add("hide");
+      setTimeout(() => n.remove(), 400);
+    }, 3000);
+  }
+  close() {
+    if (this.source) {
+      this.source.close();
+      this.source = null;
+    }
+  }
+}
+
 document.addEventListener("DOMContentLoaded", () => {
   window.gamificationModal = new GamificationModal();
   window.gamificationModal.init();
   window.gamificationAPI = GamificationAPI;
   window.PointsNotification = PointsNotification;
   window.Leaderboard = Leaderboard;
+  window.liveChannel = new LiveChannel();
 });
 
 async function awardPoints(source, points = null, description = null) {
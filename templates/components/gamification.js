@@ -447,6 +447,111 @@ class Leaderboard {
   }
 }
 
+/**
+ * Canal de eventos en vivo (Server-Sent Events en /live/)
+ * El servidor empuja notificaciones, contadores de likes y puntos,
+ * así la página no necesita consultar la API periódicamente
+ */
+class LiveChannel {
+  constructor(url = "/live/") {
+    this.url = url;
+    this.source = null;
+    this.unread = 0;
+    // base.html pone liveEnabled en false cuando /live/ no lo atiende un servidor ASGI
+    this.enabled = window.liveEnabled !== false;
+  }
+
+  /**
+   * Abre la conexión (el navegador reconecta solo y reenvía Last-Event-ID)
+   * @returns {boolean} false si el navegador no soporta SSE o el stream está apagado
+   */
+  connect() {
+    if (this.source) {
+      return true;
+    }
+    if (!this.enabled || !window.EventSource) {
+      return false;
+    }
+
+    this.source = new EventSource(this.url);
+    ["notification", "unread", "like_count", "points"].forEach((type) => {
+      this.source.addEventListener(type, (event) => {
+        this.handle(type, JSON.parse(event.data));
+      });
+    });
+    return true;
+  }
+
+  /**
+   * Actualiza la página y reenvía el evento como "live:<tipo>" en document
+   * @param {string} type - Tipo de evento
+   * @param {Object} data - Datos del evento
+   */
+  handle(type, data) {
+    if (type === "unread") {
+      this.unread =
+        data.count !== undefined
+          ? data.count
+          : Math.max(this.unread + data.delta, 0);
+      this.renderUnread();
+    } else if (type === "notification" && data.new) {
+      this.unread += 1;
+      this.renderUnread();
+    } else if (type === "like_count") {
+      document
+        .querySelectorAll(`[data-live-like-count="${data.target}"]`)
+        .forEach((element) => {
+          element.textContent = data.like_count;
+        });
+    } else if (type === "points" && data.level_up) {
+      this.showLevelUp(data.level);
+    }
+
+    document.dispatchEvent(new CustomEvent(`live:${type}`, { detail: data }));
+  }
+
+  /**
+   * Muestra la cantidad de no leídas en los elementos con data-live-unread
+   */
+  renderUnread() {
+    document.querySelectorAll("[data-live-unread]").forEach((element) => {
+      element.textContent = this.unread;
+      // style y no hidden: las clases de display de Tailwind le ganan al atributo
+      element.style.display = this.unread === 0 ? "none" : "";
+    });
+  }
+
+  /**
+   * Muestra un aviso flotante de subida de nivel
+   * @param {number} level - Nuevo nivel
+   */
+  showLevelUp(level) {
+    const notification = document.createElement("div");
+    notification.className = "points-notification";
+    notification.innerHTML = `
+            <div class="points-notification-title">🎉 ¡LEVEL UP!</div>
+            <div class="points-notification-message">Nivel ${level}</div>
+        `;
+
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+      notification.classList.add("hide");
+      setTimeout(() => notification.remove(), 400);
+    }, 3000);
+  }
+
+  /**
+   * Cierra la conexión
+   */
+  close() {
+    if (this.source) {
+      this.source.close();
+      this.source = null;
+    }
+  }
+}
+
 /**
  * Inicialización global
  */
@@ -459,6 +564,7 @@ document.addEventListener("DOMContentLoaded", () => {
   window.gamificationAPI = GamificationAPI;
   window.PointsNotification = PointsNotification;
   window.Leaderboard = Leaderboard;
+  window.liveChannel = new LiveChannel();
 });
 
 /**